@@ -0,0 +1,32 @@
+"""generation job promotion source
+
+Revision ID: 20261017_0005
+Revises: 20260424_0004
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0005"
+down_revision = "20260424_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("generation_jobs", sa.Column("source_output_video_id", sa.Integer(), nullable=True))
+    with op.batch_alter_table("generation_jobs") as batch_op:
+        batch_op.create_foreign_key(
+            "fk_generation_jobs_source_output_video_id",
+            "output_videos",
+            ["source_output_video_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+
+
+def downgrade() -> None:
+    op.drop_constraint("fk_generation_jobs_source_output_video_id", "generation_jobs", type_="foreignkey")
+    op.drop_column("generation_jobs", "source_output_video_id")
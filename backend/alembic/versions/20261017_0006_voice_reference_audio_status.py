@@ -0,0 +1,28 @@
+"""voice reference audio processing status
+
+Revision ID: 20261017_0006
+Revises: 20261017_0005
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0006"
+down_revision = "20261017_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "voice_reference_audios",
+        sa.Column("status", sa.String(length=32), nullable=False, server_default="ready"),
+    )
+    op.add_column("voice_reference_audios", sa.Column("error_json", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("voice_reference_audios", "error_json")
+    op.drop_column("voice_reference_audios", "status")
@@ -1,5 +1,6 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from app.core.config import settings
 
@@ -20,12 +21,19 @@ celery.conf.update(
     task_routes={
         "app.tasks.generation.process_generation_job": {"queue": "generation"},
         "app.tasks.generation.reconcile_stale_generation_jobs": {"queue": "generation"},
+        "app.tasks.generation.probe_background_asset": {"queue": "generation"},
+        "app.tasks.generation.prepare_background_derivatives": {"queue": "generation"},
+        "app.tasks.generation.evict_render_caches": {"queue": "generation"},
         "app.tasks.publish.process_publish_job": {"queue": "publish"},
         "app.tasks.scheduler.dispatch_due_publish_jobs": {"queue": "publish"},
         "app.tasks.voice_preview.process_voice_lab_preview": {"queue": "voice_preview"},
+        "app.tasks.voice_preview.process_reference_audio": {"queue": "voice_preview"},
         "app.tasks.voice_preview.reconcile_stale_voice_preview_jobs": {"queue": "voice_preview"},
+        "app.tasks.voice_preview.reconcile_stale_reference_audio": {"queue": "voice_preview"},
     },
     worker_max_tasks_per_child=200,
+    # Children warm up in worker_process_init, which must finish inside this window.
+    worker_proc_alive_timeout=settings.WORKER_WARMUP_TIMEOUT_SECONDS if settings.WORKER_WARMUP_ENABLED else 4.0,
     task_acks_late=True,
     task_track_started=True,
     task_reject_on_worker_lost=True,
@@ -41,19 +49,52 @@ celery.conf.update(
             "acks_late": False,
             "reject_on_worker_lost": False,
         },
+        "app.tasks.voice_preview.process_reference_audio": {"soft_time_limit": 540, "time_limit": 600},
     },
     beat_schedule={
         "reconcile-stale-generation-jobs": {
             "task": "app.tasks.generation.reconcile_stale_generation_jobs",
             "schedule": crontab(minute="*"),
         },
+        "evict-render-caches": {
+            "task": "app.tasks.generation.evict_render_caches",
+            "schedule": crontab(minute="*/10"),
+        },
         "reconcile-stale-voice-preview-jobs": {
             "task": "app.tasks.voice_preview.reconcile_stale_voice_preview_jobs",
             "schedule": crontab(minute="*"),
         },
+        "reconcile-stale-reference-audio": {
+            "task": "app.tasks.voice_preview.reconcile_stale_reference_audio",
+            "schedule": crontab(minute="*"),
+        },
         "dispatch-due-publish-jobs": {
             "task": "app.tasks.scheduler.dispatch_due_publish_jobs",
             "schedule": crontab(minute="*"),
         }
     },
 )
+
+
+def _consumed_queues() -> list[str]:
+    configured = [queue.strip() for queue in settings.WORKER_WARMUP_QUEUES.split(",") if queue.strip()]
+    # `-Q` selects the queues in the parent before the pool forks, so children inherit the selection.
+    return configured or sorted(celery.amqp.queues.consume_from or celery.amqp.queues)
+
+
+@worker_process_init.connect
+def _warm_worker_process(**_kwargs) -> None:
+    if not settings.WORKER_WARMUP_ENABLED:
+        return
+    from app.services.worker_warmup import run_worker_warmup
+
+    run_worker_warmup(_consumed_queues())
+
+
+@worker_process_shutdown.connect
+def _clear_worker_warmup(**_kwargs) -> None:
+    if not settings.WORKER_WARMUP_ENABLED:
+        return
+    from app.services.worker_warmup import clear_worker_warmup_report
+
+    clear_worker_warmup_report()
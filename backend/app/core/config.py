@@ -36,13 +36,36 @@ class Settings(BaseSettings):
     TTS_ESPEAK_AMPLITUDE: int = 140
     TTS_ESPEAK_VOICE_SLOT_1: str = "en-us+f3"
     TTS_ESPEAK_VOICE_SLOT_2: str = "en-gb+m3"
+    TTS_ESPEAK_LIBRARY: str = "auto"
     TTS_AUDIO_EXPORT_FPS: int = 44100
     TTS_AUDIO_EXPORT_BITRATE: str = "192k"
+    TTS_SYNTHESIS_WORKERS: int = 4
+    TTS_PROVIDER_CONCURRENCY: str = "espeak=4,openvoice=1"
+    TTS_PROVIDER_HEALTH_TTL_SECONDS: float = 60.0
+    WORKER_WARMUP_ENABLED: bool = True
+    WORKER_WARMUP_QUEUES: str = ""
+    WORKER_WARMUP_TIMEOUT_SECONDS: float = 180.0
+    WORKER_WARMUP_HEARTBEAT_SECONDS: float = 30.0
+    RENDER_CACHE_ENABLED: bool = True
+    RENDER_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    RASTER_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    # Cache files touched more recently than this may still be in use by a running render.
+    CACHE_EVICTION_MIN_AGE_SECONDS: int = 3600
+    BACKGROUND_CACHE_ENABLED: bool = True
+    BACKGROUND_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    BACKGROUND_PREBUILD_ON_UPLOAD: bool = False
+    VOICE_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    VOICE_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
     OPENVOICE_ENABLED: bool = False
     OPENVOICE_REPO_DIR: str = ""
     OPENVOICE_CHECKPOINTS_DIR: str = ""
     OPENVOICE_DEVICE: str = "auto"
     OPENVOICE_DEFAULT_MODEL_ID: str = "openvoice_v2"
+    OPENVOICE_SERVER_SOCKET: str = ""
+    OPENVOICE_SERVER_TIMEOUT_SECONDS: float = 300.0
+    OPENVOICE_SERVER_KEEPALIVE_SECONDS: float = 10.0
+    OPENVOICE_SERVER_WARM_LANGUAGES: str = "EN"
+    OPENVOICE_BATCH_SIZE: int = 8
     VOICE_LAB_MAX_REFERENCE_AUDIO_SIZE_BYTES: int = 150 * 1024 * 1024
     VOICE_LAB_ALLOWED_AUDIO_TYPES: str = "audio/wav,audio/x-wav,audio/mpeg,audio/mp3,audio/flac,audio/mp4,audio/x-m4a"
     VOICE_LAB_MAX_REFERENCE_EMBEDDING_SECONDS: float = 60.0
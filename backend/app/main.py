@@ -4,8 +4,6 @@ import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from alembic.config import Config
-from alembic.script import ScriptDirectory
 from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -25,6 +23,7 @@ from app.routers.reviews import router as reviews_router
 from app.routers.routing import router as routing_router
 from app.routers.scripts import router as scripts_router
 from app.routers.social_accounts import router as social_accounts_router
+from app.services.worker_warmup import worker_readiness
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -40,6 +39,10 @@ def _cors_allowed_origins() -> list[str]:
 
 
 def _migration_state() -> dict:
+    # Alembic is only needed by /health, so it stays out of the API's import path.
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
     alembic_cfg = Config(str(Path(__file__).resolve().parents[1] / "alembic.ini"))
     script = ScriptDirectory.from_config(alembic_cfg)
     expected_heads = set(script.get_heads())
@@ -98,6 +101,14 @@ def healthcheck():
     return {"ok": True, "database": "reachable", "migrations": migrations}
 
 
+@app.get("/health/workers")
+def worker_readiness_check():
+    readiness = worker_readiness()
+    if not readiness["ok"]:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=readiness)
+    return readiness
+
+
 @app.get("/health/live", status_code=status.HTTP_200_OK)
 def liveness():
     return {"ok": True}
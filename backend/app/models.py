@@ -284,6 +284,8 @@ class VoiceReferenceAudio(Base):
     sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     authorization_confirmed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     authorization_note: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(String(32), default="ready", nullable=False)
+    error_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     created_by_user_id: Mapped[int | None] = mapped_column(
         ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
     )
@@ -395,6 +397,9 @@ class GenerationJob(Base):
     style_preset: Mapped[str] = mapped_column(String(32), default="none", nullable=False)
     output_kind: Mapped[str] = mapped_column(String(32), default="preview", nullable=False)
     provider_name: Mapped[str] = mapped_column(String(64), default="local-compositor", nullable=False)
+    source_output_video_id: Mapped[int | None] = mapped_column(
+        ForeignKey("output_videos.id", ondelete="SET NULL"), nullable=True
+    )
     status: Mapped[str] = mapped_column(String(32), default="queued", nullable=False)
     progress: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -406,7 +411,10 @@ class GenerationJob(Base):
     input_asset: Mapped["Asset"] = relationship(back_populates="generation_jobs")
     script_revision: Mapped["ScriptRevision"] = relationship(back_populates="generation_jobs")
     output_video: Mapped["OutputVideo | None"] = relationship(
-        back_populates="generation_job", uselist=False
+        back_populates="generation_job", uselist=False, foreign_keys="OutputVideo.generation_job_id"
+    )
+    source_output_video: Mapped["OutputVideo | None"] = relationship(
+        foreign_keys=[source_output_video_id], post_update=True
     )
 
 
@@ -461,7 +469,9 @@ class OutputVideo(Base):
     project: Mapped["Project"] = relationship(
         back_populates="output_videos", foreign_keys=[project_id]
     )
-    generation_job: Mapped["GenerationJob"] = relationship(back_populates="output_video")
+    generation_job: Mapped["GenerationJob"] = relationship(
+        back_populates="output_video", foreign_keys=[generation_job_id]
+    )
     asset: Mapped["Asset"] = relationship(back_populates="output_videos")
     review_queue_items: Mapped[list["ReviewQueueItem"]] = relationship(back_populates="output_video")
     publish_jobs: Mapped[list["PublishJob"]] = relationship(back_populates="output_video")
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import logging
+
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.dependencies import get_current_user, get_db
 from app.models import Asset, User
 from app.routers.projects import get_owned_project
@@ -16,10 +19,32 @@ from app.services.storage import (
     resolve_background_preset,
     save_background_asset,
 )
+from app.services.timelines import release_timeline
+from app.tasks.signatures import prepare_background_derivatives, probe_background_asset
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["assets"])
 
 
+def _queue_background_probe(asset: Asset) -> None:
+    """Probes the new background on a worker; a render that reaches it first probes it itself."""
+    try:
+        probe_background_asset.delay(asset.id)
+    except Exception:
+        logger.warning("Could not queue the probe for background asset %s", asset.id, exc_info=True)
+
+
+def _queue_background_derivatives(asset: Asset, style_preset: str) -> None:
+    """Encodes the new background's render derivatives on a worker; renders build them lazily otherwise."""
+    if not settings.BACKGROUND_PREBUILD_ON_UPLOAD:
+        return
+    try:
+        prepare_background_derivatives.delay(asset.id, style_preset)
+    except Exception:
+        logger.warning("Could not queue background derivatives for asset %s", asset.id, exc_info=True)
+
+
 def _video_response(path: str, *, media_type: str, filename: str):
     return FileResponse(
         path,
@@ -61,18 +86,18 @@ async def upload_background_asset(
     db: Session = Depends(get_db),
 ):
     project = get_owned_project(db, current_user.id, project_id)
-    storage_path, size_bytes, mime_type = await save_background_asset(project.id, file)
+    stored = await save_background_asset(project.id, file)
 
     asset = Asset(
         user_id=current_user.id,
         project_id=project.id,
         kind="background_video",
         source_type="upload",
-        storage_key=str(storage_path),
-        original_filename=file.filename or storage_path.name,
-        mime_type=mime_type,
-        size_bytes=size_bytes,
-        metadata_json={"selection_mode": "upload"},
+        storage_key=str(stored["path"]),
+        original_filename=file.filename or stored["path"].name,
+        mime_type=stored["mime_type"],
+        size_bytes=stored["size_bytes"],
+        metadata_json={"selection_mode": "upload", "sha256": stored["sha256"], "sha256_size_bytes": stored["size_bytes"]},
     )
     db.add(asset)
     db.flush()
@@ -82,6 +107,8 @@ async def upload_background_asset(
     sync_project_state(project)
     db.commit()
     db.refresh(asset)
+    _queue_background_probe(asset)
+    _queue_background_derivatives(asset, project.background_style)
     return to_asset_summary(asset)
 
 
@@ -114,6 +141,8 @@ def select_background_preset(
     sync_project_state(project)
     db.commit()
     db.refresh(asset)
+    _queue_background_probe(asset)
+    _queue_background_derivatives(asset, project.background_style)
     return to_asset_summary(asset)
 
 
@@ -139,6 +168,7 @@ def delete_project_asset(
     if not asset:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
     delete_storage_key(asset.storage_key)
+    release_timeline((asset.metadata_json or {}).get("timeline"))
     if project.background_asset_id == asset.id:
         project.background_asset_id = None
         project.background_source_type = "upload"
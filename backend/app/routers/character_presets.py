@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Response, UploadFile, status
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_current_user, get_db
-from app.models import User
+from app.models import User, VoiceReferenceAudio
 from app.schemas import (
     CharacterPresetListResponse,
     CharacterPresetRequest,
@@ -15,6 +16,7 @@ from app.schemas import (
     OkResponse,
     ProviderCapabilityListResponse,
     TTSFailureResponse,
+    VoiceCacheStatsResponse,
     VoiceLabPreviewRequest,
     VoiceLabPreviewResponse,
     VoiceProfileListResponse,
@@ -23,7 +25,7 @@ from app.schemas import (
     VoiceProfileSummary,
     VoiceReferenceAudioUploadResponse,
 )
-from app.services.tts import TTSOrchestrator, TTSProviderError, apply_voice_lab_overrides
+from app.services.voice_cache import voice_cache_stats
 from app.services.voice_preview_jobs import (
     create_voice_preview_job,
     get_voice_preview_job,
@@ -31,13 +33,16 @@ from app.services.voice_preview_jobs import (
     to_voice_preview_response,
 )
 from app.services.voice_profiles import (
+    delete_reference_audio,
     ensure_voice_profile_editable,
     get_character_preset,
     get_character_preset_model,
+    get_reference_audio_status,
     get_voice_profile,
     get_voice_profile_model,
     list_character_presets,
     list_voice_profiles,
+    mark_reference_audio_failed,
     resolve_character_portrait_path,
     runtime_voice_profile_payload,
     save_reference_audio_upload,
@@ -46,7 +51,10 @@ from app.services.voice_profiles import (
     upsert_voice_profile,
     voice_lab_preview_dir,
 )
-from app.tasks.voice_preview import process_voice_lab_preview
+from app.tasks.signatures import process_reference_audio, process_voice_lab_preview
+
+if TYPE_CHECKING:
+    from app.services.tts import TTSOrchestrator
 
 router = APIRouter(tags=["character_presets"])
 
@@ -156,7 +164,7 @@ def update_voice_profile(
     return VoiceProfileSummary(**profile)
 
 
-@router.post("/voice-profiles/reference-audio", response_model=VoiceReferenceAudioUploadResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/voice-profiles/reference-audio", response_model=VoiceReferenceAudioUploadResponse, status_code=status.HTTP_202_ACCEPTED)
 def upload_reference_audio(
     voice_profile_id: str = Form(...),
     authorization_confirmed: bool = Form(...),
@@ -173,12 +181,51 @@ def upload_reference_audio(
         authorization_note=authorization_note,
         db=db,
     )
+    try:
+        process_reference_audio.apply_async(
+            kwargs={"reference_audio_id": reference_audio["id"]},
+            task_id=f"voice-reference-audio-{reference_audio['id']}",
+        )
+    except Exception as exc:
+        reference = db.get(VoiceReferenceAudio, reference_audio["id"])
+        error = {
+            "code": "reference_audio_queue_failed",
+            "message": f"Reference audio processing could not be queued: {exc}",
+            "suggested_action": "Check the worker and broker configuration, then upload the clip again.",
+        }
+        mark_reference_audio_failed(reference, error, db)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=error) from exc
+    return VoiceReferenceAudioUploadResponse(
+        voice_profile=VoiceProfileSummary(**voice_profile),
+        reference_audio=reference_audio,
+    )
+
+
+@router.get("/voice-profiles/{voice_profile_id}/reference-audio/{reference_audio_id}", response_model=VoiceReferenceAudioUploadResponse)
+def get_reference_audio(
+    voice_profile_id: str,
+    reference_audio_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    voice_profile, reference_audio = get_reference_audio_status(voice_profile_id, reference_audio_id, current_user.id, db)
     return VoiceReferenceAudioUploadResponse(
         voice_profile=VoiceProfileSummary(**voice_profile),
         reference_audio=reference_audio,
     )
 
 
+@router.delete("/voice-profiles/{voice_profile_id}/reference-audio/{reference_audio_id}", response_model=VoiceProfileSummary)
+def remove_reference_audio(
+    voice_profile_id: str,
+    reference_audio_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    voice_profile = delete_reference_audio(voice_profile_id, reference_audio_id, current_user.id, db)
+    return VoiceProfileSummary(**voice_profile)
+
+
 @router.post("/voice-profiles/{voice_profile_id}/prepare", response_model=VoiceProfilePrepareResponse)
 def prepare_voice_profile(
     voice_profile_id: str,
@@ -189,6 +236,8 @@ def prepare_voice_profile(
     if not profile_model:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Voice profile not found.")
     ensure_voice_profile_editable(profile_model, current_user.id)
+    from app.services.tts import TTSOrchestrator, TTSProviderError
+
     orchestrator = TTSOrchestrator()
     payload = runtime_voice_profile_payload(profile_model, profile_model.display_name)
     try:
@@ -227,10 +276,18 @@ def prepare_voice_profile(
 @router.get("/tts/providers", response_model=ProviderCapabilityListResponse)
 def get_tts_provider_capabilities(current_user: User = Depends(get_current_user)):
     _ = current_user
+    from app.services.tts import TTSOrchestrator
+
     orchestrator = TTSOrchestrator()
     return ProviderCapabilityListResponse(items=orchestrator.provider_capabilities())
 
 
+@router.get("/tts/cache", response_model=VoiceCacheStatsResponse)
+def get_tts_cache_stats(current_user: User = Depends(get_current_user)):
+    _ = current_user
+    return VoiceCacheStatsResponse(**voice_cache_stats())
+
+
 @router.post(
     "/voice-lab/preview",
     response_model=VoiceLabPreviewResponse,
@@ -247,6 +304,8 @@ def create_voice_lab_preview(
     if not preset_model:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Character preset not found.")
 
+    from app.services.tts import TTSOrchestrator, TTSProviderError, apply_voice_lab_overrides
+
     preview_dir = voice_lab_preview_dir()
     profile_payload = runtime_voice_profile_payload(preset_model.voice_profile, preset_model.display_name)
     profile_payload = apply_voice_lab_overrides(
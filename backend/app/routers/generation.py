@@ -17,13 +17,11 @@ from app.schemas import (
     OutputVideoListResponse,
 )
 from app.services.audit import record_audit
+from app.services.generation_jobs import ACTIVE_GENERATION_STATUSES, reconcile_stale_generation_jobs
+from app.services.media_probe import background_probe_error
 from app.services.notifications import create_notification
 from app.services.project_state import sync_project_state, to_generation_summary, to_output_video_summary
-from app.tasks.generation import (
-    ACTIVE_GENERATION_STATUSES,
-    process_generation_job,
-    reconcile_stale_generation_jobs,
-)
+from app.tasks.signatures import process_generation_job
 
 router = APIRouter(tags=["generation"])
 
@@ -56,6 +54,10 @@ def create_generation_job(
     background_asset = latest_background_asset(project)
     if not background_asset:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Project needs a background video or preset")
+    # Rejects backgrounds the probe worker already found no render could use; the job probes the rest.
+    probe_error = background_probe_error(background_asset)
+    if probe_error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=probe_error)
 
     script_revision = project.current_script_revision
     if payload.script_revision_id is not None:
@@ -119,6 +121,83 @@ def create_generation_job(
     return to_generation_summary(job)
 
 
+@router.post("/outputs/{output_video_id}/promote", response_model=GenerationJobSummary, status_code=status.HTTP_201_CREATED)
+def promote_output_video(
+    output_video_id: int,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    enforce_rate_limit(
+        "generation.create",
+        str(current_user.id),
+        limit=settings.HEAVY_ENDPOINT_RATE_LIMIT_COUNT,
+        window_seconds=settings.HEAVY_ENDPOINT_RATE_LIMIT_WINDOW_SECONDS,
+    )
+    output = (
+        db.query(OutputVideo)
+        .join(Project, Project.id == OutputVideo.project_id)
+        .filter(OutputVideo.id == output_video_id, Project.user_id == current_user.id)
+        .one_or_none()
+    )
+    if not output:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Output video not found")
+    if output.output_kind != "draft":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Only draft renders can be promoted")
+    project = output.project
+    source_job = output.generation_job
+
+    existing_active_job = (
+        db.query(GenerationJob)
+        .filter(
+            GenerationJob.project_id == project.id,
+            GenerationJob.output_kind == "final",
+            GenerationJob.source_output_video_id == output.id,
+            GenerationJob.status.in_(tuple(ACTIVE_GENERATION_STATUSES)),
+        )
+        .order_by(GenerationJob.created_at.desc())
+        .first()
+    )
+    if existing_active_job:
+        response.status_code = status.HTTP_200_OK
+        return to_generation_summary(existing_active_job)
+
+    job = GenerationJob(
+        project_id=project.id,
+        input_asset_id=source_job.input_asset_id,
+        script_revision_id=source_job.script_revision_id,
+        style_preset=source_job.style_preset,
+        output_kind="final",
+        provider_name=source_job.provider_name,
+        source_output_video_id=output.id,
+        status="queued",
+        progress=0,
+    )
+    project.status = "render_queued"
+    db.add(job)
+    db.flush()
+    create_notification(
+        db,
+        user_id=current_user.id,
+        project_id=project.id,
+        category="render.queued",
+        message=f"Final render job #{job.id} is queued from draft output #{output.id}.",
+        payload={"job_id": job.id, "output_kind": "final", "source_output_video_id": output.id},
+    )
+    record_audit(
+        db,
+        user_id=current_user.id,
+        action="render.promoted",
+        entity_type="generation_job",
+        entity_id=job.id,
+        metadata={"project_id": project.id, "source_output_video_id": output.id},
+    )
+    db.commit()
+    db.refresh(job)
+    process_generation_job.delay(job.id)
+    return to_generation_summary(job)
+
+
 @router.get("/generation-jobs/{job_id}", response_model=GenerationJobSummary)
 def get_generation_job(job_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     job = (
@@ -16,7 +16,7 @@ from app.services.notifications import create_notification
 from app.services.platforms import capability_for
 from app.services.project_state import sync_project_state, to_publish_job_summary
 from app.services.routing import choose_social_account, is_account_routing_eligible, suggest_destination
-from app.tasks.publish import process_publish_job
+from app.tasks.signatures import process_publish_job
 
 router = APIRouter(tags=["publish"])
 
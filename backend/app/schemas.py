@@ -192,6 +192,8 @@ class VoiceReferenceAudioSummary(BaseModel):
     sha256: str
     authorization_confirmed: bool
     authorization_note: str | None = None
+    status: str = "ready"
+    error: dict | None = None
     created_at: datetime
 
 
@@ -292,6 +294,20 @@ class ProviderCapabilityListResponse(BaseModel):
     items: list[VoiceProviderCapabilitySummary]
 
 
+class VoiceCacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float | None = None
+    bytes_served: int
+    bytes_stored: int
+    evictions: int
+    bytes_evicted: int
+    entries: int
+    total_bytes: int
+    max_bytes: int
+    ttl_seconds: int
+
+
 class VoiceProfilePrepareResponse(BaseModel):
     voice_profile: VoiceProfileSummary
     provider_used: str
@@ -411,8 +427,8 @@ class ScriptGenerateRequest(BaseModel):
 class GenerationJobCreateRequest(BaseModel):
     script_revision_id: int | None = None
     background_style: Literal["none", "blur", "grayscale"] = "none"
-    output_kind: Literal["preview", "final"] = "preview"
-    provider_name: str = "local-compositor"
+    output_kind: Literal["draft", "preview", "final"] = "preview"
+    provider_name: Literal["local-compositor", "ffmpeg-filtergraph", "ffmpeg-segmented"] = "local-compositor"
 
 
 class GenerationJobSummary(BaseModel):
@@ -423,6 +439,7 @@ class GenerationJobSummary(BaseModel):
     style_preset: str
     output_kind: str
     provider_name: str
+    source_output_video_id: int | None = None
     error_message: str | None = None
     output_video_id: int | None = None
     started_at: datetime | None = None
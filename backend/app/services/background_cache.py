@@ -0,0 +1,134 @@
+"""Pre-styled, canvas-sized background derivatives shared by every render of the same asset.
+
+A derivative is the background cover-scaled and cropped to the render canvas, blurred when the style
+asks for it and resampled to the render fps, then encoded as a short-GOP mezzanine. Renderers overlay
+onto it directly instead of decoding, resizing and blurring the original on every render.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.filtergraph import canvas_filters, ffmpeg_binary, x264_gop_args
+from app.services.storage import content_sha256, media_root
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_CACHE_KEY_VERSION = 1
+MEZZANINE_PRESET = "veryfast"
+MEZZANINE_CRF = 16
+
+_build_locks: dict[str, threading.Lock] = {}
+_build_locks_guard = threading.Lock()
+
+
+def background_cache_dir() -> Path:
+    path = media_root() / "background_cache"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def background_derivative_key(source_digest: str, style_preset: str, fps: int, canvas: tuple[int, int]) -> str:
+    payload = json.dumps(
+        {
+            "version": BACKGROUND_CACHE_KEY_VERSION,
+            "source": source_digest,
+            "style_preset": style_preset,
+            "fps": int(fps),
+            "canvas": list(canvas),
+            "encode": [MEZZANINE_PRESET, MEZZANINE_CRF],
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_derivative_command(
+    binary: str, source_path: str | Path, output_path: Path, *, style_preset: str, fps: int, canvas: tuple[int, int]
+) -> list[str]:
+    return [
+        binary,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-y",
+        "-i",
+        str(source_path),
+        "-vf",
+        ",".join([*canvas_filters(style_preset, *canvas), f"fps={int(fps)}", "format=yuv420p"]),
+        "-an",
+        "-c:v",
+        "libx264",
+        "-preset",
+        MEZZANINE_PRESET,
+        "-crf",
+        str(MEZZANINE_CRF),
+        # One-second GOPs keep segment seeks into the derivative cheap.
+        *x264_gop_args(int(fps)),
+        "-movflags",
+        "+faststart",
+        str(output_path),
+    ]
+
+
+def ensure_background_derivative(
+    source_path: str | Path,
+    *,
+    style_preset: str,
+    fps: int,
+    canvas: tuple[int, int],
+    source_digest: str | None = None,
+    binary: str | None = None,
+) -> Path:
+    """Returns the derivative for these render settings, encoding it on first use."""
+    key = background_derivative_key(source_digest or content_sha256(source_path), style_preset, fps, canvas)
+    path = background_cache_dir() / f"{key}.mp4"
+    with _build_locks_guard:
+        lock = _build_locks.setdefault(key, threading.Lock())
+    with lock:
+        if path.exists():
+            os.utime(path)
+            return path
+        binary = binary or ffmpeg_binary()
+        if not binary:
+            raise RuntimeError("ffmpeg is not installed; background derivatives cannot be built.")
+        temp_path = path.with_name(f"{key}.{uuid.uuid4().hex}.tmp.mp4")
+        command = build_derivative_command(binary, source_path, temp_path, style_preset=style_preset, fps=fps, canvas=canvas)
+        try:
+            subprocess.run(command, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as exc:
+            temp_path.unlink(missing_ok=True)
+            raise RuntimeError(f"Background derivative encode failed: {(exc.stderr or '').strip() or exc}") from exc
+        os.replace(temp_path, path)
+    logger.info("background_cache.build source=%s style=%s fps=%s canvas=%s", source_path, style_preset, fps, canvas)
+    return path
+
+
+def evict_background_cache(*, max_bytes: int | None = None, min_age_seconds: int | None = None) -> list[str]:
+    budget = settings.BACKGROUND_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    min_age = settings.CACHE_EVICTION_MIN_AGE_SECONDS if min_age_seconds is None else min_age_seconds
+    cutoff = time.time() - min_age
+    files = [path for path in background_cache_dir().glob("*.mp4") if path.is_file() and not path.name.endswith(".tmp.mp4")]
+    stats = {path: path.stat() for path in files}
+    total = sum(stat.st_size for stat in stats.values())
+    evicted: list[str] = []
+    for path in sorted(files, key=lambda item: stats[item].st_mtime):
+        if total <= budget:
+            break
+        if stats[path].st_mtime >= cutoff:
+            continue
+        path.unlink(missing_ok=True)
+        total -= stats[path].st_size
+        evicted.append(path.name)
+    if evicted:
+        logger.info("Evicted %s background derivatives; %s bytes remain", len(evicted), total)
+    return evicted
@@ -0,0 +1,119 @@
+"""In-process espeak-ng synthesis through libespeak-ng.
+
+The library is initialised once per process in synchronous mode and its PCM is collected from the
+synth callback, so a line costs one `espeak_Synth` call instead of a fork, an exec and a WAV parse.
+espeak-ng keeps its voice and parameters in globals, so synthesis is serialised on a lock and the
+voice is switched per request; the TTS orchestrator caps espeak at one line at a time while this
+backend is active, rather than queueing extra workers on the lock.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import threading
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+AUDIO_OUTPUT_SYNCHRONOUS = 2
+INITIALIZE_DONT_EXIT = 0x8000
+CHARS_UTF8 = 1
+ENDPAUSE = 0x1000  # the CLI's default: a short pause after the last word
+POSITION_CHARACTER = 1
+EE_OK = 0
+PARAM_RATE = 1
+PARAM_VOLUME = 2
+PARAM_PITCH = 3
+PARAM_WORDGAP = 7
+
+_SynthCallback = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+
+
+class EspeakLibrary:
+    def __init__(self, lib: ctypes.CDLL):
+        lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+        lib.espeak_Initialize.restype = ctypes.c_int
+        lib.espeak_SetSynthCallback.argtypes = [_SynthCallback]
+        lib.espeak_SetSynthCallback.restype = None
+        lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+        lib.espeak_SetVoiceByName.restype = ctypes.c_int
+        lib.espeak_SetParameter.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        lib.espeak_SetParameter.restype = ctypes.c_int
+        lib.espeak_Synth.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_size_t,
+            ctypes.c_uint,
+            ctypes.c_int,
+            ctypes.c_uint,
+            ctypes.c_uint,
+            ctypes.POINTER(ctypes.c_uint),
+            ctypes.c_void_p,
+        ]
+        lib.espeak_Synth.restype = ctypes.c_int
+        sample_rate = lib.espeak_Initialize(AUDIO_OUTPUT_SYNCHRONOUS, 0, None, INITIALIZE_DONT_EXIT)
+        if sample_rate <= 0:
+            raise OSError("espeak_Initialize failed; is espeak-ng-data installed?")
+        self.sample_rate = int(sample_rate)
+        self._lib = lib
+        self._lock = threading.Lock()
+        self._chunks: list[bytes] = []
+        self._voice: str | None = None
+        # Held on the instance: ctypes does not keep the trampoline alive for the library.
+        self._callback = _SynthCallback(self._collect)
+        lib.espeak_SetSynthCallback(self._callback)
+
+    def _collect(self, wav, sample_count, _events) -> int:
+        if wav and sample_count > 0:
+            self._chunks.append(ctypes.string_at(wav, sample_count * 2))
+        return 0
+
+    def synthesize(self, text: str, *, voice: str, rate: int, pitch: int, word_gap: int, amplitude: int) -> np.ndarray:
+        """Returns mono int16 samples at `sample_rate`."""
+        encoded = text.encode("utf-8") + b"\0"
+        with self._lock:
+            if voice != self._voice:
+                if self._lib.espeak_SetVoiceByName(voice.encode("utf-8")) != EE_OK:
+                    raise ValueError(f"espeak-ng has no voice named {voice!r}")
+                self._voice = voice
+            for parameter, value in ((PARAM_RATE, rate), (PARAM_PITCH, pitch), (PARAM_WORDGAP, word_gap), (PARAM_VOLUME, amplitude)):
+                self._lib.espeak_SetParameter(parameter, int(value), 0)
+            self._chunks = []
+            result = self._lib.espeak_Synth(encoded, len(encoded), 0, POSITION_CHARACTER, 0, CHARS_UTF8 | ENDPAUSE, None, None)
+            chunks, self._chunks = self._chunks, []
+        if result != EE_OK:
+            raise RuntimeError(f"espeak_Synth returned {result}")
+        return np.frombuffer(b"".join(chunks), dtype="<i2")
+
+
+# Keyed by the configured setting, then by the resolved shared object: initialising one library twice
+# would re-point its synth callback away from the first binding.
+_libraries: dict[str, EspeakLibrary | None] = {}
+_libraries_by_path: dict[str, EspeakLibrary] = {}
+_library_guard = threading.Lock()
+
+
+def espeak_library() -> EspeakLibrary | None:
+    """The process-wide library binding, or None when libespeak-ng is unavailable or disabled.
+
+    `TTS_ESPEAK_LIBRARY` is "auto" (search the linker path), a path to the shared object, or empty
+    to always use the espeak-ng CLI. A changed setting is picked up on the next call.
+    """
+    configured = (settings.TTS_ESPEAK_LIBRARY or "").strip()
+    if configured in _libraries:
+        return _libraries[configured]
+    with _library_guard:
+        if configured not in _libraries:
+            path = ctypes.util.find_library("espeak-ng") if configured == "auto" else configured
+            library = _libraries_by_path.get(path) if path else None
+            if path and library is None:
+                try:
+                    library = _libraries_by_path[path] = EspeakLibrary(ctypes.CDLL(path))
+                except (OSError, AttributeError) as exc:
+                    logger.warning("espeak.library_unavailable path=%s error=%s", path, exc)
+            _libraries[configured] = library
+    return _libraries[configured]
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import logging
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+RENDER_ENGINE_MOVIEPY = "local-compositor"
+RENDER_ENGINE_FILTERGRAPH = "ffmpeg-filtergraph"
+RENDER_ENGINE_SEGMENTED = "ffmpeg-segmented"
+RENDER_ENGINES = (RENDER_ENGINE_MOVIEPY, RENDER_ENGINE_FILTERGRAPH, RENDER_ENGINE_SEGMENTED)
+
+# cv2.GaussianBlur((31, 31), 0) derives sigma = 0.3 * ((31 - 1) * 0.5 - 1) + 0.8.
+BACKGROUND_BLUR_SIGMA = 5.0
+
+
+def ffmpeg_binary() -> str | None:
+    binary = shutil.which("ffmpeg")
+    if binary:
+        return binary
+    try:
+        import imageio_ffmpeg
+
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+def probe_video_fps(path: str | Path, binary: str | None = None) -> float | None:
+    binary = binary or ffmpeg_binary()
+    if not binary:
+        return None
+    result = subprocess.run([binary, "-hide_banner", "-i", str(path)], capture_output=True, text=True)
+    match = re.search(r"Video:.*?([0-9]+(?:\.[0-9]+)?) fps", result.stderr or "")
+    return float(match.group(1)) if match else None
+
+
+def probe_media_duration(path: str | Path, binary: str | None = None) -> float | None:
+    binary = binary or ffmpeg_binary()
+    if not binary:
+        return None
+    result = subprocess.run([binary, "-hide_banner", "-i", str(path)], capture_output=True, text=True)
+    match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", result.stderr or "")
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def x264_gop_args(gop: int | None) -> list[str]:
+    """Fixed-length GOP without B-frames, so short drafts seek to any second without decoding far back."""
+    if not gop:
+        return []
+    return ["-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0", "-bf", "0"]
+
+
+def canvas_filters(style_preset: str, width: int, height: int) -> list[str]:
+    """Styles a background and fills the canvas with it (cover-scale, then centre crop)."""
+    filters = [f"gblur=sigma={BACKGROUND_BLUR_SIGMA}"] if style_preset == "blur" else []
+    filters.extend(
+        [
+            f"scale={width}:{height}:force_original_aspect_ratio=increase",
+            f"crop={width}:{height}",
+            "setsar=1",
+        ]
+    )
+    return filters
+
+
+def _seconds(value: float) -> str:
+    return f"{value:.3f}"
+
+
+class FiltergraphRenderer:
+    """Renders a speaker timeline with a single ffmpeg filter_complex invocation.
+
+    The layer and audio descriptions mirror what the MoviePy compositor stacks into a
+    CompositeVideoClip, so both engines produce the same timeline without decoding frames
+    in Python.
+    """
+
+    def __init__(self, *, canvas_width: int, canvas_height: int, binary: str | None = None) -> None:
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+        self.binary = binary or ffmpeg_binary()
+
+    def build_filtergraph(
+        self,
+        *,
+        style_preset: str,
+        fps: int,
+        total_duration: float,
+        image_inputs: list[str],
+        image_layers: list[dict[str, Any]],
+        audio_segments: list[dict[str, Any]],
+        audio_fps: int,
+        freeze_background: bool = False,
+        prepared_background: bool = False,
+    ) -> str:
+        # A frozen background holds the first decoded frame, used for segments past the end of the clip.
+        background_filters = ["trim=end_frame=1"] if freeze_background else []
+        # A prepared background is already styled and canvas-sized (see background_cache).
+        if prepared_background:
+            background_filters.append("setsar=1")
+        else:
+            background_filters.extend(canvas_filters(style_preset, self.canvas_width, self.canvas_height))
+        background_filters.extend(
+            [
+                f"fps={fps}",
+                f"tpad=stop_mode=clone:stop_duration={_seconds(total_duration)}",
+                f"trim=duration={_seconds(total_duration)}",
+                "setpts=PTS-STARTPTS",
+            ]
+        )
+        chains = [f"[0:v]{','.join(background_filters)}[bg]"]
+
+        usage: dict[int, int] = {}
+        for layer in image_layers:
+            input_index = image_inputs.index(layer["image_path"])
+            usage[input_index] = usage.get(input_index, 0) + 1
+        split_labels: dict[int, list[str]] = {}
+        for input_index, count in usage.items():
+            labels = [f"img{input_index}_{copy}" for copy in range(count)]
+            split_labels[input_index] = labels
+            source = f"[{input_index + 1}:v]"
+            if count == 1:
+                chains.append(f"{source}format=rgba[{labels[0]}]")
+            else:
+                chains.append(f"{source}format=rgba,split={count}{''.join(f'[{label}]' for label in labels)}")
+
+        current = "bg"
+        for layer_index, layer in enumerate(image_layers):
+            input_index = image_inputs.index(layer["image_path"])
+            source_label = split_labels[input_index].pop(0)
+            layer_filters = []
+            if layer.get("height"):
+                layer_filters.append(f"scale=-1:{int(layer['height'])}")
+            if layer.get("opacity") is not None and float(layer["opacity"]) < 1:
+                layer_filters.append(f"colorchannelmixer=aa={float(layer['opacity']):.2f}")
+            layer_label = f"layer{layer_index}"
+            chains.append(f"[{source_label}]{','.join(layer_filters) or 'null'}[{layer_label}]")
+            x, y = layer["position"]
+            overlay = f"overlay=x={int(x)}:y={int(y)}:eof_action=repeat"
+            if layer.get("end") is not None:
+                overlay += f":enable='between(t,{_seconds(float(layer['start']))},{_seconds(float(layer['end']))})'"
+            output_label = f"v{layer_index}"
+            chains.append(f"[{current}][{layer_label}]{overlay}[{output_label}]")
+            current = output_label
+        chains.append(f"[{current}]format=yuv420p[vout]")
+        if audio_segments:
+            chains.extend(self._audio_chains(audio_segments, audio_fps, input_offset=len(image_inputs) + 1))
+        return ";\n".join(chains)
+
+    def _audio_chains(self, audio_segments: list[dict[str, Any]], audio_fps: int, *, input_offset: int) -> list[str]:
+        chains = []
+        audio_offset = input_offset
+        audio_labels = []
+        for index, segment in enumerate(audio_segments):
+            duration = _seconds(float(segment["duration_seconds"]))
+            label = f"a{index}"
+            chains.append(
+                f"[{audio_offset + index}:a]aresample={audio_fps},"
+                "aformat=sample_fmts=fltp:channel_layouts=stereo,"
+                f"volume={float(segment.get('gain') or 1.0):.4f},"
+                f"apad=whole_dur={duration},atrim=duration={duration}[{label}]"
+            )
+            audio_labels.append(f"[{label}]")
+        chains.append(f"{''.join(audio_labels)}concat=n={len(audio_labels)}:v=0:a=1[aout]")
+        return chains
+
+    def build_command(
+        self,
+        *,
+        background_path: str,
+        style_preset: str,
+        image_layers: list[dict[str, Any]],
+        audio_segments: list[dict[str, Any]],
+        total_duration: float,
+        render_config: dict[str, Any],
+        audio_fps: int,
+        audio_bitrate: str,
+        filtergraph_path: Path,
+        output_path: Path,
+        background_seek: float | None = None,
+        include_audio: bool = True,
+        prepared_background: bool = False,
+    ) -> list[str]:
+        """Builds the ffmpeg command for one render.
+
+        `background_seek` starts the background at that offset (a negative value seeks from its end and
+        freezes that frame), `include_audio=False` encodes a video-only segment and `prepared_background`
+        skips styling and canvas fitting for an input that is already a background derivative.
+        """
+        if not self.binary:
+            raise RuntimeError("ffmpeg is not installed; the filtergraph render engine is unavailable.")
+        if include_audio and not audio_segments:
+            raise RuntimeError("Filtergraph render needs at least one speech segment.")
+        audio_segments = audio_segments if include_audio else []
+        image_inputs: list[str] = []
+        for layer in image_layers:
+            if layer["image_path"] not in image_inputs:
+                image_inputs.append(layer["image_path"])
+
+        filtergraph_path.write_text(
+            self.build_filtergraph(
+                style_preset=style_preset,
+                fps=int(render_config["fps"]),
+                total_duration=total_duration,
+                image_inputs=image_inputs,
+                image_layers=image_layers,
+                audio_segments=audio_segments,
+                audio_fps=audio_fps,
+                freeze_background=background_seek is not None and background_seek < 0,
+                prepared_background=prepared_background,
+            ),
+            encoding="utf-8",
+        )
+        command = [self.binary, "-hide_banner", "-loglevel", "error", "-y"]
+        if background_seek is not None:
+            command.extend(["-sseof" if background_seek < 0 else "-ss", _seconds(background_seek)])
+        command.extend(["-i", background_path])
+        for image_path in image_inputs:
+            command.extend(["-i", image_path])
+        for segment in audio_segments:
+            command.extend(["-i", str(segment["audio_path"])])
+        command.extend(
+            [
+                "-filter_complex_script",
+                str(filtergraph_path),
+                "-map",
+                "[vout]",
+                *(["-map", "[aout]"] if include_audio else []),
+                "-t",
+                _seconds(total_duration),
+                "-r",
+                str(render_config["fps"]),
+                "-c:v",
+                "libx264",
+                "-preset",
+                str(render_config["preset"]),
+                "-crf",
+                str(render_config["crf"]),
+                "-pix_fmt",
+                "yuv420p",
+                *x264_gop_args(render_config.get("gop")),
+                "-threads",
+                str(render_config["threads"]),
+                *(["-c:a", "aac", "-ar", str(audio_fps), "-b:a", audio_bitrate] if include_audio else ["-an"]),
+                "-movflags",
+                "+faststart",
+                str(output_path),
+            ]
+        )
+        return command
+
+    def build_concat_command(
+        self,
+        *,
+        segment_list_path: Path,
+        audio_segments: list[dict[str, Any]],
+        audio_fps: int,
+        audio_bitrate: str,
+        filtergraph_path: Path,
+        output_path: Path,
+    ) -> list[str]:
+        """Stream-copies pre-encoded video segments and encodes the dialogue track once over the whole timeline."""
+        if not self.binary:
+            raise RuntimeError("ffmpeg is not installed; the filtergraph render engine is unavailable.")
+        if not audio_segments:
+            raise RuntimeError("Filtergraph render needs at least one speech segment.")
+        filtergraph_path.write_text(
+            ";\n".join(self._audio_chains(audio_segments, audio_fps, input_offset=1)), encoding="utf-8"
+        )
+        command = [
+            self.binary,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            str(segment_list_path),
+        ]
+        for segment in audio_segments:
+            command.extend(["-i", str(segment["audio_path"])])
+        command.extend(
+            [
+                "-filter_complex_script",
+                str(filtergraph_path),
+                "-map",
+                "0:v",
+                "-map",
+                "[aout]",
+                "-c:v",
+                "copy",
+                "-c:a",
+                "aac",
+                "-ar",
+                str(audio_fps),
+                "-b:a",
+                audio_bitrate,
+                "-movflags",
+                "+faststart",
+                str(output_path),
+            ]
+        )
+        return command
+
+    def run(self, command: list[str], output_path: Path) -> Path:
+        try:
+            subprocess.run(command, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as exc:
+            output_path.unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg filtergraph render failed: {(exc.stderr or '').strip() or exc}") from exc
+        return output_path
+
+    def render(self, *, output_path: Path, **kwargs: Any) -> Path:
+        command = self.build_command(output_path=output_path, **kwargs)
+        logger.info("filtergraph.render output=%s inputs=%s", output_path, command.count("-i"))
+        return self.run(command, output_path)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import logging
+import re
+import subprocess
+from pathlib import Path
+from typing import Any
+
+from app.models import Asset
+from app.services.filtergraph import ffmpeg_binary
+
+logger = logging.getLogger(__name__)
+
+MEDIA_PROBE_VERSION = 1
+KEYFRAME_SAMPLE_SECONDS = 10
+MAX_BACKGROUND_DIMENSION = 4096
+MAX_BACKGROUND_FPS = 120
+MAX_BACKGROUND_DURATION_SECONDS = 30 * 60
+
+_DURATION_PATTERN = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_VIDEO_STREAM_PATTERN = re.compile(r"Stream #\d+:\d+.*?: Video: (\w+).*?, (\d+)x(\d+)")
+_FPS_PATTERN = re.compile(r"([0-9]+(?:\.[0-9]+)?) (?:fps|tbr)")
+_ROTATION_PATTERN = re.compile(r"rotation of (-?[0-9]+(?:\.[0-9]+)?) degrees")
+_KEYFRAME_PATTERN = re.compile(r"pts_time:\s*(-?[0-9]+(?:\.[0-9]+)?)")
+
+
+class BackgroundProbeError(RuntimeError):
+    """A background no render could use; the probe worker records it on the asset."""
+
+    def __init__(self, message: str, *, probe: dict[str, Any], code: str = "invalid_background_video") -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.probe = probe
+
+    def detail(self) -> dict[str, Any]:
+        return {"code": self.code, "message": self.message, "probe": self.probe}
+
+
+def _keyframe_interval(path: Path, binary: str, sample_seconds: int = KEYFRAME_SAMPLE_SECONDS) -> float | None:
+    """Mean spacing of keyframes over the first `sample_seconds`; only keyframes are decoded."""
+    result = subprocess.run(
+        [
+            binary,
+            "-hide_banner",
+            "-skip_frame",
+            "nokey",
+            "-i",
+            str(path),
+            "-t",
+            str(sample_seconds),
+            "-map",
+            "0:v:0",
+            "-vf",
+            "showinfo",
+            "-f",
+            "null",
+            "-",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    times = sorted(float(value) for value in _KEYFRAME_PATTERN.findall(result.stderr or ""))
+    if len(times) < 2:
+        return None
+    return round((times[-1] - times[0]) / (len(times) - 1), 3)
+
+
+def probe_media(path: str | Path, binary: str | None = None) -> dict[str, Any]:
+    """Reads container and stream facts from ffmpeg's input banner without decoding the video.
+
+    Unreadable files come back with `readable=False` instead of raising, so callers decide how
+    strict to be.
+    """
+    binary = binary or ffmpeg_binary()
+    if not binary:
+        raise RuntimeError("ffmpeg is not installed; media cannot be probed.")
+    result = subprocess.run([binary, "-hide_banner", "-i", str(path)], capture_output=True, text=True)
+    banner = result.stderr or ""
+    probe: dict[str, Any] = {"version": MEDIA_PROBE_VERSION, "readable": "Input #0" in banner}
+    duration = _DURATION_PATTERN.search(banner)
+    if duration:
+        hours, minutes, seconds = duration.groups()
+        probe["duration_seconds"] = round(int(hours) * 3600 + int(minutes) * 60 + float(seconds), 3)
+    video_line = next((line for line in banner.splitlines() if _VIDEO_STREAM_PATTERN.search(line)), None)
+    probe["has_video"] = video_line is not None
+    probe["has_audio"] = bool(re.search(r"Stream #\d+:\d+.*?: Audio:", banner))
+    if video_line is not None:
+        codec, width, height = _VIDEO_STREAM_PATTERN.search(video_line).groups()
+        fps = _FPS_PATTERN.search(video_line)
+        rotation = _ROTATION_PATTERN.search(banner)
+        probe.update(
+            {
+                "codec": codec,
+                "width": int(width),
+                "height": int(height),
+                "fps": float(fps.group(1)) if fps else None,
+                "rotation": int(float(rotation.group(1))) % 360 if rotation else 0,
+            }
+        )
+        if probe["rotation"] in (90, 270):
+            # Players (and MoviePy) apply the display matrix, so report the size as shown.
+            probe["width"], probe["height"] = probe["height"], probe["width"]
+        probe["keyframe_interval_seconds"] = _keyframe_interval(Path(path), binary)
+    return probe
+
+
+def background_probe_errors(probe: dict[str, Any]) -> list[str]:
+    if not probe.get("readable"):
+        return ["The file is not a readable video container."]
+    if not probe.get("has_video"):
+        return ["The file has no video stream."]
+    errors = []
+    width, height = probe.get("width") or 0, probe.get("height") or 0
+    if min(width, height) < 2 or max(width, height) > MAX_BACKGROUND_DIMENSION:
+        errors.append(f"Video resolution {width}x{height} is outside 2..{MAX_BACKGROUND_DIMENSION} pixels.")
+    fps = probe.get("fps")
+    if fps is not None and not 1 <= fps <= MAX_BACKGROUND_FPS:
+        errors.append(f"Video frame rate {fps:g} fps is outside 1..{MAX_BACKGROUND_FPS} fps.")
+    duration = probe.get("duration_seconds")
+    if not duration or duration <= 0:
+        errors.append("The video has no duration.")
+    elif duration > MAX_BACKGROUND_DURATION_SECONDS:
+        errors.append(f"Video is longer than {MAX_BACKGROUND_DURATION_SECONDS // 60} minutes.")
+    return errors
+
+
+def apply_background_probe(asset: Asset, probe: dict[str, Any]) -> None:
+    asset.width = probe.get("width")
+    asset.height = probe.get("height")
+    asset.duration_ms = round(probe["duration_seconds"] * 1000) if probe.get("duration_seconds") else None
+    asset.metadata_json = {**dict(asset.metadata_json or {}), "probe": probe}
+
+
+def probe_background_video(path: str | Path) -> dict[str, Any]:
+    """Probes a background and rejects inputs the renderer could never use."""
+    probe = probe_media(path)
+    errors = background_probe_errors(probe)
+    if errors:
+        logger.info("Rejected background %s: %s", path, "; ".join(errors))
+        raise BackgroundProbeError(" ".join(errors), probe=probe)
+    return probe
+
+
+def record_background_probe_error(asset: Asset, error: BackgroundProbeError) -> None:
+    metadata = {key: value for key, value in dict(asset.metadata_json or {}).items() if key != "probe"}
+    asset.metadata_json = {**metadata, "probe_error": error.detail()}
+
+
+def background_probe_error(asset: Asset) -> dict[str, Any] | None:
+    """The rejection the probe worker recorded for `asset`, if any."""
+    return (asset.metadata_json or {}).get("probe_error")
+
+
+def ensure_background_probe(asset: Asset) -> dict[str, Any]:
+    """Returns the recorded probe, probing assets the probe worker has not reached yet.
+
+    Raises `BackgroundProbeError` for a background no render could use, recording it on the asset.
+    """
+    probe = (asset.metadata_json or {}).get("probe")
+    if probe and probe.get("version") == MEDIA_PROBE_VERSION:
+        return probe
+    try:
+        probe = probe_background_video(asset.storage_key)
+    except BackgroundProbeError as exc:
+        record_background_probe_error(asset, exc)
+        raise
+    apply_background_probe(asset, probe)
+    return probe
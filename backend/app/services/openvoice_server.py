@@ -0,0 +1,236 @@
+"""Long-lived OpenVoice inference process shared by every worker on a node.
+
+Run with `python -m app.services.openvoice_server`. Workers reach it through `OPENVOICE_SERVER_SOCKET`,
+so MeloTTS, the tone colour converter and speaker embeddings are loaded once per node instead of once
+per Celery child (and again after every `worker_max_tasks_per_child` recycle).
+
+The protocol is newline-delimited JSON over a Unix stream socket: one request line, then zero or more
+`{"stage": ..., "progress": ...}` lines and a final `{"result": ...}` or `{"error": ...}` line. While a
+request queues for the model and while it runs, the server also sends a `keepalive` stage every
+`OPENVOICE_SERVER_KEEPALIVE_SECONDS`, so the client's read timeout catches a dead server rather than a
+long batch or the queue of other workers' inferences.
+Requests carry file paths rather than audio, so the server must see the same media and render work
+directories as its clients.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.services.tts import OpenVoiceProvider, TTSProviderError, provider_health_cache
+
+logger = logging.getLogger(__name__)
+
+# Fields the provider writes back onto the voice profile it was given.
+VOICE_PROFILE_UPDATE_FIELDS = ("embedding_path", "provider_metadata")
+# Stage sent periodically while a request is queued or running; clients do not report it as progress.
+KEEPALIVE_STAGE = "keepalive"
+
+
+class LocalOpenVoiceProvider(OpenVoiceProvider):
+    """Runs OpenVoice in this process; only the server uses it."""
+
+    def _server_socket(self) -> str | None:
+        return None
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "OpenVoiceServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        self._write_lock = threading.Lock()
+        try:
+            request = json.loads(line)
+            with self._keepalive():
+                result = self.server.dispatch(request, lambda stage, progress: self._send({"stage": stage, "progress": progress}))
+            self._send({"result": result})
+        except TTSProviderError as exc:
+            self._send({"error": exc.as_dict()})
+        except Exception as exc:
+            logger.exception("openvoice.server request failed")
+            self._send({"error": {"code": "openvoice_server_error", "message": f"OpenVoice server error: {exc}"}})
+
+    @contextmanager
+    def _keepalive(self):
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(self.server.keepalive_seconds):
+                try:
+                    self._send({"stage": KEEPALIVE_STAGE, "progress": None})
+                except OSError:
+                    return
+
+        thread = threading.Thread(target=beat, name="openvoice-keepalive", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _send(self, payload: dict[str, Any]) -> None:
+        # Stage callbacks and keepalives write from different threads; each line must go out whole.
+        with self._write_lock:
+            self.wfile.write(json.dumps(payload, default=str).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class OpenVoiceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str | Path, provider: OpenVoiceProvider | None = None, keepalive_seconds: float | None = None) -> None:
+        self.socket_path = Path(socket_path)
+        self.provider = provider or LocalOpenVoiceProvider()
+        self.keepalive_seconds = settings.OPENVOICE_SERVER_KEEPALIVE_SECONDS if keepalive_seconds is None else keepalive_seconds
+        # One copy of the models means one inference at a time; pings and health checks skip the queue.
+        self.inference_lock = threading.Lock()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        super().__init__(str(self.socket_path), _RequestHandler)
+        os.chmod(self.socket_path, 0o660)
+
+    def dispatch(self, request: dict[str, Any], stage_callback) -> Any:
+        op = request.get("op")
+        if op == "ping":
+            return {"pid": os.getpid(), "rss_mb": round(self.provider._memory_mb(), 1)}
+        if op == "healthcheck":
+            health = self.provider.healthcheck()
+            return {**health, "metadata": {**dict(health.get("metadata") or {}), "server_pid": os.getpid()}}
+        voice_profile = dict(request.get("voice_profile") or {})
+        with self.inference_lock:
+            # PCM buffers stay in this process; clients read the audio file the provider wrote.
+            if op == "synthesize_line":
+                result = self.provider.synthesize_line(
+                    text=request["text"],
+                    voice_profile=voice_profile,
+                    output_path=Path(request["output_path"]),
+                    options={**dict(request.get("options") or {}), "stage_callback": stage_callback},
+                )
+                result.pop("pcm", None)
+            elif op == "synthesize_batch":
+                items = [{"text": item["text"], "output_path": Path(item["output_path"])} for item in request["items"]]
+                result = {
+                    "items": [
+                        {key: value for key, value in item.items() if key != "pcm"}
+                        for item in self.provider.synthesize_batch(items, voice_profile)
+                    ]
+                }
+            elif op == "prepare_voice_profile":
+                result = self.provider.prepare_voice_profile(voice_profile)
+            else:
+                raise ValueError(f"Unknown OpenVoice server op: {op}")
+        return {
+            **result,
+            "voice_profile": {key: voice_profile[key] for key in VOICE_PROFILE_UPDATE_FIELDS if key in voice_profile},
+        }
+
+    def warm_up(self, languages: list[str]) -> None:
+        self.provider.warm_up(languages)
+
+
+class OpenVoiceClient:
+    def __init__(self, socket_path: str | Path, timeout: float | None = None) -> None:
+        self.socket_path = str(socket_path)
+        self.timeout = settings.OPENVOICE_SERVER_TIMEOUT_SECONDS if timeout is None else timeout
+
+    def request(self, op: str, payload: dict[str, Any] | None = None, stage_callback=None) -> Any:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.settimeout(self.timeout)
+                connection.connect(self.socket_path)
+                connection.sendall(json.dumps({"op": op, **(payload or {})}, default=str).encode("utf-8") + b"\n")
+                with connection.makefile("rb") as stream:
+                    for line in stream:
+                        message = json.loads(line)
+                        if "stage" in message:
+                            if message["stage"] != KEEPALIVE_STAGE and callable(stage_callback):
+                                stage_callback(message["stage"], message["progress"])
+                            continue
+                        if "error" in message:
+                            error = TTSProviderError(**message["error"])
+                            provider_health_cache.invalidate_for_error("openvoice", error)
+                            raise error
+                        return message["result"]
+        except OSError as exc:
+            provider_health_cache.invalidate("openvoice")
+            raise TTSProviderError(
+                code="openvoice_server_unavailable",
+                message=f"OpenVoice server is not reachable at {self.socket_path}: {exc}",
+                provider_state={"openvoice": {"available": False, "reason": "server_unavailable"}},
+                suggested_action="Start the OpenVoice server (python -m app.services.openvoice_server) or allow espeak fallback.",
+            ) from exc
+        raise TTSProviderError(
+            code="openvoice_server_unavailable",
+            message="OpenVoice server closed the connection without a response.",
+            suggested_action="Check the OpenVoice server logs; it may have been restarted mid-request.",
+        )
+
+    def healthcheck(self) -> dict[str, Any]:
+        try:
+            health = self.request("healthcheck")
+        except TTSProviderError as exc:
+            return {"available": False, "reason": "server_unavailable", "metadata": {"server_socket": self.socket_path, "error": exc.message}}
+        return {**health, "metadata": {**dict(health.get("metadata") or {}), "server_socket": self.socket_path}}
+
+    def _apply_profile_updates(self, voice_profile: dict[str, Any], result: dict[str, Any]) -> dict[str, Any]:
+        voice_profile.update(result.pop("voice_profile", None) or {})
+        return result
+
+    def synthesize_line(self, *, text: str, voice_profile: dict[str, Any], output_path: Path, options: dict[str, Any]) -> dict[str, Any]:
+        result = self.request(
+            "synthesize_line",
+            {
+                "text": text,
+                "voice_profile": voice_profile,
+                "output_path": str(Path(output_path).absolute()),
+                "options": {key: value for key, value in options.items() if not callable(value)},
+            },
+            stage_callback=options.get("stage_callback"),
+        )
+        return self._apply_profile_updates(voice_profile, result)
+
+    def synthesize_batch(self, *, items: list[dict[str, Any]], voice_profile: dict[str, Any]) -> list[dict[str, Any]]:
+        result = self.request(
+            "synthesize_batch",
+            {
+                "items": [{"text": item["text"], "output_path": str(Path(item["output_path"]).absolute())} for item in items],
+                "voice_profile": voice_profile,
+            },
+        )
+        return self._apply_profile_updates(voice_profile, result)["items"]
+
+    def prepare_voice_profile(self, voice_profile: dict[str, Any]) -> dict[str, Any]:
+        return self._apply_profile_updates(voice_profile, self.request("prepare_voice_profile", {"voice_profile": voice_profile}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve OpenVoice inference over a Unix socket.")
+    parser.add_argument("--socket", default=settings.OPENVOICE_SERVER_SOCKET or "/tmp/omniposter-openvoice.sock")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    server = OpenVoiceServer(args.socket)
+    server.warm_up([language.strip() for language in settings.OPENVOICE_SERVER_WARM_LANGUAGES.split(",") if language.strip()])
+    logger.info("openvoice.server listening socket=%s pid=%s", args.socket, os.getpid())
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        Path(args.socket).unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -95,6 +95,7 @@ def to_generation_summary(job: GenerationJob) -> GenerationJobSummary:
         style_preset=job.style_preset,
         output_kind=job.output_kind,
         provider_name=job.provider_name,
+        source_output_video_id=job.source_output_video_id,
         error_message=job.error_message,
         output_video_id=job.output_video.id if job.output_video else None,
         started_at=job.started_at,
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable
+
+from PIL import Image, ImageFont
+
+from app.core.config import settings
+from app.services.storage import media_root
+
+logger = logging.getLogger(__name__)
+
+RASTER_CACHE_KEY_VERSION = 1
+DEFAULT_FONT_NAME = "DejaVuSans-Bold.ttf"
+
+
+def raster_cache_dir() -> Path:
+    path = media_root() / "raster_cache"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@lru_cache(maxsize=32)
+def load_font(size: int, name: str = DEFAULT_FONT_NAME):
+    try:
+        return ImageFont.truetype(name, size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+def font_identity(size: int, name: str = DEFAULT_FONT_NAME) -> str:
+    return f"{getattr(load_font(size, name), 'path', None) or 'default'}@{size}"
+
+
+def raster_cache_key(kind: str, parts: dict[str, Any]) -> str:
+    payload = json.dumps({"version": RASTER_CACHE_KEY_VERSION, "kind": kind, **parts}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def resize_to_height(image: Image.Image, height: int) -> Image.Image:
+    if image.height == height:
+        return image
+    width = max(1, round(image.width * height / image.height))
+    return image.resize((width, height), Image.LANCZOS)
+
+
+def cached_raster(kind: str, parts: dict[str, Any], build: Callable[[], Image.Image]) -> Path:
+    """Returns the cached PNG for `parts`, rasterising it with `build` on a miss."""
+    path = raster_cache_dir() / f"{kind}_{raster_cache_key(kind, parts)}.png"
+    if path.exists():
+        os.utime(path)
+        return path
+    temp_path = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.tmp.png")
+    build().save(temp_path)
+    os.replace(temp_path, path)
+    return path
+
+
+def evict_raster_cache(*, max_bytes: int | None = None, min_age_seconds: int | None = None) -> list[str]:
+    budget = settings.RASTER_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    min_age = settings.CACHE_EVICTION_MIN_AGE_SECONDS if min_age_seconds is None else min_age_seconds
+    cutoff = time.time() - min_age
+    files = [path for path in raster_cache_dir().glob("*.png") if path.is_file() and not path.name.endswith(".tmp.png")]
+    stats = {path: path.stat() for path in files}
+    total = sum(stat.st_size for stat in stats.values())
+    evicted: list[str] = []
+    for path in sorted(files, key=lambda item: stats[item].st_mtime):
+        if total <= budget:
+            break
+        # Lookups refresh the mtime, so a recent one may belong to a render that has not composited yet.
+        if stats[path].st_mtime >= cutoff:
+            continue
+        path.unlink(missing_ok=True)
+        total -= stats[path].st_size
+        evicted.append(path.name)
+    if evicted:
+        logger.info("Evicted %s raster cache files; %s bytes remain", len(evicted), total)
+    return evicted
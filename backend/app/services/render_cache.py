@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Asset
+from app.services.storage import blob_path, content_sha256, media_root
+
+logger = logging.getLogger(__name__)
+
+# 2: renders overlay onto background derivatives instead of the original asset.
+# 3: entries are scoped to the project whose timeline and media paths they carry.
+RENDER_CACHE_KEY_VERSION = 3
+
+
+def render_cache_dir() -> Path:
+    path = media_root() / "render_cache"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def segment_cache_dir() -> Path:
+    path = render_cache_dir() / "segments"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def render_cache_key(inputs: dict[str, Any]) -> str:
+    payload = json.dumps({"version": RENDER_CACHE_KEY_VERSION, **inputs}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_cacheable_render(result: dict[str, Any]) -> bool:
+    """Only full speaker renders with every line on its requested provider may be reused.
+
+    Overlay-only fallbacks and renders with lines that fell back to espeak are served once; caching them
+    would keep handing out the degraded video after the provider recovers.
+    """
+    metadata = result.get("metadata") or {}
+    return metadata.get("render_mode") == "speaker_dialogue" and not metadata.get("fallback_used")
+
+
+def asset_content_sha256(asset: Asset) -> str:
+    metadata = dict(asset.metadata_json or {})
+    digest = metadata.get("sha256")
+    if digest and metadata.get("sha256_size_bytes") == asset.size_bytes:
+        return str(digest)
+    digest = content_sha256(asset.storage_key)
+    metadata.update({"sha256": digest, "sha256_size_bytes": asset.size_bytes})
+    asset.metadata_json = metadata
+    return digest
+
+
+def find_cached_render_asset(db: Session, project_id: int, cache_key: str) -> Asset | None:
+    candidates = (
+        db.query(Asset)
+        .filter(Asset.project_id == project_id, Asset.kind == "render_output")
+        .order_by(Asset.created_at.desc())
+        .all()
+    )
+    for asset in candidates:
+        if (asset.metadata_json or {}).get("render_cache_key") != cache_key:
+            continue
+        if Path(asset.storage_key).exists():
+            return asset
+    return None
+
+
+def lookup_render_cache(cache_key: str) -> dict[str, Any] | None:
+    video_path = render_cache_dir() / f"{cache_key}.mp4"
+    index_path = render_cache_dir() / f"{cache_key}.json"
+    if not video_path.exists() or not index_path.exists():
+        return None
+    try:
+        entry = json.loads(index_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        logger.warning("Discarding unreadable render cache entry %s", cache_key)
+        video_path.unlink(missing_ok=True)
+        index_path.unlink(missing_ok=True)
+        return None
+    os.utime(video_path)
+    return {**entry, "output_path": str(video_path)}
+
+
+def store_render_cache_entry(
+    cache_key: str,
+    source_path: Path,
+    *,
+    duration_seconds: float | None,
+    metadata: dict[str, Any] | None = None,
+    sha256: str | None = None,
+) -> None:
+    """Links `source_path` into the cache; pass its `sha256` when it is a blob-store file so eviction can account for the blob."""
+    video_path = render_cache_dir() / f"{cache_key}.mp4"
+    if not video_path.exists():
+        temp_path = video_path.with_suffix(".mp4.tmp")
+        temp_path.unlink(missing_ok=True)
+        try:
+            os.link(source_path, temp_path)
+        except OSError:
+            shutil.copy2(source_path, temp_path)
+        os.replace(temp_path, video_path)
+    index_path = render_cache_dir() / f"{cache_key}.json"
+    index_path.write_text(
+        json.dumps({"cache_key": cache_key, "duration_seconds": duration_seconds, "metadata": metadata or {}, "sha256": sha256}, default=str),
+        encoding="utf-8",
+    )
+
+
+def _evictable_files(extra_dirs: list[Path]) -> list[Path]:
+    files = [path for path in render_cache_dir().glob("*.mp4") if path.is_file()]
+    for directory in [segment_cache_dir(), *extra_dirs]:
+        if directory.exists():
+            files.extend(path for path in directory.glob("*.mp4") if path.is_file())
+    # In-flight segment encodes are still being written by ffmpeg.
+    return [path for path in files if not path.name.endswith(".tmp.mp4")]
+
+
+def _reclaimable_bytes(path: Path, stat: os.stat_result) -> int:
+    """Bytes that deleting `path` gives back to the disk.
+
+    Cache entries are hardlinks of project outputs in the blob store, so one still linked from a project
+    frees nothing. An entry whose only other link is its blob frees the blob too, once blob GC sees it
+    unreferenced.
+    """
+    if stat.st_nlink == 1:
+        return stat.st_size
+    if stat.st_nlink == 2 and path.parent == render_cache_dir():
+        try:
+            digest = json.loads(path.with_suffix(".json").read_text(encoding="utf-8")).get("sha256")
+        except (OSError, json.JSONDecodeError):
+            return 0
+        blob = blob_path(digest, path.suffix) if digest else None
+        if blob is not None and blob.exists() and os.path.samefile(blob, path):
+            return stat.st_size
+    return 0
+
+
+def evict_render_cache(*, max_bytes: int | None = None, extra_dirs: list[Path] | None = None, min_age_seconds: int | None = None) -> list[str]:
+    """Drops least-recently-used render cache entries and stale renderer outputs over the byte budget.
+
+    Files referenced by project assets live in the project media dirs and are never removed here;
+    only cache copies and leftover renderer outputs in `extra_dirs` are eligible. Only bytes a deletion
+    would actually free count against the budget, and files used or written within `min_age_seconds`
+    are left to the job that may still be reading or writing them.
+    """
+    budget = settings.RENDER_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    min_age = settings.CACHE_EVICTION_MIN_AGE_SECONDS if min_age_seconds is None else min_age_seconds
+    cutoff = time.time() - min_age
+    stats = {}
+    for path in _evictable_files(list(extra_dirs or [])):
+        try:
+            stats[path] = path.stat()
+        except FileNotFoundError:
+            continue
+    sizes = {path: _reclaimable_bytes(path, stat) for path, stat in stats.items()}
+    total = sum(sizes.values())
+    evicted: list[str] = []
+    for path in sorted(stats, key=lambda item: stats[item].st_mtime):
+        if total <= budget:
+            break
+        if not sizes[path] or stats[path].st_mtime >= cutoff:
+            continue
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
+        total -= sizes[path]
+        evicted.append(path.name)
+    if evicted:
+        logger.info("Evicted %s render cache files; %s reclaimable bytes remain", len(evicted), total)
+    return evicted
@@ -7,18 +7,52 @@ import shutil
 import tempfile
 import textwrap
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, replace
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from types import SimpleNamespace
 
 from PIL import Image, ImageDraw, ImageFont
 
 from app.core.config import settings
+from app.services.background_cache import ensure_background_derivative
 from app.services.character_presets import resolve_character_portrait_path, resolve_character_preset_for_speaker
+from app.services.filtergraph import (
+    RENDER_ENGINE_FILTERGRAPH,
+    RENDER_ENGINE_MOVIEPY,
+    RENDER_ENGINE_SEGMENTED,
+    RENDER_ENGINES,
+    FiltergraphRenderer,
+    probe_media_duration,
+    probe_video_fps,
+    x264_gop_args,
+)
+from app.services.raster_cache import cached_raster, font_identity, load_font, resize_to_height
+from app.services.render_cache import render_cache_key, segment_cache_dir
+from app.services.storage import content_sha256, sha256_file
+from app.services.timelines import link_timeline
 from app.services.tts import LocalSpeechService, SpeechSegment
 from app.services.vid_gen import VideoGenerationService
 
 logger = logging.getLogger(__name__)
 
+# Draft trades resolution, frame rate and compression for encode speed; the timeline (and therefore
+# review comment timestamps) is the same for every profile because it only depends on speech audio.
+RENDER_PROFILES: dict[str, dict] = {
+    "draft": {"scale": 0.5, "fps_min": 15, "fps_max": 15, "preset": "ultrafast", "crf": 30, "gop_seconds": 1, "keep_timeline": True},
+    "preview": {"scale": 1.0, "fps_min": 24, "fps_max": 24, "preset": "veryfast", "crf": 24, "gop_seconds": None, "keep_timeline": False},
+    "final": {"scale": 1.0, "fps_min": 24, "fps_max": 30, "preset": "faster", "crf": 22, "gop_seconds": None, "keep_timeline": False},
+}
+
+
+SEGMENT_RENDER_WORKERS = 4
+
+
+def render_profile(output_kind: str) -> dict:
+    return RENDER_PROFILES.get(output_kind, RENDER_PROFILES["final"])
+
 
 class ProjectRenderService:
     CANVAS_WIDTH = 1080
@@ -27,6 +61,8 @@ class ProjectRenderService:
     ACTIVE_POSITIONS = ((4, 930), (472, 930))
     BASE_HEIGHT = 620
     ACTIVE_HEIGHT = 780
+    CARD_SIZE = (900, 380)
+    CARD_POSITION = (90, 1320)
 
     def __init__(self, *, db=None, project_id: int | None = None) -> None:
         self.db = db
@@ -37,6 +73,24 @@ class ProjectRenderService:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.audio_export_fps = settings.TTS_AUDIO_EXPORT_FPS
         self.audio_export_bitrate = settings.TTS_AUDIO_EXPORT_BITRATE
+        self._media_probes: dict[str, dict] = {}
+
+    def use_background_probe(self, background_video_path: str, probe: dict | None) -> None:
+        """Lets render planning read fps and duration from the asset's upload-time probe."""
+        if probe:
+            self._media_probes[self.video_service._clean_file_path(background_video_path)] = probe
+
+    def _source_fps(self, background_path: str, binary: str | None = None) -> float:
+        probe = self._media_probes.get(background_path)
+        if probe and probe.get("fps"):
+            return float(probe["fps"])
+        return probe_video_fps(background_path, binary) or 24
+
+    def _source_duration(self, background_path: str, binary: str | None = None) -> float | None:
+        probe = self._media_probes.get(background_path)
+        if probe and probe.get("duration_seconds"):
+            return float(probe["duration_seconds"])
+        return probe_media_duration(background_path, binary)
 
     def render_preview(
         self,
@@ -46,6 +100,7 @@ class ProjectRenderService:
         style_preset: str,
         output_kind: str = "preview",
         progress_callback=None,
+        render_engine: str = RENDER_ENGINE_MOVIEPY,
     ) -> dict:
         try:
             return self._render_speaker_video(
@@ -55,6 +110,7 @@ class ProjectRenderService:
                 style_preset=style_preset,
                 output_kind=output_kind,
                 progress_callback=progress_callback,
+                render_engine=render_engine,
             )
         except RuntimeError as exc:
             logger.warning("Falling back to overlay-only render for project %s: %s", project_id, exc)
@@ -67,6 +123,32 @@ class ProjectRenderService:
                 output_kind=output_kind,
             )
 
+    def render_timeline(
+        self,
+        project_id: int,
+        background_video_path: str,
+        timeline: dict,
+        style_preset: str,
+        output_kind: str = "final",
+        progress_callback=None,
+        render_engine: str = RENDER_ENGINE_MOVIEPY,
+    ) -> dict:
+        """Re-encodes a stored timeline (e.g. a reviewed draft) under another profile without running TTS."""
+        segments = [SpeechSegment(**entry) for entry in timeline["segments"]]
+        missing = [segment.audio_path for segment in segments if not Path(segment.audio_path).exists()]
+        if missing:
+            raise RuntimeError(f"Stored timeline audio is missing: {missing[0]}")
+        return self._render_speaker_video(
+            project_id=project_id,
+            background_video_path=background_video_path,
+            parsed_lines=[{"speaker": segment.speaker, "text": segment.text} for segment in segments],
+            style_preset=style_preset,
+            output_kind=output_kind,
+            progress_callback=progress_callback,
+            render_engine=render_engine,
+            speech_segments=segments,
+        )
+
     def _render_speaker_video(
         self,
         *,
@@ -76,132 +158,63 @@ class ProjectRenderService:
         style_preset: str,
         output_kind: str,
         progress_callback,
+        render_engine: str = RENDER_ENGINE_MOVIEPY,
+        speech_segments: list[SpeechSegment] | None = None,
     ) -> dict:
-        from moviepy import (
-            CompositeVideoClip,
-            ImageClip,
-            VideoFileClip,
-            concatenate_audioclips,
-        )
-
+        if render_engine not in RENDER_ENGINES:
+            raise RuntimeError(f"Unknown render engine: {render_engine}")
         clean_video_path = self.video_service._clean_file_path(background_video_path)
         if not Path(clean_video_path).exists():
             raise RuntimeError(f"Background video not found: {clean_video_path}")
 
         work_dir = Path(tempfile.mkdtemp(prefix=f"render_{project_id}_", dir=self.output_dir))
-        clips_to_close: list = []
-        audio_clips: list = []
         try:
-            segments = self.speech_service.synthesize_dialogue(parsed_lines, work_dir / "speech")
-            self._emit_progress(progress_callback, "tts_ready", 46)
-
-            background_clip = VideoFileClip(clean_video_path).without_audio()
-            background_clip = self.video_service._apply_background_style(background_clip, style_preset)
-            background_clip = self._fit_to_canvas(background_clip)
-            self._emit_progress(progress_callback, "background_ready", 58)
-
-            timed_segments = self._build_timed_segments(segments)
-            audio_clips.extend(item["audio_clip"] for item in timed_segments)
-
-            total_duration = sum(item["duration_seconds"] for item in timed_segments)
-            if total_duration <= 0:
-                raise RuntimeError("Generated speech audio has no duration.")
-
-            background_clip = self._extend_background(background_clip, total_duration)
-            clips_to_close.append(background_clip)
-
-            cast = self._primary_cast(segments)
-            timeline_layers = [background_clip]
-
-            for cast_member in cast:
-                portrait_path = self._resolve_character_portrait(cast_member.speaker, cast_member.slot_index, work_dir)
-                base_clip = (
-                    ImageClip(str(portrait_path))
-                    .resized(height=self.BASE_HEIGHT)
-                    .with_opacity(0.26)
-                    .with_position(self.BASE_POSITIONS[min(cast_member.slot_index, 1)])
-                    .with_duration(total_duration)
-                )
-                timeline_layers.append(base_clip)
-                clips_to_close.append(base_clip)
-
-            cursor = 0.0
-            for item in timed_segments:
-                segment = item["segment"]
-                portrait_path = self._resolve_character_portrait(segment.speaker, segment.slot_index, work_dir)
-                speaker_slot = min(segment.slot_index, 1)
-                active_clip = (
-                    ImageClip(str(portrait_path))
-                    .resized(height=self.ACTIVE_HEIGHT)
-                    .with_position(self.ACTIVE_POSITIONS[speaker_slot])
-                    .with_start(cursor)
-                    .with_duration(item["duration_seconds"])
-                )
-                caption_path = self._build_dialogue_card(segment, work_dir)
-                caption_clip = (
-                    ImageClip(str(caption_path))
-                    .with_position((90, 1320))
-                    .with_start(cursor)
-                    .with_duration(item["duration_seconds"])
-                )
-                timeline_layers.extend([active_clip, caption_clip])
-                clips_to_close.extend([active_clip, caption_clip])
-                cursor += item["duration_seconds"]
-
-            self._emit_progress(progress_callback, "timeline_ready", 68)
-
-            composite_audio = concatenate_audioclips(audio_clips)
-            composite = (
-                CompositeVideoClip(
-                    timeline_layers,
-                    size=(self.CANVAS_WIDTH, self.CANVAS_HEIGHT),
-                )
-                .with_audio(composite_audio)
-                .with_duration(total_duration)
+            profile = render_profile(output_kind)
+            prepare_background = {
+                RENDER_ENGINE_FILTERGRAPH: self._prepare_filtergraph_background,
+                RENDER_ENGINE_SEGMENTED: self._prepare_segmented_background,
+            }.get(render_engine, self._prepare_moviepy_background)
+            timed_segments, background, visuals = self._run_render_pipeline(
+                parsed_lines=parsed_lines,
+                background_path=clean_video_path,
+                style_preset=style_preset,
+                canvas=self._canvas_size(output_kind),
+                scale=profile["scale"],
+                work_dir=work_dir,
+                prepare_background=partial(prepare_background, output_kind=output_kind),
+                measure_segment=self._measure_segment,
+                progress_callback=progress_callback,
+                speech_segments=speech_segments,
             )
-            clips_to_close.append(composite)
-            clips_to_close.append(composite_audio)
+            segments = [item["segment"] for item in timed_segments]
 
-            render_config = self._render_config(background_clip, output_kind)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_filename = f"{project_id}_{output_kind}_{timestamp}.mp4"
             output_path = self.output_dir / output_filename
-            logger.info(
-                "Writing composite video project=%s output=%s audio_fps=%s audio_bitrate=%s render_fps=%s preset=%s crf=%s segment_count=%s duration=%.2fs",
-                project_id,
-                output_path,
-                self.audio_export_fps,
-                self.audio_export_bitrate,
-                render_config["fps"],
-                render_config["preset"],
-                render_config["crf"],
-                len(segments),
-                total_duration,
-            )
-            self._emit_progress(progress_callback, "encoding", 80)
-            composite.write_videofile(
-                str(output_path),
-                fps=render_config["fps"],
-                codec="libx264",
-                audio_codec="aac",
-                audio_fps=self.audio_export_fps,
-                audio_bitrate=self.audio_export_bitrate,
-                temp_audiofile=str(work_dir / "temp_audio.m4a"),
-                remove_temp=True,
-                preset=render_config["preset"],
-                ffmpeg_params=[
-                    "-crf",
-                    str(render_config["crf"]),
-                    "-movflags",
-                    "+faststart",
-                    "-pix_fmt",
-                    "yuv420p",
-                ],
-                threads=render_config["threads"],
-                logger=None,
+            compose = {
+                RENDER_ENGINE_FILTERGRAPH: self._compose_with_filtergraph,
+                RENDER_ENGINE_SEGMENTED: self._compose_segmented,
+            }.get(render_engine, self._compose_with_moviepy)
+            render_config, total_duration = compose(
+                project_id=project_id,
+                background_path=clean_video_path,
+                background=background,
+                timed_segments=timed_segments,
+                visuals=visuals,
+                style_preset=style_preset,
+                output_kind=output_kind,
+                output_path=output_path,
+                work_dir=work_dir,
+                progress_callback=progress_callback,
             )
             self._emit_progress(progress_callback, "encoded", 88)
 
+            metadata_extra = {}
+            if "segment_cache" in render_config:
+                metadata_extra["segment_cache"] = render_config["segment_cache"]
+            if profile["keep_timeline"]:
+                metadata_extra["timeline"] = self._persist_timeline(project_id, output_path.stem, timed_segments)
+
             return {
                 "output_path": f"file://{output_path.absolute()}",
                 "filename": output_filename,
@@ -212,6 +225,8 @@ class ProjectRenderService:
                 "processing_time_seconds": None,
                 "metadata": {
                     "render_mode": "speaker_dialogue",
+                    "render_engine": render_engine,
+                    "fallback_used": any(segment.fallback_used for segment in segments),
                     "voices": {
                         segment.speaker: {
                             "voice": segment.voice,
@@ -232,10 +247,196 @@ class ProjectRenderService:
                         for item in timed_segments
                     ],
                     "render_fps": render_config["fps"],
+                    "render_size": [render_config["width"], render_config["height"]],
                     "encode_preset": render_config["preset"],
                     "portrait_resolution": "backend/storage/characters/<speaker>.png or speaker_<slot>.png",
+                    **metadata_extra,
                 },
             }
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _run_render_pipeline(
+        self,
+        *,
+        parsed_lines: list[dict],
+        background_path: str,
+        style_preset: str,
+        work_dir: Path,
+        prepare_background,
+        measure_segment,
+        progress_callback,
+        canvas: tuple[int, int] | None = None,
+        scale: float = 1.0,
+        speech_segments: list[SpeechSegment] | None = None,
+    ) -> tuple[list[dict], object, dict]:
+        """Overlaps speech synthesis with the stages that only need the script, not the audio.
+
+        Background preparation and portrait/card rasterisation run on helper threads while the
+        calling thread consumes speech segments in script order and measures each one as soon as
+        it is ready, so the wall-clock cost approaches the slower of TTS and visual prep.
+        Passing `speech_segments` replays an already synthesised timeline instead of running TTS.
+        """
+        canvas = canvas or (self.CANVAS_WIDTH, self.CANVAS_HEIGHT)
+        planned_lines = self._plan_lines(parsed_lines)
+        # Portrait lookups hit the database session, so they stay on the calling thread.
+        found_portraits = self._find_portraits(planned_lines)
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="render-prep")
+        background_future = executor.submit(prepare_background, background_path, style_preset, canvas)
+        visuals_future = executor.submit(self._prepare_visuals, planned_lines, found_portraits, scale)
+        completed = False
+        try:
+            speech = speech_segments if speech_segments is not None else self.speech_service.iter_dialogue(parsed_lines, work_dir / "speech")
+            timed_segments = [measure_segment(segment) for segment in speech]
+            self._emit_progress(progress_callback, "tts_ready", 46)
+            background = background_future.result()
+            self._emit_progress(progress_callback, "background_ready", 58)
+            visuals = visuals_future.result()
+            completed = True
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if not completed:
+                self._close_prepared(background_future)
+        return timed_segments, background, visuals
+
+    def _close_prepared(self, future) -> None:
+        if not future.done() or future.cancelled() or future.exception() is not None:
+            return
+        close = getattr(future.result(), "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                logger.debug("Failed to close prepared background cleanly", exc_info=True)
+
+    def _background_derivative(
+        self, background_path: str, style_preset: str, canvas: tuple[int, int], fps: int, binary: str | None = None
+    ) -> Path | None:
+        if not settings.BACKGROUND_CACHE_ENABLED:
+            return None
+        return ensure_background_derivative(background_path, style_preset=style_preset, fps=fps, canvas=canvas, binary=binary)
+
+    def prepare_background_derivatives(self, background_path: str, style_preset: str, output_kinds: tuple[str, ...] = ("preview", "final")) -> list[Path]:
+        """Builds the derivatives these output kinds will render from, ahead of the first render."""
+        source_fps = self._source_fps(background_path)
+        return [
+            self._background_derivative(background_path, style_preset, self._canvas_size(kind), self._target_fps(source_fps, kind))
+            for kind in output_kinds
+        ]
+
+    def _prepare_moviepy_background(self, background_path: str, style_preset: str, canvas: tuple[int, int], output_kind: str = "final"):
+        from moviepy import VideoFileClip
+
+        if settings.BACKGROUND_CACHE_ENABLED:
+            fps = self._target_fps(self._source_fps(background_path), output_kind)
+            return VideoFileClip(str(self._background_derivative(background_path, style_preset, canvas, fps)), audio=False)
+
+        background_clip = VideoFileClip(background_path).without_audio()
+        background_clip = self.video_service._apply_background_style(background_clip, style_preset)
+        return self._fit_to_canvas(background_clip, canvas)
+
+    def _prepare_filtergraph_background(
+        self, background_path: str, style_preset: str, canvas: tuple[int, int], output_kind: str = "final"
+    ) -> SimpleNamespace:
+        renderer = FiltergraphRenderer(canvas_width=canvas[0], canvas_height=canvas[1])
+        fps = self._source_fps(background_path, renderer.binary)
+        derivative = self._background_derivative(background_path, style_preset, canvas, self._target_fps(fps, output_kind), renderer.binary)
+        return SimpleNamespace(renderer=renderer, fps=fps, path=str(derivative or background_path), prepared=derivative is not None)
+
+    def _prepare_segmented_background(
+        self, background_path: str, style_preset: str, canvas: tuple[int, int], output_kind: str = "final"
+    ) -> SimpleNamespace:
+        background = self._prepare_filtergraph_background(background_path, style_preset, canvas, output_kind)
+        background.duration = self._source_duration(background_path, background.renderer.binary)
+        background.sha256 = content_sha256(background_path)
+        return background
+
+    def _compose_with_moviepy(
+        self,
+        *,
+        project_id: int,
+        background_path: str,
+        background,
+        timed_segments: list[dict],
+        visuals: dict,
+        style_preset: str,
+        output_kind: str,
+        output_path: Path,
+        work_dir: Path,
+        progress_callback,
+    ) -> tuple[dict[str, int | str], float]:
+        from moviepy import CompositeVideoClip, ImageClip
+
+        clips_to_close: list = [background]
+        try:
+            total_duration = sum(item["duration_seconds"] for item in timed_segments)
+            if total_duration <= 0:
+                raise RuntimeError("Generated speech audio has no duration.")
+
+            background_clip = self._extend_background(background, total_duration)
+            clips_to_close.append(background_clip)
+
+            timeline_layers = [background_clip]
+            for layer in self._timeline_image_layers(timed_segments, total_duration, visuals):
+                clip = ImageClip(layer["image_path"])
+                if layer["height"]:
+                    clip = clip.resized(height=layer["height"])
+                if layer["opacity"] is not None:
+                    clip = clip.with_opacity(layer["opacity"])
+                clip = clip.with_position(layer["position"]).with_start(layer["start"]).with_duration(
+                    (layer["end"] if layer["end"] is not None else total_duration) - layer["start"]
+                )
+                timeline_layers.append(clip)
+                clips_to_close.append(clip)
+
+            self._emit_progress(progress_callback, "timeline_ready", 68)
+
+            dialogue_track = self.speech_service.write_dialogue_track(
+                [
+                    {
+                        "audio_path": item["segment"].audio_path,
+                        "pcm": item["segment"].pcm,
+                        "gain": item["gain"],
+                        "duration_seconds": item["duration_seconds"],
+                    }
+                    for item in timed_segments
+                ],
+                work_dir / "dialogue.wav",
+                self.audio_export_fps,
+            )
+            composite = CompositeVideoClip(
+                timeline_layers,
+                size=(background.w, background.h),
+            ).with_duration(total_duration)
+            clips_to_close.append(composite)
+
+            render_config = self._render_config(background_clip, output_kind)
+            self._log_encode(project_id, output_path, render_config, len(timed_segments), total_duration, RENDER_ENGINE_MOVIEPY)
+            self._emit_progress(progress_callback, "encoding", 80)
+            composite.write_videofile(
+                str(output_path),
+                fps=render_config["fps"],
+                codec="libx264",
+                # A file path makes MoviePy hand the track to the video encoder as a second input,
+                # so no audio is generated through Python while frames are written.
+                audio=str(dialogue_track),
+                audio_codec="aac",
+                preset=render_config["preset"],
+                ffmpeg_params=[
+                    "-b:a",
+                    self.audio_export_bitrate,
+                    "-crf",
+                    str(render_config["crf"]),
+                    "-movflags",
+                    "+faststart",
+                    "-pix_fmt",
+                    "yuv420p",
+                    *x264_gop_args(render_config.get("gop")),
+                ],
+                threads=render_config["threads"],
+                logger=None,
+            )
+            return render_config, total_duration
         finally:
             for clip in reversed(clips_to_close):
                 close = getattr(clip, "close", None)
@@ -244,18 +445,364 @@ class ProjectRenderService:
                         close()
                     except Exception:
                         logger.debug("Failed to close clip cleanly", exc_info=True)
-            shutil.rmtree(work_dir, ignore_errors=True)
 
-    def _fit_to_canvas(self, clip):
-        scale = max(self.CANVAS_WIDTH / clip.w, self.CANVAS_HEIGHT / clip.h)
+    def _compose_with_filtergraph(
+        self,
+        *,
+        project_id: int,
+        background_path: str,
+        background: SimpleNamespace,
+        timed_segments: list[dict],
+        visuals: dict,
+        style_preset: str,
+        output_kind: str,
+        output_path: Path,
+        work_dir: Path,
+        progress_callback,
+    ) -> tuple[dict[str, int | str], float]:
+        renderer = background.renderer
+        total_duration = sum(item["duration_seconds"] for item in timed_segments)
+        if total_duration <= 0:
+            raise RuntimeError("Generated speech audio has no duration.")
+        image_layers = self._timeline_image_layers(timed_segments, total_duration, visuals)
+        self._emit_progress(progress_callback, "timeline_ready", 68)
+
+        render_config = self._render_config(background, output_kind)
+        self._log_encode(project_id, output_path, render_config, len(timed_segments), total_duration, RENDER_ENGINE_FILTERGRAPH)
+        self._emit_progress(progress_callback, "encoding", 80)
+        renderer.render(
+            background_path=background.path,
+            style_preset=style_preset,
+            prepared_background=background.prepared,
+            image_layers=image_layers,
+            audio_segments=[
+                {
+                    "audio_path": item["segment"].audio_path,
+                    "gain": item["gain"],
+                    "duration_seconds": item["duration_seconds"],
+                }
+                for item in timed_segments
+            ],
+            total_duration=total_duration,
+            render_config=render_config,
+            audio_fps=self.audio_export_fps,
+            audio_bitrate=self.audio_export_bitrate,
+            filtergraph_path=work_dir / "filtergraph.txt",
+            output_path=output_path,
+        )
+        return render_config, total_duration
+
+    def _compose_segmented(
+        self,
+        *,
+        project_id: int,
+        background_path: str,
+        background: SimpleNamespace,
+        timed_segments: list[dict],
+        visuals: dict,
+        style_preset: str,
+        output_kind: str,
+        output_path: Path,
+        work_dir: Path,
+        progress_callback,
+    ) -> tuple[dict, float]:
+        """Encodes each line as its own video-only segment and stream-copies them into the output.
+
+        Segments are content-addressed by their layers, background window and encode settings, so a
+        script revision only re-encodes lines whose card, speaker or timing changed. Line boundaries
+        are snapped to the frame grid from the running total, so segments butt together exactly while
+        every line starts within half a frame of where the other engines put it; the dialogue track is
+        encoded once over the unsnapped timeline so there is no per-segment AAC priming drift.
+        """
+        renderer = background.renderer
+        render_config = self._render_config(background, output_kind)
+        fps = int(render_config["fps"])
+        boundaries = [0]
+        elapsed = 0.0
+        for item in timed_segments:
+            elapsed += item["duration_seconds"]
+            boundaries.append(max(round(elapsed * fps), boundaries[-1] + 1))
+        total_duration = boundaries[-1] / fps
+        if elapsed <= 0:
+            raise RuntimeError("Generated speech audio has no duration.")
+        # Cards switch on the snapped boundaries so each segment holds exactly its own line's layers.
+        frame_segments = [
+            {**item, "duration_seconds": (end - start) / fps} for item, start, end in zip(timed_segments, boundaries, boundaries[1:])
+        ]
+        image_layers = self._timeline_image_layers(frame_segments, total_duration, visuals)
+        self._emit_progress(progress_callback, "timeline_ready", 68)
+
+        encode_identity = {key: value for key, value in render_config.items() if key != "threads"}
+        jobs = []
+        for first_frame, end_frame in zip(boundaries, boundaries[1:]):
+            start, duration = first_frame / fps, (end_frame - first_frame) / fps
+            layers = self._segment_image_layers(image_layers, start, start + duration)
+            seek = start
+            if background.duration and start >= background.duration - 1 / fps:
+                seek = -0.1
+            key = render_cache_key(
+                {
+                    "kind": "segment",
+                    "background_sha256": background.sha256,
+                    "background_seek": round(seek, 4),
+                    "style_preset": style_preset,
+                    "render_config": encode_identity,
+                    "frames": end_frame - first_frame,
+                    "layers": [{**layer, "image_path": Path(layer["image_path"]).name} for layer in layers],
+                }
+            )
+            jobs.append({"path": segment_cache_dir() / f"{key}.mp4", "layers": layers, "seek": seek, "duration": duration})
+
+        missing = [job for job in jobs if not job["path"].exists()]
+        for job in jobs:
+            if job not in missing:
+                os.utime(job["path"])
+        self._log_encode(project_id, output_path, render_config, len(timed_segments), total_duration, RENDER_ENGINE_SEGMENTED)
+        logger.info("Segmented render project=%s reused=%s rendering=%s", project_id, len(jobs) - len(missing), len(missing))
+        self._emit_progress(progress_callback, "encoding", 80)
+        if missing:
+            workers = min(len(missing), SEGMENT_RENDER_WORKERS)
+            segment_config = {**render_config, "threads": max(1, int(render_config["threads"]) // workers)}
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render-segment") as executor:
+                list(
+                    executor.map(
+                        lambda job: self._render_segment(renderer, background, style_preset, segment_config, job, work_dir),
+                        missing,
+                    )
+                )
+
+        segment_list_path = work_dir / "segments.txt"
+        segment_list_path.write_text(
+            "".join("file '{}'\n".format(str(job["path"].absolute()).replace("'", "'\\''")) for job in jobs),
+            encoding="utf-8",
+        )
+        command = renderer.build_concat_command(
+            segment_list_path=segment_list_path,
+            audio_segments=[
+                {
+                    "audio_path": item["segment"].audio_path,
+                    "gain": item["gain"],
+                    "duration_seconds": item["duration_seconds"],
+                }
+                for item in timed_segments
+            ],
+            audio_fps=self.audio_export_fps,
+            audio_bitrate=self.audio_export_bitrate,
+            filtergraph_path=work_dir / "audio_filtergraph.txt",
+            output_path=output_path,
+        )
+        renderer.run(command, output_path)
+        render_config["segment_cache"] = {"reused": len(jobs) - len(missing), "rendered": len(missing)}
+        return render_config, total_duration
+
+    def _segment_image_layers(self, image_layers: list[dict], start: float, end: float) -> list[dict]:
+        """Clips timeline layers to one segment window, re-based to the segment's own clock."""
+        layers = []
+        for layer in image_layers:
+            if layer["end"] is not None and (layer["end"] <= start + 1e-6 or layer["start"] >= end - 1e-6):
+                continue
+            if layer["end"] is None or (layer["start"] <= start + 1e-6 and layer["end"] >= end - 1e-6):
+                layers.append({**layer, "position": list(layer["position"]), "start": 0.0, "end": None})
+                continue
+            layers.append(
+                {
+                    **layer,
+                    "position": list(layer["position"]),
+                    "start": round(max(layer["start"] - start, 0.0), 4),
+                    "end": None if layer["end"] is None else round(min(layer["end"], end) - start, 4),
+                }
+            )
+        return layers
+
+    def _render_segment(self, renderer, background: SimpleNamespace, style_preset: str, render_config: dict, job: dict, work_dir: Path) -> Path:
+        path = job["path"]
+        temp_path = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.tmp.mp4")
+        command = renderer.build_command(
+            background_path=background.path,
+            prepared_background=background.prepared,
+            style_preset=style_preset,
+            image_layers=job["layers"],
+            audio_segments=[],
+            total_duration=job["duration"],
+            render_config=render_config,
+            audio_fps=self.audio_export_fps,
+            audio_bitrate=self.audio_export_bitrate,
+            filtergraph_path=work_dir / f"{path.stem}.filtergraph.txt",
+            output_path=temp_path,
+            background_seek=job["seek"],
+            include_audio=False,
+        )
+        renderer.run(command, temp_path)
+        os.replace(temp_path, path)
+        return path
+
+    def _plan_lines(self, parsed_lines: list[dict]) -> list[dict]:
+        planned: list[dict] = []
+        slot_map: dict[str, int] = {}
+        for index, line in enumerate(parsed_lines):
+            speaker = str(line.get("speaker") or f"Speaker {index + 1}").strip()
+            text = str(line.get("text") or "").strip()
+            if not text:
+                continue
+            planned.append({"speaker": speaker, "text": text, "slot_index": slot_map.setdefault(speaker, len(slot_map))})
+        return planned
+
+    def _find_portraits(self, planned_lines: list[dict]) -> dict[tuple[str, int], Path | None]:
+        found: dict[tuple[str, int], Path | None] = {}
+        for line in planned_lines:
+            key = (line["speaker"], line["slot_index"])
+            if key not in found:
+                found[key] = self._find_character_portrait(line["speaker"], line["slot_index"])
+        return found
+
+    def _prepare_visuals(self, planned_lines: list[dict], found_portraits: dict | None = None, scale: float = 1.0) -> dict:
+        """Resolves every raster the timeline needs, pre-sized so neither engine resamples per render."""
+        found_portraits = self._find_portraits(planned_lines) if found_portraits is None else found_portraits
+        portraits: dict[tuple[str, int], dict[str, str]] = {}
+        for (speaker, slot_index), portrait_path in found_portraits.items():
+            source_path = portrait_path or self._build_generated_portrait(speaker, slot_index)
+            portraits[(speaker, slot_index)] = {
+                "base": str(self._sized_raster(source_path, round(self.BASE_HEIGHT * scale))),
+                "active": str(self._sized_raster(source_path, round(self.ACTIVE_HEIGHT * scale))),
+            }
+        cards = [self._build_dialogue_card(line["speaker"], line["text"], line["slot_index"]) for line in planned_lines]
+        if scale != 1.0:
+            cards = [self._sized_raster(card, round(self.CARD_SIZE[1] * scale)) for card in cards]
+        return {
+            "lines": [(line["speaker"], line["text"], line["slot_index"]) for line in planned_lines],
+            "portraits": portraits,
+            "cards": [str(card) for card in cards],
+            "scale": scale,
+        }
+
+    def _timeline_image_layers(self, timed_segments: list[dict], total_duration: float, visuals: dict | None = None) -> list[dict]:
+        segments = [item["segment"] for item in timed_segments]
+        lines = [(segment.speaker, segment.text, segment.slot_index) for segment in segments]
+        if visuals is None or visuals["lines"] != lines:
+            if visuals is not None:
+                logger.warning("Synthesised segments differ from the planned script; rebuilding portraits and cards")
+            visuals = self._prepare_visuals(
+                [{"speaker": speaker, "text": text, "slot_index": slot_index} for speaker, text, slot_index in lines],
+                scale=visuals["scale"] if visuals else 1.0,
+            )
+        portraits = visuals["portraits"]
+        scale = visuals["scale"]
+
+        def scaled(position: tuple[int, int]) -> tuple[int, int]:
+            return (round(position[0] * scale), round(position[1] * scale))
+
+        layers: list[dict] = []
+        for cast_member in self._primary_cast(segments):
+            layers.append(
+                {
+                    "image_path": portraits[(cast_member.speaker, cast_member.slot_index)]["base"],
+                    "height": None,
+                    "opacity": 0.26,
+                    "position": scaled(self.BASE_POSITIONS[min(cast_member.slot_index, 1)]),
+                    "start": 0.0,
+                    "end": None,
+                }
+            )
+
+        cursor = 0.0
+        for item, card_path in zip(timed_segments, visuals["cards"]):
+            segment = item["segment"]
+            end = cursor + item["duration_seconds"]
+            layers.append(
+                {
+                    "image_path": portraits[(segment.speaker, segment.slot_index)]["active"],
+                    "height": None,
+                    "opacity": None,
+                    "position": scaled(self.ACTIVE_POSITIONS[min(segment.slot_index, 1)]),
+                    "start": cursor,
+                    "end": end,
+                }
+            )
+            layers.append(
+                {
+                    "image_path": card_path,
+                    "height": None,
+                    "opacity": None,
+                    "position": scaled(self.CARD_POSITION),
+                    "start": cursor,
+                    "end": end,
+                }
+            )
+            cursor = end
+        return layers
+
+    def _log_encode(
+        self,
+        project_id: int,
+        output_path: Path,
+        render_config: dict[str, int | str],
+        segment_count: int,
+        total_duration: float,
+        render_engine: str,
+    ) -> None:
+        logger.info(
+            "Writing composite video project=%s output=%s engine=%s audio_fps=%s audio_bitrate=%s render_fps=%s preset=%s crf=%s segment_count=%s duration=%.2fs",
+            project_id,
+            output_path,
+            render_engine,
+            self.audio_export_fps,
+            self.audio_export_bitrate,
+            render_config["fps"],
+            render_config["preset"],
+            render_config["crf"],
+            segment_count,
+            total_duration,
+        )
+
+    def render_cache_inputs(
+        self,
+        *,
+        background_sha256: str,
+        background_video_path: str,
+        parsed_lines: list[dict],
+        style_preset: str,
+        output_kind: str,
+        render_engine: str = RENDER_ENGINE_MOVIEPY,
+    ) -> dict:
+        lines = self._plan_lines(parsed_lines)
+        slot_map = {line["speaker"]: line["slot_index"] for line in lines}
+
+        portraits: dict[str, str] = {}
+        for speaker, slot_index in slot_map.items():
+            portrait_path = self._find_character_portrait(speaker, slot_index)
+            portraits[speaker] = sha256_file(portrait_path) if portrait_path else f"generated:{self._slugify(speaker)}:{slot_index}"
+
+        background_fps = self._source_fps(self.video_service._clean_file_path(background_video_path))
+        render_config = self._render_config(SimpleNamespace(fps=background_fps), output_kind)
+        return {
+            "lines": lines,
+            "background_sha256": background_sha256,
+            "style_preset": style_preset,
+            "output_kind": output_kind,
+            "render_engine": render_engine,
+            "voice_cache_keys": self.speech_service.voice_cache_keys(parsed_lines),
+            "portraits": portraits,
+            "render_config": {key: value for key, value in render_config.items() if key != "threads"},
+            "canvas": list(self._canvas_size(output_kind)),
+            "audio": [self.audio_export_fps, self.audio_export_bitrate],
+        }
+
+    def _fit_to_canvas(self, clip, canvas: tuple[int, int] | None = None):
+        width, height = canvas or (self.CANVAS_WIDTH, self.CANVAS_HEIGHT)
+        scale = max(width / clip.w, height / clip.h)
         resized = clip.resized(new_size=(math.ceil(clip.w * scale), math.ceil(clip.h * scale)))
         return resized.cropped(
             x_center=int(resized.w / 2),
             y_center=int(resized.h / 2),
-            width=self.CANVAS_WIDTH,
-            height=self.CANVAS_HEIGHT,
+            width=width,
+            height=height,
         )
 
+    def _canvas_size(self, output_kind: str) -> tuple[int, int]:
+        scale = render_profile(output_kind)["scale"]
+        # libx264 with yuv420p needs even dimensions.
+        return (round(self.CANVAS_WIDTH * scale / 2) * 2, round(self.CANVAS_HEIGHT * scale / 2) * 2)
+
     def _extend_background(self, clip, duration_seconds: float):
         from moviepy import ImageClip, concatenate_videoclips
 
@@ -267,30 +814,42 @@ class ProjectRenderService:
         still = ImageClip(frozen_frame).with_duration(remaining)
         return concatenate_videoclips([clip, still])
 
-    def _build_timed_segments(self, segments: list[SpeechSegment]) -> list[dict]:
-        timed_segments: list[dict] = []
-        for segment in segments:
-            audio_clip = self.speech_service.build_audio_clip(segment.audio_path)
-            timed_segments.append(
-                {
-                    "segment": segment,
-                    "audio_clip": audio_clip,
-                    "duration_seconds": max(float(getattr(audio_clip, "duration", 0) or 0), segment.duration_seconds, 0.6),
-                }
-            )
-        return timed_segments
+    def _measure_segment(self, segment: SpeechSegment) -> dict:
+        audio = self.speech_service.measure_audio(segment.audio_path, segment.pcm)
+        return {
+            "segment": segment,
+            "gain": audio["gain"],
+            "duration_seconds": max(audio["duration_seconds"], segment.duration_seconds, 0.6),
+        }
 
-    def _render_config(self, background_clip, output_kind: str) -> dict[str, int | str]:
-        source_fps = float(getattr(background_clip, "fps", 24) or 24)
-        fps_cap = 24 if output_kind == "preview" else 30
-        target_fps = max(24, min(int(round(source_fps)), fps_cap))
+    def _target_fps(self, source_fps: float, output_kind: str) -> int:
+        profile = render_profile(output_kind)
+        return max(profile["fps_min"], min(int(round(source_fps)), profile["fps_max"]))
+
+    def _render_config(self, background_clip, output_kind: str) -> dict[str, int | str | None]:
+        profile = render_profile(output_kind)
+        target_fps = self._target_fps(float(getattr(background_clip, "fps", 24) or 24), output_kind)
+        width, height = self._canvas_size(output_kind)
         return {
             "fps": target_fps,
-            "preset": "veryfast" if output_kind == "preview" else "faster",
-            "crf": 24 if output_kind == "preview" else 22,
+            "preset": profile["preset"],
+            "crf": profile["crf"],
+            "gop": target_fps * profile["gop_seconds"] if profile["gop_seconds"] else None,
+            "width": width,
+            "height": height,
             "threads": max(2, min(os.cpu_count() or 4, 8)),
         }
 
+    def _persist_timeline(self, project_id: int, name: str, timed_segments: list[dict]) -> dict:
+        """Links the speech audio out of the work dir so the exact timeline can be re-encoded later."""
+        entries = []
+        for item in timed_segments:
+            entry = asdict(replace(item["segment"], duration_seconds=item["duration_seconds"], pcm=None))
+            entry.pop("pcm")
+            entries.append(entry)
+        timeline = {"segments": entries, "total_duration_seconds": sum(item["duration_seconds"] for item in timed_segments)}
+        return link_timeline(project_id, name, timeline)
+
     def _emit_progress(self, progress_callback, stage: str, progress: int) -> None:
         if callable(progress_callback):
             progress_callback(stage, progress)
@@ -307,7 +866,7 @@ class ProjectRenderService:
                 break
         return cast
 
-    def _resolve_character_portrait(self, speaker: str, slot_index: int, work_dir: Path) -> Path:
+    def _find_character_portrait(self, speaker: str, slot_index: int) -> Path | None:
         slug = self._slugify(speaker)
         preset = resolve_character_preset_for_speaker(speaker, self.db) if self.db is not None else resolve_character_preset_for_speaker(speaker)
         preset_portrait = resolve_character_portrait_path(preset)
@@ -361,48 +920,62 @@ class ProjectRenderService:
             bundled_character_dir,
             runtime_character_dir,
         )
-        return self._build_generated_portrait(speaker, slot_index, work_dir)
+        return None
+
+    def _sized_raster(self, source_path: Path, height: int) -> Path:
+        def build() -> Image.Image:
+            with Image.open(source_path) as image:
+                image.load()
+                if image.mode not in {"RGB", "RGBA"}:
+                    image = image.convert("RGBA")
+                return resize_to_height(image, height)
 
-    def _build_generated_portrait(self, speaker: str, slot_index: int, work_dir: Path) -> Path:
+        return cached_raster("portrait", {"source_sha256": sha256_file(source_path), "height": height}, build)
+
+    def _build_generated_portrait(self, speaker: str, slot_index: int) -> Path:
         palette = self._speaker_palette(slot_index)
-        portrait_path = work_dir / f"portrait_{slot_index}_{self._slugify(speaker)}.png"
-        image = Image.new("RGBA", (760, 1100), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(image)
 
-        draw.ellipse((180, 60, 580, 460), fill=palette["accent"])
-        draw.rounded_rectangle((140, 420, 620, 1060), radius=180, fill=palette["body"])
-        draw.rounded_rectangle((120, 780, 640, 1060), radius=140, fill=palette["plate"])
+        def build() -> Image.Image:
+            image = Image.new("RGBA", (760, 1100), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(image)
 
-        initials = "".join(part[0] for part in speaker.split()[:2]).upper() or "S"
-        name_font = self._load_font(54)
-        initials_font = self._load_font(176)
-        draw.text((380, 250), initials, anchor="mm", fill=(255, 255, 255, 255), font=initials_font)
-        draw.rounded_rectangle((80, 880, 680, 1030), radius=50, fill=(10, 14, 20, 230))
-        draw.text((380, 956), speaker, anchor="mm", fill=(243, 248, 255, 255), font=name_font)
+            draw.ellipse((180, 60, 580, 460), fill=palette["accent"])
+            draw.rounded_rectangle((140, 420, 620, 1060), radius=180, fill=palette["body"])
+            draw.rounded_rectangle((120, 780, 640, 1060), radius=140, fill=palette["plate"])
 
-        image.save(portrait_path)
-        return portrait_path
+            initials = "".join(part[0] for part in speaker.split()[:2]).upper() or "S"
+            name_font = self._load_font(54)
+            initials_font = self._load_font(176)
+            draw.text((380, 250), initials, anchor="mm", fill=(255, 255, 255, 255), font=initials_font)
+            draw.rounded_rectangle((80, 880, 680, 1030), radius=50, fill=(10, 14, 20, 230))
+            draw.text((380, 956), speaker, anchor="mm", fill=(243, 248, 255, 255), font=name_font)
+            return image
 
-    def _build_dialogue_card(self, segment: SpeechSegment, work_dir: Path) -> Path:
-        palette = self._speaker_palette(segment.slot_index)
-        caption_path = work_dir / f"caption_{uuid.uuid4().hex}.png"
-        image = Image.new("RGBA", (900, 380), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(image)
-        draw.rounded_rectangle((0, 0, 900, 380), radius=48, fill=(6, 10, 18, 228))
-        draw.rounded_rectangle((0, 0, 900, 22), radius=22, fill=palette["accent"])
+        parts = {"speaker": speaker, "palette": palette, "fonts": [font_identity(54), font_identity(176)], "size": [760, 1100]}
+        return cached_raster("generated_portrait", parts, build)
 
-        label_font = self._load_font(40)
-        body_font = self._load_font(56)
-        draw.text((70, 74), segment.speaker.upper(), fill=palette["accent"], font=label_font)
+    def _build_dialogue_card(self, speaker: str, text: str, slot_index: int) -> Path:
+        palette = self._speaker_palette(slot_index)
 
-        wrapped_lines = textwrap.wrap(segment.text, width=24)[:4]
-        y = 138
-        for line in wrapped_lines:
-            draw.text((70, y), line, fill=(245, 248, 255, 255), font=body_font)
-            y += 64
+        def build() -> Image.Image:
+            image = Image.new("RGBA", (900, 380), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(image)
+            draw.rounded_rectangle((0, 0, 900, 380), radius=48, fill=(6, 10, 18, 228))
+            draw.rounded_rectangle((0, 0, 900, 22), radius=22, fill=palette["accent"])
 
-        image.save(caption_path)
-        return caption_path
+            label_font = self._load_font(40)
+            body_font = self._load_font(56)
+            draw.text((70, 74), speaker.upper(), fill=palette["accent"], font=label_font)
+
+            wrapped_lines = textwrap.wrap(text, width=24)[:4]
+            y = 138
+            for line in wrapped_lines:
+                draw.text((70, y), line, fill=(245, 248, 255, 255), font=body_font)
+                y += 64
+            return image
+
+        parts = {"speaker": speaker, "text": text, "palette": palette, "fonts": [font_identity(40), font_identity(56)], "size": [900, 380]}
+        return cached_raster("card", parts, build)
 
     def _speaker_palette(self, slot_index: int) -> dict[str, tuple[int, int, int, int]]:
         palettes = (
@@ -424,10 +997,7 @@ class ProjectRenderService:
         return slug or "speaker"
 
     def _load_font(self, size: int):
-        try:
-            return ImageFont.truetype("DejaVuSans-Bold.ttf", size)
-        except Exception:
-            return ImageFont.load_default()
+        return load_font(size)
 
     def _make_script_overlay(self, parsed_lines: list[dict], style_preset: str) -> str:
         overlay_dir = Path("./generated_videos") / "overlays"
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import hashlib
 import mimetypes
 import logging
+import os
 import shutil
+import threading
+import time
 import uuid
 from pathlib import Path
 
 from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 
 from app.core.config import settings
 
@@ -14,6 +19,12 @@ logger = logging.getLogger(__name__)
 
 ALLOWED_BACKGROUND_VIDEO_TYPES = {"video/mp4", "video/webm", "video/mpeg"}
 MAX_BACKGROUND_VIDEO_SIZE = 100 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Unreferenced blobs younger than this are left to the writer that is about to link them.
+BLOB_GC_GRACE_SECONDS = 15 * 60
+
+_blob_lock = threading.Lock()
+_inode_digests: dict[tuple[int, int, int, int], str] = {}
 
 
 def media_root() -> Path:
@@ -66,7 +77,56 @@ def resolve_background_preset(preset_key: str) -> dict:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Background preset not found")
 
 
-async def save_background_asset(project_id: int, file: UploadFile) -> tuple[Path, int, str]:
+def _write_and_hash(handle, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    handle.write(chunk)
+
+
+async def stream_upload_to_blob_store(file: UploadFile, *, max_bytes: int, too_large_detail: str) -> tuple[Path, int, str]:
+    """Streams an upload into a temp file beside the blob store, hashing it in the same pass.
+
+    File writes and hashing run in the threadpool chunk by chunk, so a large upload never blocks the
+    event loop. Returns the temp path, byte size and sha256; callers adopt it with `adopt_upload_blob`.
+    """
+    if file.size is not None and file.size > max_bytes:
+        await file.close()
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=too_large_detail)
+    temp_path = blob_store_dir() / f".upload.{uuid.uuid4().hex}.tmp"
+    digest = hashlib.sha256()
+    size = 0
+    handle = await run_in_threadpool(temp_path.open, "wb")
+    try:
+        await file.seek(0)
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=too_large_detail)
+            await run_in_threadpool(_write_and_hash, handle, digest, chunk)
+    except BaseException:
+        await run_in_threadpool(handle.close)
+        temp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        await file.close()
+    await run_in_threadpool(handle.close)
+    return temp_path, size, digest.hexdigest()
+
+
+def adopt_upload_blob(temp_path: Path, digest: str, destination: Path) -> Path:
+    """Moves a hashed upload into the blob store, or drops it when that content is already stored."""
+    blob = blob_path(digest, destination.suffix)
+    try:
+        with _blob_lock:
+            if not _link_blob(temp_path, blob, destination):
+                logger.info("Upload deduplicated against blob %s", blob.name)
+            _remember_digest(blob, digest)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    return destination
+
+
+async def save_background_asset(project_id: int, file: UploadFile) -> dict:
+    """Stores an uploaded background and returns its path, size, mime type and sha256."""
     if not file.filename:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Filename is required")
     if file.content_type not in ALLOWED_BACKGROUND_VIDEO_TYPES:
@@ -75,49 +135,189 @@ async def save_background_asset(project_id: int, file: UploadFile) -> tuple[Path
             detail="Unsupported background video type",
         )
 
-    destination = project_media_dir(project_id) / f"{uuid.uuid4().hex}_{Path(file.filename).name}"
-    size = 0
+    filename = Path(file.filename).name
+    mime_type = file.content_type or mimetypes.guess_type(filename)[0] or "video/mp4"
+    temp_path, size, digest = await stream_upload_to_blob_store(
+        file, max_bytes=MAX_BACKGROUND_VIDEO_SIZE, too_large_detail="Background video exceeds 100MB limit"
+    )
+    destination = project_media_dir(project_id) / f"{uuid.uuid4().hex}_{filename}"
+    await run_in_threadpool(adopt_upload_blob, temp_path, digest, destination)
+    return {"path": destination, "size_bytes": size, "mime_type": mime_type, "sha256": digest}
+
+
+def blob_store_dir() -> Path:
+    path = media_root() / "blobs"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
 
+
+def blob_path(digest: str, suffix: str = "") -> Path:
+    return blob_store_dir() / digest[:2] / digest[2:4] / f"{digest}{suffix.lower()}"
+
+
+def blob_reference_count(blob: Path) -> int:
+    """Project files are hardlinks of their blob, so the link count beyond the blob itself is the refcount."""
     try:
-        await file.seek(0)
-        with open(destination, "wb") as out_file:
-            while chunk := await file.read(1024 * 1024):
-                size += len(chunk)
-                if size > MAX_BACKGROUND_VIDEO_SIZE:
-                    raise HTTPException(
-                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                        detail="Background video exceeds 100MB limit",
-                    )
-                out_file.write(chunk)
-    except HTTPException:
-        if destination.exists():
-            destination.unlink()
-        raise
-    finally:
-        await file.close()
+        return blob.stat().st_nlink - 1
+    except FileNotFoundError:
+        return 0
 
-    return destination, size, file.content_type or mimetypes.guess_type(destination.name)[0] or "video/mp4"
+
+def _link_or_copy(source: Path, destination: Path) -> None:
+    """Atomically places `source` at `destination`, as a hardlink unless they sit on different filesystems."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = destination.with_name(f".{destination.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        shutil.copy2(source, temp_path)
+    os.replace(temp_path, destination)
+
+
+def _link_blob(source_path: Path, blob: Path, destination: Path, *, attempts: int = 3) -> bool:
+    """Links `blob` at `destination`, ingesting it from `source_path` first when it is missing.
+
+    `_blob_lock` only serialises this process, so another process's garbage collection can unlink the blob
+    between the existence check and the link; the content is then ingested again from the source. Returns
+    whether the blob was ingested.
+    """
+    ingested = False
+    for attempt in range(attempts):
+        if not blob.exists():
+            _link_or_copy(source_path, blob)
+            ingested = True
+        try:
+            _link_or_copy(blob, destination)
+            return ingested
+        except FileNotFoundError:
+            if attempt == attempts - 1:
+                raise
+            logger.info("Blob %s vanished before it was linked; ingesting it again", blob.name)
+    return ingested
+
+
+def store_blob_reference(source_path: Path, destination: Path, *, move: bool = False) -> Path:
+    """Stores `source_path` in the content-addressed blob store and links it at `destination`.
+
+    Identical content is kept once however many projects reference it. With `move=True` the source is
+    unlinked afterwards, which turns a same-filesystem store into a pair of renames.
+    """
+    digest = content_sha256(source_path)
+    blob = blob_path(digest, source_path.suffix)
+    with _blob_lock:
+        _link_blob(source_path, blob, destination)
+    if move:
+        source_path.unlink(missing_ok=True)
+    return destination
 
 
 def copy_preset_to_project(project_id: int, preset_key: str) -> tuple[Path, int, str]:
+    """Stores a copy of the bundled preset as a project blob reference.
+
+    The bundled file is copied, never linked, so its inode stays out of the blob store's refcounts and a
+    project file can never write through to it.
+    """
     preset = resolve_background_preset(preset_key)
     source_path: Path = preset["path"]
     destination = project_media_dir(project_id) / f"{uuid.uuid4().hex}_{source_path.name}"
-    shutil.copy2(source_path, destination)
+    temp_path = blob_store_dir() / f".upload.{uuid.uuid4().hex}.tmp"
+    try:
+        shutil.copyfile(source_path, temp_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    adopt_upload_blob(temp_path, content_sha256(source_path), destination)
     return destination, destination.stat().st_size, guess_mime_type(str(destination))
 
 
-def store_generated_file(project_id: int, source_path: str, filename: str | None = None) -> Path:
+def store_generated_file(project_id: int, source_path: str, filename: str | None = None, *, move: bool = False) -> Path:
     output_name = filename or f"{uuid.uuid4().hex}.mp4"
     destination = project_media_dir(project_id) / output_name
-    shutil.copy2(source_path, destination)
-    return destination
+    return store_blob_reference(Path(source_path), destination, move=move)
+
+
+def _collect_blob(blob: Path) -> bool:
+    with _blob_lock:
+        if blob.exists() and blob_reference_count(blob) == 0:
+            blob.unlink(missing_ok=True)
+            return True
+    return False
 
 
 def delete_storage_key(storage_key: str) -> None:
+    """Drops one reference and garbage-collects the blob behind it once nothing else links to it."""
     path = Path(storage_key)
-    if path.exists() and path.is_file():
+    if not path.exists() or not path.is_file():
+        return
+    blob = None
+    if path.stat().st_nlink > 1:
+        candidate = blob_path(content_sha256(path), path.suffix)
+        if candidate.exists() and os.path.samefile(candidate, path):
+            blob = candidate
+    path.unlink()
+    if blob is not None and _collect_blob(blob):
+        logger.info("Collected blob %s after its last reference was deleted", blob.name)
+
+
+def _sweep_stale_temp_file(path: Path, cutoff: float) -> bool:
+    try:
+        if path.stat().st_mtime >= cutoff:
+            return False
         path.unlink()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def collect_blob_garbage(*, grace_seconds: int = BLOB_GC_GRACE_SECONDS) -> list[str]:
+    """Sweeps blobs whose references were removed outside delete_storage_key (e.g. cache evictions).
+
+    Temp files left by uploads and links that crashed mid-write are dropped once untouched for the grace period.
+    """
+    cutoff = time.time() - grace_seconds
+    collected: list[str] = []
+    swept = sum(_sweep_stale_temp_file(path, cutoff) for path in blob_store_dir().glob(".upload.*.tmp"))
+    for blob in blob_store_dir().glob("*/*/*"):
+        if blob.name.startswith("."):
+            if blob.name.endswith(".tmp"):
+                swept += _sweep_stale_temp_file(blob, cutoff)
+            continue
+        if not blob.is_file():
+            continue
+        stat = blob.stat()
+        if stat.st_nlink <= 1 and stat.st_ctime < cutoff and _collect_blob(blob):
+            collected.append(blob.name)
+    if swept:
+        logger.info("Swept %s abandoned blob-store temp files", swept)
+    if collected:
+        logger.info("Collected %s unreferenced blobs", len(collected))
+    return collected
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_sha256(path: str | Path) -> str:
+    """sha256 of a file, memoised per inode so every hardlink of a blob is hashed once per process."""
+    stat = Path(path).stat()
+    key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    digest = _inode_digests.get(key)
+    if digest is None:
+        digest = sha256_file(Path(path))
+        _remember_digest(path, digest)
+    return digest
+
+
+def _remember_digest(path: str | Path, digest: str) -> None:
+    stat = Path(path).stat()
+    if len(_inode_digests) >= 1024:
+        _inode_digests.clear()
+    _inode_digests[(stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)] = digest
 
 
 def guess_mime_type(storage_key: str) -> str:
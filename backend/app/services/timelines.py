@@ -0,0 +1,52 @@
+"""Speech timelines kept with draft renders so they can be re-encoded without running TTS again.
+
+Each render output owns its own timeline directory of hardlinks into the blob store, so identical
+lines are stored once across renders and a released timeline frees exactly what no other output links.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any
+
+from app.services.storage import delete_storage_key, project_media_dir, store_blob_reference
+
+logger = logging.getLogger(__name__)
+
+
+def timeline_dir(project_id: int, name: str) -> Path:
+    return project_media_dir(project_id) / "timelines" / name
+
+
+def link_timeline(project_id: int, name: str, timeline: dict[str, Any]) -> dict[str, Any] | None:
+    """Returns `timeline` with its audio linked under the project's `name` timeline directory.
+
+    Returns None when any source audio is gone, e.g. a cached entry whose owning output was released.
+    """
+    segments = list(timeline.get("segments") or [])
+    if not segments or not all(Path(entry["audio_path"]).exists() for entry in segments):
+        return None
+    directory = timeline_dir(project_id, name)
+    entries = []
+    for index, entry in enumerate(segments):
+        source = Path(entry["audio_path"])
+        audio_path = directory / f"{index:03d}{source.suffix or '.wav'}"
+        if source.resolve() != audio_path.resolve():
+            store_blob_reference(source, audio_path)
+        entries.append({**entry, "audio_path": str(audio_path)})
+    return {**timeline, "segments": entries}
+
+
+def release_timeline(timeline: dict[str, Any] | None) -> None:
+    """Drops a timeline's audio links and its directory; blobs go once nothing else links them."""
+    directories: set[Path] = set()
+    for entry in (timeline or {}).get("segments") or []:
+        path = Path(entry["audio_path"])
+        directories.add(path.parent)
+        delete_storage_key(str(path))
+    for directory in directories:
+        try:
+            directory.rmdir()
+        except OSError:
+            logger.debug("Timeline directory %s is not empty; leaving it", directory)
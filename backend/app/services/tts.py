@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import hashlib
 import importlib.util
+import io
 import logging
+import math
 import os
 import re
 import resource
@@ -10,22 +12,32 @@ import shutil
 import subprocess
 import sys
 import threading
+import time
 import uuid
 import wave
-from dataclasses import dataclass
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import numpy as np
 
 from app.core.config import settings
+from app.services import speech_activity
+from app.services.espeak_native import espeak_library
+from app.services.storage import content_sha256
+from app.services.voice_cache import has_voice_cache_entry, materialize_voice_cache_entry, store_voice_cache_entry
 from app.services.voice_profiles import (
     get_character_preset_model,
+    ready_reference_audios,
     reference_audio_content_hash_from_paths,
     resolve_character_preset_for_speaker,
     resolve_preset_for_project_speaker,
+    voice_chunk_embedding_path,
+    voice_embedding_aggregate_path,
     voice_embedding_artifact_path_for_reference,
-    voice_cache_dir,
 )
 
 logger = logging.getLogger(__name__)
@@ -36,6 +48,44 @@ def _slugify(value: str) -> str:
     return slug or "speaker"
 
 
+def _resample(samples: np.ndarray, frame_rate: int, sample_rate: int, max_frames: int, *, half_taps: int = 16, block_frames: int = 8192) -> np.ndarray:
+    """Band-limited resampling of `(frames, channels)` audio to `sample_rate`, at most `max_frames` long.
+
+    Each output frame is a Kaiser-windowed sinc over the source frames around it, low-passed at the lower
+    of the two Nyquist rates so upsampled voices do not image and downsampled ones do not alias. Edges are
+    padded with the first and last frame rather than silence, so a line does not ring at its boundaries.
+    """
+    divisor = math.gcd(frame_rate, sample_rate)
+    up, down = sample_rate // divisor, frame_rate // divisor
+    cutoff = min(1.0, sample_rate / frame_rate)
+    half = int(math.ceil(half_taps / cutoff))
+    offsets = np.arange(-half + 1, half + 1)
+    # Output frame n sits (n * down % up) / up past a source frame, so the kernel repeats every `up` frames.
+    distance = ((np.arange(up, dtype=np.int64) * down % up) / up)[:, None] - offsets[None, :]
+    window = np.i0(8.6 * np.sqrt(np.clip(1.0 - (distance / half) ** 2, 0.0, None))) / np.i0(8.6)
+    kernels = (np.sinc(cutoff * distance) * window).astype(np.float32)
+    kernels /= kernels.sum(axis=1, keepdims=True)
+    padded = np.pad(samples, ((half, half), (0, 0)), mode="edge")
+    output = np.empty((min(max_frames, samples.shape[0] * up // down), samples.shape[1]), dtype=np.float32)
+    for start in range(0, output.shape[0], block_frames):
+        frames = np.arange(start, min(start + block_frames, output.shape[0]), dtype=np.int64)
+        taps = padded[(frames * down // up)[:, None] + offsets[None, :] + half]
+        output[start : start + frames.size] = np.einsum("ft,ftc->fc", kernels[frames % up], taps)
+    return output
+
+
+def provider_concurrency_limits() -> dict[str, int]:
+    limits: dict[str, int] = {}
+    for item in settings.TTS_PROVIDER_CONCURRENCY.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip().isdigit():
+            limits[name.strip().lower()] = max(int(value), 1)
+    # In-process espeak synthesis is serialised on the library's lock; more slots would only queue there.
+    if espeak_library() is not None:
+        limits["espeak"] = 1
+    return limits
+
+
 def apply_voice_lab_overrides(
     voice_profile: dict[str, Any],
     *,
@@ -119,6 +169,42 @@ class TTSProviderError(RuntimeError):
 TextToSpeechError = TTSProviderError
 
 
+@dataclass(frozen=True)
+class PcmAudio:
+    """Decoded speech kept in memory between synthesis and mixing; `samples` is float32 in [-1, 1]."""
+
+    samples: np.ndarray
+    sample_rate: int
+
+    @property
+    def channels(self) -> int:
+        return 1 if self.samples.ndim == 1 else int(self.samples.shape[1])
+
+    @property
+    def duration_seconds(self) -> float:
+        return float(self.samples.shape[0] / self.sample_rate) if self.sample_rate else 0.0
+
+    @classmethod
+    def from_wav_bytes(cls, data: bytes) -> "PcmAudio":
+        with wave.open(io.BytesIO(data), "rb") as handle:
+            frame_rate = handle.getframerate()
+            channels = handle.getnchannels()
+            # Streamed WAV headers (e.g. espeak --stdout) carry a placeholder length, so read to the end.
+            raw_frames = handle.readframes(2**31 - 1)
+        samples = np.frombuffer(raw_frames, dtype=np.int16).astype(np.float32) / 32768.0
+        return cls(samples if channels == 1 else samples.reshape((-1, channels)), frame_rate)
+
+    def write_wav(self, path: Path) -> Path:
+        pcm16 = (np.clip(self.samples, -1.0, 1.0) * 32767.0).astype("<i2")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with wave.open(str(path), "wb") as handle:
+            handle.setnchannels(self.channels)
+            handle.setsampwidth(2)
+            handle.setframerate(self.sample_rate)
+            handle.writeframes(pcm16.tobytes())
+        return path
+
+
 @dataclass(frozen=True)
 class SpeechSegment:
     speaker: str
@@ -132,6 +218,8 @@ class SpeechSegment:
     fallback_used: bool = False
     controls_applied: dict[str, Any] | None = None
     reference_audio_count: int = 0
+    # In-memory copy of `audio_path`, when the provider produced one; never serialised.
+    pcm: PcmAudio | None = field(default=None, repr=False, compare=False)
 
 
 @dataclass(frozen=True)
@@ -146,20 +234,108 @@ class SynthesisResult:
     provider_state: dict[str, Any]
     cache_hit: bool
     voice_profile_id: str
+    pcm: PcmAudio | None = None
+
+
+# Errors that mean the provider itself went away, as opposed to one line or clip failing.
+PROVIDER_AVAILABILITY_ERROR_CODES = frozenset(
+    {
+        "espeak_not_installed",
+        "openvoice_server_unavailable",
+        "openvoice_package_missing",
+        "openvoice_package_import_failed",
+        "openvoice_models_missing",
+        "openvoice_missing_models",
+        "openvoice_missing_repo",
+        "openvoice_source_embedding_missing",
+    }
+)
+
+
+class ProviderHealthCache:
+    """Provider health shared by every registry and orchestrator in the process.
+
+    Probing OpenVoice imports MeloTTS and the converter, so results are kept for
+    `TTS_PROVIDER_HEALTH_TTL_SECONDS` and each key is probed by one thread at a time while the others
+    wait for its result. Entries are keyed by the provider's health-relevant settings, so a config
+    change re-probes immediately, and an availability failure drops its entry via `invalidate_for_error`.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, tuple[Any, ...]], tuple[float, dict[str, Any]]] = {}
+        self._last_seen: dict[str, tuple[Any, Any]] = {}
+        self._probe_locks: dict[tuple[str, tuple[Any, ...]], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, key: tuple[str, tuple[Any, ...]]) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] < settings.TTS_PROVIDER_HEALTH_TTL_SECONDS:
+            return dict(entry[1])
+        return None
+
+    def get(self, provider: "BaseTTSProvider") -> dict[str, Any]:
+        key = (provider.provider_name, provider._health_config())
+        cached = self._fresh(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            probe_lock = self._probe_locks.setdefault(key, threading.Lock())
+        with probe_lock:
+            cached = self._fresh(key)
+            if cached is not None:
+                return cached
+            health = provider._probe_health()
+            with self._lock:
+                self._entries[key] = (time.monotonic(), health)
+        status_pair = (health.get("available"), health.get("reason"))
+        with self._lock:
+            previous = self._last_seen.get(provider.provider_name)
+            self._last_seen[provider.provider_name] = status_pair
+        if previous is not None and previous != status_pair:
+            logger.info(
+                "tts.provider_health_changed provider=%s available=%s reason=%s previous_reason=%s",
+                provider.provider_name,
+                health.get("available"),
+                health.get("reason"),
+                previous[1],
+            )
+        return dict(health)
+
+    def invalidate(self, provider_name: str | None = None) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if provider_name is None or key[0] == provider_name]:
+                del self._entries[key]
+
+    def invalidate_for_error(self, provider_name: str, error: "TTSProviderError") -> None:
+        """Drops the provider's health only when `error` says the provider is unavailable."""
+        if error.code in PROVIDER_AVAILABILITY_ERROR_CODES:
+            self.invalidate(provider_name)
+
+
+provider_health_cache = ProviderHealthCache()
 
 
 class BaseTTSProvider:
     provider_name = "base"
     clone_capable = False
     prepare_capable = False
+    batch_capable = False
     supported_control_names: tuple[str, ...] = ()
 
     def is_available(self) -> bool:
         return bool(self.healthcheck()["available"])
 
     def healthcheck(self) -> dict[str, Any]:
+        return provider_health_cache.get(self)
+
+    def _probe_health(self) -> dict[str, Any]:
         raise NotImplementedError
 
+    def _health_config(self) -> tuple[Any, ...]:
+        """Settings the probe depends on; changing any of them invalidates the cached health."""
+        return ()
+
     def supported_controls(self) -> ProviderCapability:
         health = self.healthcheck()
         return ProviderCapability(
@@ -223,47 +399,35 @@ class EspeakProvider(BaseTTSProvider):
         "pause_length",
     )
 
-    def healthcheck(self) -> dict[str, Any]:
-        espeak_ng_binary = shutil.which("espeak-ng")
-        espeak_binary = shutil.which("espeak")
-        available = bool(espeak_ng_binary or espeak_binary)
+    def _health_config(self) -> tuple[Any, ...]:
+        return (settings.TTS_ESPEAK_LIBRARY, os.environ.get("PATH"))
+
+    def _probe_health(self) -> dict[str, Any]:
+        library = espeak_library()
+        binary = None if library else shutil.which("espeak-ng") or shutil.which("espeak")
+        available = bool(library or binary)
         return {
             "available": available,
             "reason": None if available else "missing_binary",
-            "metadata": {"binary": espeak_ng_binary or espeak_binary},
+            "metadata": {"backend": "library" if library else "cli", "binary": binary},
         }
 
-    def synthesize_line(
-        self,
-        text: str,
-        voice_profile: dict[str, Any],
-        output_path: Path,
-        options: dict[str, Any],
-    ) -> dict[str, Any]:
-        binary = shutil.which("espeak-ng") or shutil.which("espeak")
-        if not binary:
+    def _synthesize_in_process(self, library: Any, text: str, **voice_settings: Any) -> PcmAudio:
+        try:
+            samples = library.synthesize(text, **voice_settings)
+        except (RuntimeError, ValueError) as exc:
             raise TTSProviderError(
-                code="espeak_not_installed",
-                message="Local espeak fallback is unavailable because espeak-ng is not installed.",
+                code="synthesis_failure",
+                message=f"espeak synthesis failed: {exc}",
                 provider_state={self.provider_name: self.healthcheck()},
-                suggested_action="Install espeak-ng in the runtime image or choose a different provider.",
-            )
-        controls = dict(voice_profile.get("controls") or {})
-        fallback_settings = dict(voice_profile.get("fallback_voice_settings") or {})
-        rate = int(fallback_settings.get("rate") or voice_profile.get("espeak_rate") or settings.TTS_ESPEAK_RATE)
-        pitch = int(fallback_settings.get("pitch") or voice_profile.get("espeak_pitch") or settings.TTS_ESPEAK_PITCH)
-        word_gap = int(
-            fallback_settings.get("word_gap")
-            if fallback_settings.get("word_gap") is not None
-            else voice_profile.get("espeak_word_gap") or settings.TTS_ESPEAK_WORD_GAP
-        )
-        amplitude = int(fallback_settings.get("amplitude") or voice_profile.get("espeak_amplitude") or settings.TTS_ESPEAK_AMPLITUDE)
+                suggested_action="Verify the espeak voice settings and try a simpler preview.",
+            ) from exc
+        return PcmAudio(samples.astype(np.float32) / 32768.0, library.sample_rate)
 
-        voice = str(fallback_settings.get("voice") or voice_profile.get("voice") or voice_profile.get("espeak_voice") or settings.TTS_ESPEAK_VOICE_SLOT_1)
+    def _synthesize_subprocess(self, binary: str, text: str, *, voice: str, rate: int, pitch: int, word_gap: int, amplitude: int) -> PcmAudio:
         command = [
             binary,
-            "-w",
-            str(output_path),
+            "--stdout",
             "-s",
             str(rate),
             "-p",
@@ -277,16 +441,50 @@ class EspeakProvider(BaseTTSProvider):
             text,
         ]
         try:
-            subprocess.run(command, check=True, capture_output=True, text=True)
+            completed = subprocess.run(command, check=True, capture_output=True)
         except subprocess.CalledProcessError as exc:
             raise TTSProviderError(
                 code="synthesis_failure",
-                message=f"espeak synthesis failed: {exc.stderr.strip()}",
+                message=f"espeak synthesis failed: {(exc.stderr or b'').decode('utf-8', 'replace').strip()}",
                 provider_state={self.provider_name: self.healthcheck()},
                 suggested_action="Verify the espeak voice settings and try a simpler preview.",
             ) from exc
+        return PcmAudio.from_wav_bytes(completed.stdout)
 
-        duration_seconds = _audio_stats(output_path)["duration_seconds"]
+    def synthesize_line(
+        self,
+        text: str,
+        voice_profile: dict[str, Any],
+        output_path: Path,
+        options: dict[str, Any],
+    ) -> dict[str, Any]:
+        library = espeak_library()
+        binary = None if library else shutil.which("espeak-ng") or shutil.which("espeak")
+        if not library and not binary:
+            raise TTSProviderError(
+                code="espeak_not_installed",
+                message="Local espeak fallback is unavailable because espeak-ng is not installed.",
+                provider_state={self.provider_name: self.healthcheck()},
+                suggested_action="Install espeak-ng in the runtime image or choose a different provider.",
+            )
+        controls = dict(voice_profile.get("controls") or {})
+        fallback_settings = dict(voice_profile.get("fallback_voice_settings") or {})
+        rate = int(fallback_settings.get("rate") or voice_profile.get("espeak_rate") or settings.TTS_ESPEAK_RATE)
+        pitch = int(fallback_settings.get("pitch") or voice_profile.get("espeak_pitch") or settings.TTS_ESPEAK_PITCH)
+        word_gap = int(
+            fallback_settings.get("word_gap")
+            if fallback_settings.get("word_gap") is not None
+            else voice_profile.get("espeak_word_gap") or settings.TTS_ESPEAK_WORD_GAP
+        )
+        amplitude = int(fallback_settings.get("amplitude") or voice_profile.get("espeak_amplitude") or settings.TTS_ESPEAK_AMPLITUDE)
+
+        voice = str(fallback_settings.get("voice") or voice_profile.get("voice") or voice_profile.get("espeak_voice") or settings.TTS_ESPEAK_VOICE_SLOT_1)
+        if library:
+            pcm = self._synthesize_in_process(library, text, voice=voice, rate=rate, pitch=pitch, word_gap=word_gap, amplitude=amplitude)
+        else:
+            pcm = self._synthesize_subprocess(binary, text, voice=voice, rate=rate, pitch=pitch, word_gap=word_gap, amplitude=amplitude)
+        pcm.write_wav(output_path)
+        duration_seconds = pcm.duration_seconds
         controls_applied = {
             "speaking_rate": controls.get("speaking_rate"),
             "pitch": pitch,
@@ -300,6 +498,7 @@ class EspeakProvider(BaseTTSProvider):
             "provider_used": self.provider_name,
             "controls_applied": {key: value for key, value in controls_applied.items() if value is not None},
             "reference_audio_count": len(voice_profile.get("reference_audios") or []),
+            "pcm": pcm,
         }
 
 
@@ -307,12 +506,12 @@ class OpenVoiceProvider(BaseTTSProvider):
     provider_name = "openvoice"
     clone_capable = True
     prepare_capable = True
+    batch_capable = True
     _cache_lock = threading.Lock()
     _melo_model_cache: dict[tuple[str, str], Any] = {}
     _converter_cache: dict[tuple[str, str], Any] = {}
     _source_embedding_cache: dict[tuple[str, str], Any] = {}
     _target_embedding_cache: dict[str, Any] = {}
-    _silero_vad_ready_devices: set[str] = set()
     supported_control_names = ("speaking_rate",)
 
     def _repo_dir(self) -> Path | None:
@@ -332,6 +531,17 @@ class OpenVoiceProvider(BaseTTSProvider):
             if repo_path not in sys.path:
                 sys.path.insert(0, repo_path)
 
+    def _server_socket(self) -> str | None:
+        return settings.OPENVOICE_SERVER_SOCKET or None
+
+    def _server_client(self):
+        socket_path = self._server_socket()
+        if not socket_path:
+            return None
+        from app.services.openvoice_server import OpenVoiceClient
+
+        return OpenVoiceClient(socket_path)
+
     def _device(self) -> tuple[str, str | None]:
         requested = settings.OPENVOICE_DEVICE.strip().lower()
         if requested and requested != "auto":
@@ -345,9 +555,21 @@ class OpenVoiceProvider(BaseTTSProvider):
             pass
         return "cpu", "gpu_unavailable_using_cpu"
 
-    def healthcheck(self) -> dict[str, Any]:
+    def _health_config(self) -> tuple[Any, ...]:
+        return (
+            settings.OPENVOICE_ENABLED,
+            self._server_socket(),
+            settings.OPENVOICE_REPO_DIR,
+            settings.OPENVOICE_CHECKPOINTS_DIR,
+            settings.OPENVOICE_DEVICE,
+        )
+
+    def _probe_health(self) -> dict[str, Any]:
         if not settings.OPENVOICE_ENABLED:
             return {"available": False, "reason": "disabled", "metadata": {}}
+        client = self._server_client()
+        if client:
+            return client.healthcheck()
         repo_dir = self._repo_dir()
         checkpoints_dir = self._checkpoints_dir()
         if not repo_dir or not repo_dir.exists():
@@ -373,7 +595,6 @@ class OpenVoiceProvider(BaseTTSProvider):
             }
         try:
             from melo.api import TTS  # type: ignore
-            from openvoice import se_extractor  # type: ignore
             from openvoice.api import ToneColorConverter  # type: ignore
         except Exception as exc:
             metadata["import_error"] = f"{type(exc).__name__}: {exc}"
@@ -388,6 +609,24 @@ class OpenVoiceProvider(BaseTTSProvider):
             "metadata": metadata,
         }
 
+    def warm_up(self, languages: list[str]) -> dict[str, Any]:
+        """Loads the converter and the MeloTTS models for `languages` into the process-wide caches.
+
+        With `OPENVOICE_SERVER_SOCKET` set the models live in the server, so only its health is checked.
+        """
+        health = self.healthcheck()
+        if not health["available"] or self._server_client():
+            if not health["available"]:
+                logger.warning("openvoice.warm_up skipped reason=%s", health.get("reason"))
+            return {"available": health["available"], "reason": health.get("reason"), "languages": []}
+        tts_cls, _se_extractor, converter_cls, _torch = self._import_runtime()
+        device = health["metadata"].get("device") or "cpu"
+        self._get_converter(Path(settings.OPENVOICE_CHECKPOINTS_DIR) / "converter", device, converter_cls)
+        for language in languages:
+            self._get_melo_model(self._melo_language(language), device, tts_cls)
+        logger.info("openvoice.warm languages=%s device=%s rss_mb=%.1f", languages, device, self._memory_mb())
+        return {"available": True, "reason": None, "device": device, "languages": languages}
+
     def _melo_language(self, language: str | None) -> str:
         mapping = {
             "en": "EN",
@@ -502,6 +741,9 @@ class OpenVoiceProvider(BaseTTSProvider):
     def _embedding_artifact_path(self, voice_profile: dict[str, Any], reference_hash: str) -> Path:
         return voice_embedding_artifact_path_for_reference(str(voice_profile.get("id") or uuid.uuid4().hex), reference_hash)
 
+    def _embedding_aggregate_path(self, voice_profile: dict[str, Any]) -> Path | None:
+        return voice_embedding_aggregate_path(str(voice_profile["id"])) if voice_profile.get("id") else None
+
     def _embedding_fingerprint(self, target_embedding: Any) -> str:
         try:
             tensor = target_embedding.detach().cpu().contiguous()
@@ -540,71 +782,84 @@ class OpenVoiceProvider(BaseTTSProvider):
     def _import_runtime(self) -> tuple[Any, Any, Any, Any]:
         self._ensure_repo_on_path()
         from melo.api import TTS  # type: ignore
-        from openvoice import se_extractor  # type: ignore
         from openvoice.api import ToneColorConverter  # type: ignore
         import torch  # type: ignore
 
-        return TTS, se_extractor, ToneColorConverter, torch
+        # speech_activity stands in for openvoice.se_extractor: it segments clips without Whisper or Silero
+        # and embeds them through ToneColorConverter.extract_se_batch.
+        return TTS, speech_activity, ToneColorConverter, torch
 
-    def _ensure_silero_vad_ready(self, torch_module: Any) -> None:
-        device, _warning = self._device()
-        with self._cache_lock:
-            if device in self._silero_vad_ready_devices:
-                return
-        self._log_memory_stage("silero_vad_prewarm_begin", device=device)
+    def _converter_checkpoint_identity(self) -> str:
+        checkpoint_path = Path(settings.OPENVOICE_CHECKPOINTS_DIR) / "converter" / "checkpoint.pth"
         try:
-            torch_module.hub.load(
-                repo_or_dir="snakers4/silero-vad",
-                model="silero_vad",
-                trust_repo=True,
-                skip_validation=True,
-                onnx=False,
-            )
-        except Exception as exc:
-            raise TTSProviderError(
-                code="openvoice_vad_bootstrap_failed",
-                message=f"OpenVoice could not initialize Silero VAD non-interactively: {exc}",
-                provider_state={self.provider_name: self.healthcheck()},
-                suggested_action="Rebuild the Docker image with network access or pre-populate the torch hub cache for snakers4/silero-vad.",
-            ) from exc
-        with self._cache_lock:
-            self._silero_vad_ready_devices.add(device)
-        self._log_memory_stage("silero_vad_prewarm_end", device=device)
+            stat = checkpoint_path.stat()
+        except OSError:
+            return f"missing:{checkpoint_path}"
+        return "|".join([str(checkpoint_path.resolve()), str(stat.st_size), str(int(stat.st_mtime_ns))])
+
+    def _chunk_embedding_key(self, reference_path: Path, checkpoint_identity: str) -> str:
+        # The embedding depends on the clip bytes, on how speech was segmented out of it and on the converter.
+        payload = "|".join(
+            [
+                content_sha256(reference_path),
+                checkpoint_identity,
+                str(settings.VOICE_LAB_REFERENCE_SILENCE_THRESHOLD_DB),
+                str(settings.VOICE_LAB_REFERENCE_SILENCE_MIN_SECONDS),
+                str(speech_activity.EMBEDDING_SPLIT_SECONDS),
+            ]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _extract_reference_embeddings(
+        self, reference_paths: list[Path], converter: Any, se_extractor: Any, device: str, torch_module: Any
+    ) -> list[Any]:
+        """Per-clip embeddings, reusing cached chunks and embedding the rest in one batch.
 
-    def _extract_reference_embedding(self, reference_path: Path, converter: Any, se_extractor: Any, device: str) -> Any:
-        cache_key = self._reference_audio_cache_key([reference_path], device)
+        Chunks are keyed by content hash, so adding a clip to a profile only embeds the new clip.
+        """
+        checkpoint_identity = self._converter_checkpoint_identity()
+        keys = [self._chunk_embedding_key(path, checkpoint_identity) for path in reference_paths]
+        embeddings: dict[str, Any] = {}
         with self._cache_lock:
-            target_embedding = self._target_embedding_cache.get(cache_key)
-            if target_embedding is not None:
-                self._log_memory_stage("target_embedding_cache_hit", device=device, reference_audio_path=str(reference_path))
-                return target_embedding
-        reference_hash = self._reference_audio_hash([reference_path])
+            for key in keys:
+                cached = self._target_embedding_cache.get(f"chunk|{key}|{device}")
+                if cached is not None:
+                    embeddings[key] = cached
+        for key in keys:
+            chunk_path = voice_chunk_embedding_path(key)
+            if key not in embeddings and chunk_path.exists():
+                embeddings[key] = torch_module.load(str(chunk_path), map_location=device)
+        missing = {key: path for key, path in zip(keys, reference_paths) if key not in embeddings}
         self._log_memory_stage(
             "target_embedding_extract_begin",
             device=device,
-            reference_audio_path=str(reference_path),
-            reference_audio_sha256=reference_hash,
-            reference_audio_size_bytes=reference_path.stat().st_size,
+            references=len(reference_paths),
+            cached_references=len(reference_paths) - len(missing),
+            reference_audio_size_bytes=sum(path.stat().st_size for path in missing.values()),
         )
-        try:
-            target_embedding, _ = se_extractor.get_se(str(reference_path), converter, vad=False)
-        except Exception as exc:
-            raise TTSProviderError(
-                code="reference_embedding_extraction_failed",
-                message=f"OpenVoice could not extract a speaker embedding from the selected reference audio: {exc}",
-                provider_state={self.provider_name: self.healthcheck()},
-                suggested_action="Try a clearer authorized reference clip or check the OpenVoice runtime logs.",
-            ) from exc
+        if missing:
+            try:
+                extracted = se_extractor.embed_references(
+                    list(missing.values()),
+                    converter,
+                    threshold_db=speech_activity.parse_threshold_db(settings.VOICE_LAB_REFERENCE_SILENCE_THRESHOLD_DB),
+                    min_silence_seconds=settings.VOICE_LAB_REFERENCE_SILENCE_MIN_SECONDS,
+                )
+            except Exception as exc:
+                raise TTSProviderError(
+                    code="reference_embedding_extraction_failed",
+                    message=f"OpenVoice could not extract a speaker embedding from the selected reference audio: {exc}",
+                    provider_state={self.provider_name: self.healthcheck()},
+                    suggested_action="Try a clearer authorized reference clip or check the OpenVoice runtime logs.",
+                ) from exc
+            for key, embedding in zip(missing, extracted):
+                embeddings[key] = embedding
+                self._save_atomically(torch_module, embedding.detach().cpu(), voice_chunk_embedding_path(key))
         with self._cache_lock:
-            self._target_embedding_cache[cache_key] = target_embedding
-        self._log_memory_stage(
-            "target_embedding_extract_end",
-            device=device,
-            reference_audio_path=str(reference_path),
-            reference_audio_sha256=reference_hash,
-            **self._embedding_stats(target_embedding),
-        )
-        return target_embedding
+            for key in keys:
+                self._target_embedding_cache[f"chunk|{key}|{device}"] = embeddings[key]
+        self._log_memory_stage("target_embedding_extract_end", device=device, references=len(reference_paths), extracted_references=len(missing))
+        return [embeddings[key] for key in keys]
 
     def _load_cached_target_embedding(self, artifact_path: Path, device: str, torch_module: Any) -> Any | None:
         if not artifact_path.exists():
@@ -627,15 +882,68 @@ class OpenVoiceProvider(BaseTTSProvider):
         )
         return target_embedding
 
+    def _save_atomically(self, torch_module: Any, payload: Any, path: Path) -> None:
+        # Other workers load these files concurrently, so they only ever see a complete one.
+        temp_path = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.tmp")
+        torch_module.save(payload, str(temp_path))
+        os.replace(temp_path, path)
+
     def _persist_target_embedding(self, target_embedding: Any, artifact_path: Path, torch_module: Any) -> None:
         artifact_path.parent.mkdir(parents=True, exist_ok=True)
-        torch_module.save(target_embedding.detach().cpu(), str(artifact_path))
+        self._save_atomically(torch_module, target_embedding.detach().cpu(), artifact_path)
         self._log_memory_stage(
             "target_embedding_artifact_saved",
             target_embedding_path=str(artifact_path),
             target_embedding_hash=self._embedding_fingerprint(target_embedding),
         )
 
+    def _update_embedding_aggregate(
+        self, reference_paths: list[Path], converter: Any, se_extractor: Any, device: str, torch_module: Any, aggregate_path: Path
+    ) -> Any:
+        """Mean chunk embedding from the profile's running (count, sum), touching only changed chunks.
+
+        The aggregate records which chunk keys its sum covers. Added chunks are embedded (or read from
+        the chunk cache) and added; removed chunks are read back and subtracted. When a removed chunk's
+        embedding is gone the sum is rebuilt from the current chunks.
+        """
+        checkpoint_identity = self._converter_checkpoint_identity()
+        keys = [self._chunk_embedding_key(path, checkpoint_identity) for path in reference_paths]
+        wanted = Counter(keys)
+        covered: Counter[str] = Counter()
+        total = None
+        if aggregate_path.exists():
+            aggregate = torch_module.load(str(aggregate_path), map_location=device)
+            covered, total = Counter(aggregate.get("chunks") or {}), aggregate.get("sum")
+        removed = covered - wanted
+        removed_embeddings = []
+        for key in removed:
+            chunk_path = voice_chunk_embedding_path(key)
+            if not chunk_path.exists():
+                covered, total, removed, removed_embeddings = Counter(), None, Counter(), []
+                break
+            removed_embeddings.append((torch_module.load(str(chunk_path), map_location=device), removed[key]))
+        added = wanted - covered
+        path_by_key: dict[str, Path] = {}
+        for key, path in zip(keys, reference_paths):
+            path_by_key.setdefault(key, path)
+        added_embeddings = (
+            self._extract_reference_embeddings([path_by_key[key] for key in added], converter, se_extractor, device, torch_module)
+            if added
+            else []
+        )
+        for embedding, count in [*zip(added_embeddings, added.values()), *((-embedding, count) for embedding, count in removed_embeddings)]:
+            total = embedding * count if total is None else total + embedding * count
+        self._save_atomically(torch_module, {"chunks": dict(wanted), "count": len(keys), "sum": total.detach().cpu()}, aggregate_path)
+        self._log_memory_stage(
+            "target_embedding_aggregate_updated",
+            device=device,
+            references=len(keys),
+            added_chunks=sum(added.values()),
+            removed_chunks=sum(removed.values()),
+            aggregate_path=str(aggregate_path),
+        )
+        return total / len(keys)
+
     def _get_target_embedding(
         self,
         reference_paths: list[Path],
@@ -644,6 +952,7 @@ class OpenVoiceProvider(BaseTTSProvider):
         device: str,
         torch_module: Any,
         artifact_path: Path | None = None,
+        aggregate_path: Path | None = None,
     ) -> Any:
         cache_key = self._reference_audio_cache_key(reference_paths, device)
         reference_hash = self._reference_audio_hash(reference_paths)
@@ -672,11 +981,11 @@ class OpenVoiceProvider(BaseTTSProvider):
                     target_embedding_hash=self._embedding_fingerprint(target_embedding),
                 )
                 return target_embedding
-        embeddings = [
-            self._extract_reference_embedding(reference_path, converter, se_extractor, device)
-            for reference_path in reference_paths
-        ]
-        target_embedding = embeddings[0] if len(embeddings) == 1 else torch_module.stack(embeddings).mean(dim=0)
+        if aggregate_path:
+            target_embedding = self._update_embedding_aggregate(reference_paths, converter, se_extractor, device, torch_module, aggregate_path)
+        else:
+            embeddings = self._extract_reference_embeddings(reference_paths, converter, se_extractor, device, torch_module)
+            target_embedding = embeddings[0] if len(embeddings) == 1 else torch_module.stack(embeddings).mean(dim=0)
         if artifact_path:
             self._persist_target_embedding(target_embedding, artifact_path, torch_module)
         with self._cache_lock:
@@ -692,6 +1001,9 @@ class OpenVoiceProvider(BaseTTSProvider):
         return target_embedding
 
     def prepare_voice_profile(self, voice_profile: dict[str, Any]) -> dict[str, Any]:
+        client = self._server_client()
+        if client:
+            return client.prepare_voice_profile(voice_profile)
         health = self.healthcheck()
         if not health["available"]:
             raise TTSProviderError(
@@ -732,7 +1044,15 @@ class OpenVoiceProvider(BaseTTSProvider):
         reference_hash = self._reference_audio_hash(reference_paths)
         artifact_path = self._embedding_artifact_path(voice_profile, reference_hash)
         converter = self._get_converter(converter_dir, device, converter_cls)
-        target_embedding = self._get_target_embedding(reference_paths, converter, se_extractor, device, torch, artifact_path=artifact_path)
+        target_embedding = self._get_target_embedding(
+            reference_paths,
+            converter,
+            se_extractor,
+            device,
+            torch,
+            artifact_path=artifact_path,
+            aggregate_path=self._embedding_aggregate_path(voice_profile),
+        )
         target_embedding_hash = self._embedding_fingerprint(target_embedding)
         logger.info(
             "openvoice.voice_profile_prepared metadata=%s",
@@ -759,13 +1079,8 @@ class OpenVoiceProvider(BaseTTSProvider):
             },
         }
 
-    def synthesize_line(
-        self,
-        text: str,
-        voice_profile: dict[str, Any],
-        output_path: Path,
-        options: dict[str, Any],
-    ) -> dict[str, Any]:
+    def _synthesis_context(self, voice_profile: dict[str, Any]) -> dict[str, Any]:
+        """Validates the runtime for cloning `voice_profile` and resolves the model paths it needs."""
         health = self.healthcheck()
         if not health["available"]:
             reason = health.get("reason") or "not_available"
@@ -813,8 +1128,34 @@ class OpenVoiceProvider(BaseTTSProvider):
                 provider_state={self.provider_name: self.healthcheck()},
                 suggested_action="Install the OpenVoice base speaker embeddings before generating cloned previews.",
             )
+        return {
+            "health": health,
+            "reference_paths": reference_paths,
+            "runtime": (TTS, se_extractor, ToneColorConverter, torch),
+            "language_code": language_code,
+            "device": device,
+            "converter_dir": converter_dir,
+            "base_speaker_path": base_speaker_path,
+        }
+
+    def synthesize_line(
+        self,
+        text: str,
+        voice_profile: dict[str, Any],
+        output_path: Path,
+        options: dict[str, Any],
+    ) -> dict[str, Any]:
+        client = self._server_client()
+        if client:
+            return client.synthesize_line(text=text, voice_profile=voice_profile, output_path=output_path, options=options)
+        context = self._synthesis_context(voice_profile)
+        reference_paths = context["reference_paths"]
+        TTS, se_extractor, ToneColorConverter, torch = context["runtime"]
+        language_code = context["language_code"]
+        device = context["device"]
+        converter_dir = context["converter_dir"]
+        base_speaker_path = context["base_speaker_path"]
 
-        temp_src_path = output_path.with_name(f"{output_path.stem}_src.wav")
         stage_callback = options.get("stage_callback")
         try:
             model = self._get_melo_model(language_code, device, TTS)
@@ -835,16 +1176,24 @@ class OpenVoiceProvider(BaseTTSProvider):
                     },
                 )
             speed = float(controls.get("speaking_rate") or 1.0)
+            converter = self._get_converter(converter_dir, device, ToneColorConverter)
             self._log_memory_stage("tts_infer_begin", language=language_code, device=device)
-            model.tts_to_file(text, speaker_id, str(temp_src_path), speed=speed)
+            source_audio = self._melo_source_audio(model, text, speaker_id, speed, converter)
             self._log_memory_stage("tts_infer_end", language=language_code, device=device)
 
-            converter = self._get_converter(converter_dir, device, ToneColorConverter)
             reference_hash = self._reference_audio_hash(reference_paths)
             artifact_path = self._embedding_artifact_path(voice_profile, reference_hash)
             if callable(stage_callback):
                 stage_callback("extracting_reference", 55)
-            target_se = self._get_target_embedding(reference_paths, converter, se_extractor, device, torch, artifact_path=artifact_path)
+            target_se = self._get_target_embedding(
+                reference_paths,
+                converter,
+                se_extractor,
+                device,
+                torch,
+                artifact_path=artifact_path,
+                aggregate_path=self._embedding_aggregate_path(voice_profile),
+            )
             voice_profile["embedding_path"] = str(artifact_path)
             source_se = self._get_source_embedding(base_speaker_path, device, torch)
             if callable(stage_callback):
@@ -859,7 +1208,6 @@ class OpenVoiceProvider(BaseTTSProvider):
                 "target_embedding_hash": target_embedding_hash,
                 "active_reference_count": len(reference_paths),
                 "reference_audio_mode": "average_all_clips" if len(reference_paths) > 1 else "single_clip",
-                "last_preview_source_audio_path": str(temp_src_path),
                 "last_preview_output_path": str(output_path),
                 "openvoice_conversion_applied": True,
             }
@@ -871,7 +1219,6 @@ class OpenVoiceProvider(BaseTTSProvider):
                     "reference_audio_sha256": reference_hash,
                     "target_embedding_path": str(artifact_path),
                     "target_embedding_hash": target_embedding_hash,
-                    "source_audio_path": str(temp_src_path),
                     "converted_output_path": str(output_path),
                     "openvoice_conversion_applied": True,
                     "fallback_default_voice_used": False,
@@ -880,20 +1227,15 @@ class OpenVoiceProvider(BaseTTSProvider):
             logger.info(
                 "OpenVoice conversion applied: true metadata=%s",
                 {
-                    "source_audio_path": str(temp_src_path),
                     "converted_audio_path": str(output_path),
                     "target_voice_profile_id": voice_profile.get("id"),
                     "target_embedding_hash": target_embedding_hash,
                 },
             )
             self._log_memory_stage("voice_conversion_begin", device=device, target_embedding_hash=target_embedding_hash)
-            converter.convert(
-                audio_src_path=str(temp_src_path),
-                src_se=source_se,
-                tgt_se=target_se,
-                output_path=str(output_path),
-                message="@OmniPoster",
-            )
+            converted = self._convert_batch(converter, [source_audio], source_se, target_se, torch)[0]
+            pcm = PcmAudio(converter.add_watermark(converted, "@OmniPoster"), int(converter.hps.data.sampling_rate))
+            pcm.write_wav(output_path)
             self._log_memory_stage("voice_conversion_end", device=device)
         except TTSProviderError:
             raise
@@ -904,21 +1246,132 @@ class OpenVoiceProvider(BaseTTSProvider):
                 provider_state={self.provider_name: self.healthcheck()},
                 suggested_action="Check the reference audio, OpenVoice checkpoints, and selected language.",
             ) from exc
-        finally:
-            if temp_src_path.exists():
-                temp_src_path.unlink(missing_ok=True)
 
-        duration_seconds = _audio_stats(output_path)["duration_seconds"]
-        controls_applied = self._applied_controls(voice_profile)
         return {
             "audio_path": str(output_path),
             "voice": str(voice_profile.get("display_name") or voice_profile.get("voice") or "openvoice"),
-            "duration_seconds": max(duration_seconds, 0.6),
+            "duration_seconds": max(pcm.duration_seconds, 0.6),
             "provider_used": self.provider_name,
-            "controls_applied": controls_applied,
+            "controls_applied": self._applied_controls(voice_profile),
             "reference_audio_count": len(reference_paths),
+            "pcm": pcm,
         }
 
+    def synthesize_batch(self, items: list[dict[str, Any]], voice_profile: dict[str, Any]) -> list[dict[str, Any]]:
+        """Synthesises several lines for one voice profile with a single padded tone-colour conversion pass.
+
+        Source audio stays in memory: MeloTTS returns arrays, which are resampled to the converter rate,
+        batched into one spectrogram tensor and converted with per-line length masks.
+        """
+        client = self._server_client()
+        if client:
+            return client.synthesize_batch(items=items, voice_profile=voice_profile)
+        context = self._synthesis_context(voice_profile)
+        reference_paths = context["reference_paths"]
+        tts_cls, se_extractor, converter_cls, torch = context["runtime"]
+        device = context["device"]
+        try:
+            model = self._get_melo_model(context["language_code"], device, tts_cls)
+            speaker_id = self._melo_speaker_id(model, context["language_code"])
+            speed = float((voice_profile.get("controls") or {}).get("speaking_rate") or 1.0)
+            converter = self._get_converter(context["converter_dir"], device, converter_cls)
+            reference_hash = self._reference_audio_hash(reference_paths)
+            artifact_path = self._embedding_artifact_path(voice_profile, reference_hash)
+            target_se = self._get_target_embedding(
+                reference_paths,
+                converter,
+                se_extractor,
+                device,
+                torch,
+                artifact_path=artifact_path,
+                aggregate_path=self._embedding_aggregate_path(voice_profile),
+            )
+            source_se = self._get_source_embedding(context["base_speaker_path"], device, torch)
+            sampling_rate = int(converter.hps.data.sampling_rate)
+
+            self._log_memory_stage("tts_infer_begin", language=context["language_code"], device=device, lines=len(items))
+            sources = [self._melo_source_audio(model, item["text"], speaker_id, speed, converter) for item in items]
+            self._log_memory_stage("tts_infer_end", language=context["language_code"], device=device)
+
+            converted: list[np.ndarray | None] = [None] * len(items)
+            # Sorting by length keeps the padding in each batch small.
+            order = sorted(range(len(items)), key=lambda index: len(sources[index]))
+            batch_size = max(1, settings.OPENVOICE_BATCH_SIZE)
+            self._log_memory_stage("voice_conversion_begin", device=device, lines=len(items))
+            for start in range(0, len(order), batch_size):
+                batch = order[start : start + batch_size]
+                for index, audio in zip(batch, self._convert_batch(converter, [sources[index] for index in batch], source_se, target_se, torch)):
+                    converted[index] = audio
+            self._log_memory_stage("voice_conversion_end", device=device)
+
+            results = []
+            for item, audio in zip(items, converted):
+                pcm = PcmAudio(converter.add_watermark(audio, "@OmniPoster"), sampling_rate)
+                pcm.write_wav(item["output_path"])
+                results.append(
+                    {
+                        "audio_path": str(item["output_path"]),
+                        "voice": str(voice_profile.get("display_name") or voice_profile.get("voice") or "openvoice"),
+                        "duration_seconds": max(pcm.duration_seconds, 0.6),
+                        "provider_used": self.provider_name,
+                        "controls_applied": self._applied_controls(voice_profile),
+                        "reference_audio_count": len(reference_paths),
+                        "pcm": pcm,
+                    }
+                )
+        except TTSProviderError:
+            raise
+        except Exception as exc:
+            raise TTSProviderError(
+                code="synthesis_failure",
+                message=f"OpenVoice batch synthesis failed: {exc}",
+                provider_state={self.provider_name: self.healthcheck()},
+                suggested_action="Check the reference audio, OpenVoice checkpoints, and selected language.",
+            ) from exc
+        voice_profile["embedding_path"] = str(artifact_path)
+        voice_profile["provider_metadata"] = {
+            **dict(voice_profile.get("provider_metadata") or {}),
+            "embedding_status": "ready",
+            "embedding_ready": True,
+            "embedding_artifact_path": str(artifact_path),
+            "reference_audio_sha256": reference_hash,
+            "target_embedding_hash": self._embedding_fingerprint(target_se),
+            "active_reference_count": len(reference_paths),
+            "reference_audio_mode": "average_all_clips" if len(reference_paths) > 1 else "single_clip",
+            "openvoice_conversion_applied": True,
+        }
+        return results
+
+    def _melo_source_audio(self, model: Any, text: str, speaker_id: Any, speed: float, converter: Any) -> np.ndarray:
+        """Runs MeloTTS without an output file and resamples its array to the converter's rate."""
+        import librosa  # type: ignore
+
+        audio = np.asarray(model.tts_to_file(text, speaker_id, None, speed=speed), dtype=np.float32)
+        return librosa.resample(audio, orig_sr=int(model.hps.data.sampling_rate), target_sr=int(converter.hps.data.sampling_rate))
+
+    def _convert_batch(self, converter: Any, sources: list[np.ndarray], source_se: Any, target_se: Any, torch: Any) -> list[np.ndarray]:
+        """Mirrors ToneColorConverter.convert on in-memory arrays, padded into one batch with per-line length masks."""
+        from openvoice.mel_processing import spectrogram_torch  # type: ignore
+
+        data = converter.hps.data
+        padding = (data.filter_length - data.hop_length) // 2
+        frame_counts = [(len(audio) + 2 * padding - data.filter_length) // data.hop_length + 1 for audio in sources]
+        with torch.no_grad():
+            batch = torch.zeros(len(sources), max(len(audio) for audio in sources))
+            for row, audio in enumerate(sources):
+                batch[row, : len(audio)] = torch.from_numpy(audio)
+            batch = batch.to(converter.device)
+            spec = spectrogram_torch(batch, data.filter_length, data.sampling_rate, data.hop_length, data.win_length, center=False)
+            spec_lengths = torch.LongTensor(frame_counts).to(converter.device)
+            output = converter.model.voice_conversion(
+                spec,
+                spec_lengths,
+                sid_src=source_se.expand(len(sources), -1, -1),
+                sid_tgt=target_se.expand(len(sources), -1, -1),
+                tau=0.3,
+            )[0]
+            return [output[row, 0, : frames * data.hop_length].cpu().float().numpy() for row, frames in enumerate(frame_counts)]
+
 
 class ProviderRegistry:
     def __init__(self) -> None:
@@ -946,9 +1399,24 @@ class ProviderRegistry:
 
 
 class TTSOrchestrator:
+    # Shared across orchestrators so a provider's limit holds for every job in the worker process. Keyed by
+    # the limit too, so a changed TTS_PROVIDER_CONCURRENCY takes effect without a worker restart.
+    _provider_slots: dict[tuple[str, int], threading.BoundedSemaphore] = {}
+    _provider_slots_lock = threading.Lock()
+
     def __init__(self, registry: ProviderRegistry | None = None) -> None:
         self.registry = registry or ProviderRegistry()
 
+    @contextmanager
+    def _provider_slot(self, provider_name: str):
+        limit = provider_concurrency_limits().get(provider_name, max(settings.TTS_SYNTHESIS_WORKERS, 1))
+        with self._provider_slots_lock:
+            slot = self._provider_slots.get((provider_name, limit))
+            if slot is None:
+                slot = self._provider_slots[(provider_name, limit)] = threading.BoundedSemaphore(limit)
+        with slot:
+            yield
+
     def provider_capabilities(self) -> list[dict[str, Any]]:
         return [
             {
@@ -1052,18 +1520,50 @@ class TTSOrchestrator:
         )
         return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-    def _copy_cache_if_present(self, key: str, output_path: Path) -> bool:
-        cache_path = voice_cache_dir() / f"{key}.wav"
-        if cache_path.exists():
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(cache_path, output_path)
-            return True
-        return False
+    def _materialize_cached_audio(self, key: str, output_path: Path) -> dict[str, Any] | None:
+        return materialize_voice_cache_entry(key, output_path)
 
     def _save_to_cache(self, key: str, output_path: Path) -> None:
-        cache_path = voice_cache_dir() / f"{key}.wav"
-        if not cache_path.exists() and output_path.exists():
-            shutil.copy2(output_path, cache_path)
+        store_voice_cache_entry(key, output_path)
+
+    def _plan_batched_lines(
+        self, pending: list[dict[str, Any]], *, requested_provider: str | None, fallback_allowed: bool
+    ) -> list[tuple[str, list[dict[str, Any]]]]:
+        """Groups uncached lines for batch-capable providers per voice profile.
+
+        A batch only fills the voice cache; the per-line pass picks the audio up as cache hits, so provider
+        selection, fallback and segment metadata stay on the single-line path. Groups of one line are left
+        to that path.
+        """
+        state = self.provider_state()
+        groups: dict[tuple[str, int], list[dict[str, Any]]] = {}
+        for item in pending:
+            provider_name = self._selection_order(item["voice_profile"], requested_provider, fallback_allowed)[0]
+            provider = self.registry.get(provider_name)
+            if not provider or not getattr(provider, "batch_capable", False) or not (state.get(provider_name) or {}).get("available"):
+                continue
+            cache_key = self._voice_cache_key(provider_name, item["text"], item["voice_profile"], provider)
+            if has_voice_cache_entry(cache_key):
+                continue
+            groups.setdefault((provider_name, id(item["voice_profile"])), []).append({**item, "cache_key": cache_key})
+        return [(provider_name, items) for (provider_name, _profile), items in groups.items() if len(items) >= 2]
+
+    def _synthesize_batch(self, provider_name: str, items: list[dict[str, Any]]) -> None:
+        """Synthesises one planned batch into the voice cache; a failed batch is logged and its lines retried one at a time."""
+        batch_items = [
+            {"text": item["text"], "output_path": item["output_path"].with_name(f"{item['output_path'].stem}_batch.wav")}
+            for item in items
+        ]
+        try:
+            with self._provider_slot(provider_name):
+                self.registry.get(provider_name).synthesize_batch(batch_items, items[0]["voice_profile"])
+        except TTSProviderError as exc:
+            logger.warning("tts.batch provider=%s lines=%s failed=%s; synthesising per line", provider_name, len(items), exc.code)
+            return
+        for item, batch_item in zip(items, batch_items):
+            self._save_to_cache(item["cache_key"], batch_item["output_path"])
+            batch_item["output_path"].unlink(missing_ok=True)
+        logger.info("tts.batch provider=%s profile=%s lines=%s", provider_name, items[0]["voice_profile"].get("id"), len(items))
 
     def synthesize_line(
         self,
@@ -1109,9 +1609,9 @@ class TTSOrchestrator:
                 )
                 continue
             cache_key = self._voice_cache_key(provider_name, text, voice_profile, provider)
-            cache_hit = self._copy_cache_if_present(cache_key, output_path)
-            if cache_hit:
-                duration_seconds = _audio_stats(output_path)["duration_seconds"]
+            cache_entry = self._materialize_cached_audio(cache_key, output_path)
+            if cache_entry:
+                duration_seconds = cache_entry["duration_seconds"]
                 if provider_name == "openvoice" and hasattr(provider, "_applied_controls"):
                     controls_applied = provider._applied_controls(voice_profile)  # type: ignore[attr-defined]
                 else:
@@ -1159,7 +1659,8 @@ class TTSOrchestrator:
                     provider_name,
                     fallback_allowed,
                 )
-                result = provider.synthesize_line(text=text, voice_profile=voice_profile, output_path=output_path, options=options)
+                with self._provider_slot(provider_name):
+                    result = provider.synthesize_line(text=text, voice_profile=voice_profile, output_path=output_path, options=options)
                 self._save_to_cache(cache_key, output_path)
                 return SynthesisResult(
                     audio_path=result["audio_path"],
@@ -1172,8 +1673,11 @@ class TTSOrchestrator:
                     provider_state=state,
                     cache_hit=False,
                     voice_profile_id=str(voice_profile.get("id") or ""),
+                    pcm=result.get("pcm"),
                 )
             except TTSProviderError as exc:
+                # The provider may have just gone away (server down, models removed); re-probe next time.
+                provider_health_cache.invalidate_for_error(provider_name, exc)
                 last_error = exc
                 fallback_attempted = fallback_attempted or index > 0 or index + 1 < len(selection_order)
                 provider_failures[provider_name] = {
@@ -1222,49 +1726,111 @@ class TTSOrchestrator:
         requested_provider: str | None = None,
         fallback_allowed: bool = True,
         options: dict[str, Any] | None = None,
+        max_workers: int | None = None,
     ) -> list[SpeechSegment]:
+        return list(
+            self.iter_dialogue(
+                lines=lines,
+                voice_profile_map=voice_profile_map,
+                output_dir=output_dir,
+                requested_provider=requested_provider,
+                fallback_allowed=fallback_allowed,
+                options=options,
+                max_workers=max_workers,
+            )
+        )
+
+    def iter_dialogue(
+        self,
+        *,
+        lines: list[dict[str, Any]],
+        voice_profile_map: dict[str, dict[str, Any]],
+        output_dir: Path,
+        requested_provider: str | None = None,
+        fallback_allowed: bool = True,
+        options: dict[str, Any] | None = None,
+        max_workers: int | None = None,
+    ) -> Iterator[SpeechSegment]:
+        """Yields segments in script order as soon as each line and every line before it is synthesised."""
         output_dir.mkdir(parents=True, exist_ok=True)
-        segments: list[SpeechSegment] = []
         slot_map: dict[str, int] = {}
+        pending: list[dict[str, Any]] = []
         for index, line in enumerate(lines):
             speaker = str(line.get("speaker") or f"Speaker {index + 1}").strip()
             text = str(line.get("text") or "").strip()
             if not text:
                 continue
-            slot_index = slot_map.setdefault(speaker, len(slot_map))
-            voice_profile = voice_profile_map[speaker]
-            output_path = output_dir / f"{index:03d}_{_slugify(speaker)}_{uuid.uuid4().hex}.wav"
-            result = self.synthesize_line(
-                text=text,
-                voice_profile=voice_profile,
-                output_path=output_path,
-                requested_provider=requested_provider,
-                fallback_allowed=fallback_allowed,
-                options=options,
-            )
-            segments.append(
-                SpeechSegment(
-                    speaker=speaker,
-                    text=text,
-                    voice=result.voice,
-                    slot_index=slot_index,
-                    audio_path=result.audio_path,
-                    duration_seconds=result.duration_seconds,
-                    voice_profile_id=result.voice_profile_id,
-                    provider_used=result.provider_used,
-                    fallback_used=result.fallback_used,
-                    controls_applied=result.controls_applied,
-                    reference_audio_count=result.reference_audio_count,
-                )
+            pending.append(
+                {
+                    "speaker": speaker,
+                    "text": text,
+                    "slot_index": slot_map.setdefault(speaker, len(slot_map)),
+                    "voice_profile": voice_profile_map[speaker],
+                    "output_path": output_dir / f"{index:03d}_{_slugify(speaker)}_{uuid.uuid4().hex}.wav",
+                }
             )
-        if not segments:
+        if not pending:
             raise TTSProviderError(
                 code="no_spoken_lines",
                 message="Cannot render a dialogue video without spoken lines.",
                 provider_state=self.provider_state(),
                 suggested_action="Add at least one spoken script line before rendering.",
             )
-        return segments
+        batches = self._plan_batched_lines(pending, requested_provider=requested_provider, fallback_allowed=fallback_allowed)
+        # Batches run in the background so lines outside them, and earlier batches, are yielded without waiting on later ones.
+        batch_executor = ThreadPoolExecutor(max_workers=len(batches), thread_name_prefix="tts-batch") if batches else None
+        batch_futures: dict[Path, Future] = {}
+        for provider_name, items in batches:
+            future = batch_executor.submit(self._synthesize_batch, provider_name, items)
+            for item in items:
+                batch_futures[item["output_path"]] = future
+
+        def synthesize(item: dict[str, Any]) -> SpeechSegment:
+            batch = batch_futures.get(item["output_path"])
+            if batch is not None:
+                batch.result()
+            result = self.synthesize_line(
+                text=item["text"],
+                voice_profile=item["voice_profile"],
+                output_path=item["output_path"],
+                requested_provider=requested_provider,
+                fallback_allowed=fallback_allowed,
+                options=options,
+            )
+            return SpeechSegment(
+                speaker=item["speaker"],
+                text=item["text"],
+                voice=result.voice,
+                slot_index=item["slot_index"],
+                audio_path=result.audio_path,
+                duration_seconds=result.duration_seconds,
+                voice_profile_id=result.voice_profile_id,
+                provider_used=result.provider_used,
+                fallback_used=result.fallback_used,
+                controls_applied=result.controls_applied,
+                reference_audio_count=result.reference_audio_count,
+                pcm=result.pcm,
+            )
+
+        workers = min(max(settings.TTS_SYNTHESIS_WORKERS if max_workers is None else max_workers, 1), len(pending))
+        try:
+            if workers <= 1:
+                for item in pending:
+                    yield synthesize(item)
+                return
+
+            logger.info("tts.dialogue lines=%s workers=%s", len(pending), workers)
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-line")
+            try:
+                futures = [executor.submit(synthesize, item) for item in pending]
+                # Waiting in submission order keeps segment order and re-raises the first failing line in script order.
+                for future in futures:
+                    yield future.result()
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+        finally:
+            if batch_executor is not None:
+                batch_executor.shutdown(wait=True, cancel_futures=True)
 
 
 class LocalSpeechService:
@@ -1367,7 +1933,7 @@ class LocalSpeechService:
                             "sha256": item.sha256,
                             "mime_type": item.mime_type,
                         }
-                        for item in profile.reference_audios
+                        for item in ready_reference_audios(profile)
                     ],
                     "language": profile.language,
                     "model_id": profile.model_id,
@@ -1386,7 +1952,7 @@ class LocalSpeechService:
             },
         )
 
-    def synthesize_dialogue(self, parsed_lines: list[dict[str, Any]], work_dir: Path) -> list[SpeechSegment]:
+    def _voice_profile_map(self, parsed_lines: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
         voice_profile_map: dict[str, dict[str, Any]] = {}
         slot_map: dict[str, int] = {}
         for index, line in enumerate(parsed_lines):
@@ -1395,6 +1961,25 @@ class LocalSpeechService:
                 continue
             slot_index = slot_map.setdefault(speaker, len(slot_map))
             voice_profile_map[speaker] = self._resolved_profile_for_speaker(speaker, slot_index)
+        return voice_profile_map
+
+    def voice_cache_keys(self, parsed_lines: list[dict[str, Any]]) -> list[str]:
+        voice_profile_map = self._voice_profile_map(parsed_lines)
+        keys: list[str] = []
+        for index, line in enumerate(parsed_lines):
+            speaker = str(line.get("speaker") or f"Speaker {index + 1}").strip()
+            text = str(line.get("text") or "").strip()
+            if not text:
+                continue
+            voice_profile = voice_profile_map[speaker]
+            selection = self.orchestrator.resolve_provider_selection(voice_profile, fallback_allowed=True)
+            provider_name = selection["selected_provider"] or "espeak"
+            provider = self.orchestrator.registry.get(provider_name)
+            keys.append(self.orchestrator._voice_cache_key(provider_name, text, voice_profile, provider))
+        return keys
+
+    def synthesize_dialogue(self, parsed_lines: list[dict[str, Any]], work_dir: Path) -> list[SpeechSegment]:
+        voice_profile_map = self._voice_profile_map(parsed_lines)
         return self.orchestrator.synthesize_dialogue(
             lines=parsed_lines,
             voice_profile_map=voice_profile_map,
@@ -1402,9 +1987,19 @@ class LocalSpeechService:
             fallback_allowed=True,
         )
 
-    def build_audio_clip(self, audio_path: str):
-        from moviepy import AudioArrayClip
+    def iter_dialogue(self, parsed_lines: list[dict[str, Any]], work_dir: Path) -> Iterator[SpeechSegment]:
+        voice_profile_map = self._voice_profile_map(parsed_lines)
+        return self.orchestrator.iter_dialogue(
+            lines=parsed_lines,
+            voice_profile_map=voice_profile_map,
+            output_dir=work_dir,
+            fallback_allowed=True,
+        )
 
+    def _read_samples(self, audio_path: str, pcm: PcmAudio | None = None) -> tuple[np.ndarray, int, int]:
+        if pcm is not None and pcm.samples.size:
+            # Interleaved view of the provider's buffer; nothing is decoded or copied.
+            return pcm.samples.reshape(-1), pcm.sample_rate, pcm.channels
         with wave.open(audio_path, "rb") as handle:
             frame_rate = handle.getframerate()
             channels = handle.getnchannels()
@@ -1417,25 +2012,61 @@ class LocalSpeechService:
                 message=f"Synthesized speech file is empty: {audio_path}",
                 suggested_action="Retry the preview or check the provider logs.",
             )
+        return samples, frame_rate, channels
+
+    def _channel_count(self, audio_path: str, pcm: PcmAudio | None = None) -> int:
+        if pcm is not None and pcm.samples.size:
+            return pcm.channels
+        with wave.open(audio_path, "rb") as handle:
+            return handle.getnchannels()
+
+    def _normalization_gain(self, samples: np.ndarray) -> float:
         peak = float(np.max(np.abs(samples)))
-        if peak > 0:
-            samples = samples * min(0.92 / peak, 1.35)
-        if channels > 1:
-            samples = samples.reshape((-1, channels))
-        else:
-            samples = samples.reshape((-1, 1))
-        return AudioArrayClip(samples, fps=frame_rate)
-
-
-def _audio_stats(audio_path: Path) -> dict[str, float | int]:
-    with wave.open(str(audio_path), "rb") as handle:
-        frame_rate = handle.getframerate()
-        frame_count = handle.getnframes()
-        channels = handle.getnchannels()
-    duration_seconds = float(frame_count / frame_rate) if frame_rate else 0.0
-    return {
-        "sample_rate": frame_rate,
-        "frame_count": frame_count,
-        "channels": channels,
-        "duration_seconds": duration_seconds,
-    }
+        return min(0.92 / peak, 1.35) if peak > 0 else 1.0
+
+    def measure_audio(self, audio_path: str, pcm: PcmAudio | None = None) -> dict[str, float]:
+        samples, frame_rate, channels = self._read_samples(audio_path, pcm)
+        frame_count = samples.size / max(channels, 1)
+        return {
+            "duration_seconds": float(frame_count / frame_rate) if frame_rate else 0.0,
+            "gain": self._normalization_gain(samples),
+        }
+
+    def write_dialogue_track(
+        self,
+        placements: list[dict[str, Any]],
+        output_path: Path,
+        sample_rate: int,
+        *,
+        block_frames: int = 1 << 16,
+    ) -> Path:
+        """Mixes every line into one PCM track at `sample_rate`, ready for the encoder to mux as-is.
+
+        `placements` carry `audio_path`, optional `pcm`, `gain` and the slot `duration_seconds` on the
+        timeline. Lines are read, resampled into their slot, gain-scaled and written one at a time, so only
+        a single line's audio is held in memory however long the dialogue runs.
+        """
+        channels = max((self._channel_count(item["audio_path"], item.get("pcm")) for item in placements), default=1)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with wave.open(str(output_path), "wb") as handle:
+            handle.setnchannels(channels)
+            handle.setsampwidth(2)
+            handle.setframerate(sample_rate)
+            for item in placements:
+                samples, frame_rate, source_channels = self._read_samples(item["audio_path"], item.get("pcm"))
+                samples = samples.reshape((-1, source_channels))
+                frames = int(round(float(item["duration_seconds"]) * sample_rate))
+                if frame_rate != sample_rate:
+                    samples = _resample(samples, frame_rate, sample_rate, frames)
+                slot = np.zeros((frames, channels), dtype=np.float32)
+                used = min(frames, samples.shape[0])
+                slot[:used, :source_channels] = samples[:used]
+                if source_channels == 1 and channels > 1:
+                    slot[:used, 1:] = slot[:used, :1]
+                gain = item.get("gain")
+                np.multiply(slot[:used], self._normalization_gain(slot[:used]) if gain is None else gain, out=slot[:used])
+                np.clip(slot, -1.0, 1.0, out=slot)
+                for start in range(0, frames, block_frames):
+                    handle.writeframes((slot[start : start + block_frames] * 32767.0).astype("<i2").tobytes())
+        return output_path
+
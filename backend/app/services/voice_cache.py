@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+import wave
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.services.voice_profiles import voice_cache_dir
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    size_bytes INTEGER NOT NULL,
+    duration_seconds REAL NOT NULL,
+    created_at REAL NOT NULL,
+    last_access_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_entries_last_access_at ON entries (last_access_at);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+"""
+COUNTER_NAMES = ("hits", "misses", "bytes_served", "bytes_stored", "evictions", "bytes_evicted")
+
+_schema_lock = threading.Lock()
+_initialised_indexes: set[str] = set()
+
+
+def voice_cache_index_path() -> Path:
+    return voice_cache_dir() / "index.sqlite3"
+
+
+def _entry_path(key: str) -> Path:
+    return voice_cache_dir() / f"{key}.wav"
+
+
+def _connect() -> sqlite3.Connection:
+    index_path = voice_cache_index_path()
+    connection = sqlite3.connect(index_path, timeout=30, isolation_level=None)
+    with _schema_lock:
+        if str(index_path) not in _initialised_indexes or not index_path.stat().st_size:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            _initialised_indexes.add(str(index_path))
+    return connection
+
+
+def _bump(connection: sqlite3.Connection, **deltas: int) -> None:
+    connection.executemany(
+        "INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+        [(name, value) for name, value in deltas.items() if value],
+    )
+
+
+def _wav_duration(path: Path) -> float:
+    try:
+        with wave.open(str(path), "rb") as handle:
+            return handle.getnframes() / handle.getframerate() if handle.getframerate() else 0.0
+    except (wave.Error, EOFError):
+        return 0.0
+
+
+def _link_or_copy(source: Path, destination: Path) -> None:
+    """Materialises `source` at `destination` as a hardlink, copying only across filesystems."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def has_voice_cache_entry(key: str) -> bool:
+    return _entry_path(key).exists()
+
+
+def materialize_voice_cache_entry(key: str, output_path: Path) -> dict[str, Any] | None:
+    """Links the cached audio for `key` to `output_path` and returns its indexed size and duration.
+
+    Cache files are never written in place; eviction only unlinks them, so a hardlinked render copy
+    stays valid after its cache entry is dropped.
+    """
+    cache_path = _entry_path(key)
+    now = time.time()
+    with closing(_connect()) as connection:
+        row = connection.execute("SELECT size_bytes, duration_seconds FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None and cache_path.exists():
+            # Adopt entries written before the index existed.
+            row = (cache_path.stat().st_size, _wav_duration(cache_path))
+            connection.execute(
+                "INSERT OR IGNORE INTO entries (key, size_bytes, duration_seconds, created_at, last_access_at) VALUES (?, ?, ?, ?, ?)",
+                (key, row[0], row[1], now, now),
+            )
+        if row is None:
+            _bump(connection, misses=1)
+            return None
+        try:
+            _link_or_copy(cache_path, output_path)
+        except FileNotFoundError:
+            connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            _bump(connection, misses=1)
+            return None
+        connection.execute("UPDATE entries SET last_access_at = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        _bump(connection, hits=1, bytes_served=int(row[0]))
+    return {"size_bytes": int(row[0]), "duration_seconds": float(row[1])}
+
+
+def store_voice_cache_entry(key: str, source_path: Path, *, duration_seconds: float | None = None) -> None:
+    cache_path = _entry_path(key)
+    if not source_path.exists():
+        return
+    if not cache_path.exists():
+        temp_path = cache_path.with_name(f"{key}.{uuid.uuid4().hex}.tmp")
+        _link_or_copy(source_path, temp_path)
+        os.replace(temp_path, cache_path)
+    size_bytes = cache_path.stat().st_size
+    now = time.time()
+    with closing(_connect()) as connection:
+        inserted = connection.execute(
+            "INSERT OR IGNORE INTO entries (key, size_bytes, duration_seconds, created_at, last_access_at) VALUES (?, ?, ?, ?, ?)",
+            (key, size_bytes, _wav_duration(cache_path) if duration_seconds is None else duration_seconds, now, now),
+        ).rowcount
+        if inserted:
+            _bump(connection, bytes_stored=size_bytes)
+
+
+def evict_voice_cache(*, max_bytes: int | None = None, ttl_seconds: int | None = None) -> list[str]:
+    """Drops entries idle for longer than the TTL, then least-recently-used entries over the byte budget."""
+    budget = settings.VOICE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    ttl = settings.VOICE_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    cutoff = time.time() - ttl if ttl else None
+    evicted: list[tuple[str, int]] = []
+    with closing(_connect()) as connection:
+        rows = connection.execute("SELECT key, size_bytes, last_access_at FROM entries ORDER BY last_access_at").fetchall()
+        total = sum(row[1] for row in rows)
+        for key, size_bytes, last_access_at in rows:
+            if total <= budget and (cutoff is None or last_access_at >= cutoff):
+                break
+            _entry_path(key).unlink(missing_ok=True)
+            total -= size_bytes
+            evicted.append((key, size_bytes))
+        if evicted:
+            connection.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in evicted])
+            _bump(connection, evictions=len(evicted), bytes_evicted=sum(size for _, size in evicted))
+    if evicted:
+        logger.info("Evicted %s voice cache entries; %s bytes remain", len(evicted), total)
+    return [key for key, _ in evicted]
+
+
+def voice_cache_stats() -> dict[str, Any]:
+    with closing(_connect()) as connection:
+        counters = dict(connection.execute("SELECT name, value FROM counters").fetchall())
+        entries, total_bytes = connection.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()
+    stats = {name: int(counters.get(name, 0)) for name in COUNTER_NAMES}
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        **stats,
+        "entries": int(entries),
+        "total_bytes": int(total_bytes),
+        "max_bytes": settings.VOICE_CACHE_MAX_BYTES,
+        "ttl_seconds": settings.VOICE_CACHE_TTL_SECONDS,
+        "hit_rate": round(stats["hits"] / lookups, 4) if lookups else None,
+    }
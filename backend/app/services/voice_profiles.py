@@ -3,14 +3,15 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
-import re
 import shutil
+import struct
 import subprocess
 import uuid
 import wave
 from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Iterator
+from typing import TYPE_CHECKING, Any, Iterator
 
 from fastapi import HTTPException, UploadFile, status
 from sqlalchemy.orm import Session, joinedload
@@ -18,12 +19,18 @@ from sqlalchemy.orm import Session, joinedload
 from app.core.config import settings
 from app.db import SessionLocal
 from app.models import CharacterPreset, Project, ProjectSpeakerBinding, VoiceProfile, VoiceReferenceAudio
+from app.services.storage import UPLOAD_CHUNK_BYTES, content_sha256
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_SAMPLE_TEXT = "Hey, welcome back. Today we're testing a new character voice."
 REFERENCE_AUDIO_SAMPLE_RATE = 16000
 REFERENCE_AUDIO_MIN_DURATION_MS = 1200
+# The processing task's hard time limit is ten minutes; anything older lost its worker or its message.
+STALE_REFERENCE_AUDIO_MINUTES = 15
 REFERENCE_AUDIO_SILENCE_FILTER = (
     "silenceremove="
     "start_periods=1:start_silence=0.25:start_threshold=-45dB"
@@ -195,10 +202,17 @@ def _serialize_reference_audio(item: VoiceReferenceAudio) -> dict[str, Any]:
         "sha256": item.sha256,
         "authorization_confirmed": item.authorization_confirmed,
         "authorization_note": item.authorization_note,
+        "status": item.status,
+        "error": item.error_json,
         "created_at": item.created_at,
     }
 
 
+def ready_reference_audios(profile: VoiceProfile) -> list[VoiceReferenceAudio]:
+    """Reference clips that finished processing; uploads still being normalized never feed embeddings."""
+    return [item for item in profile.reference_audios or [] if item.status == "ready"]
+
+
 def _reference_audio_mode(reference_count: int) -> str:
     if reference_count > 1:
         return "average_all_clips"
@@ -238,7 +252,7 @@ def _active_processed_reference_payload(metadata: dict[str, Any], reference_audi
 
 def _voice_profile_provider_metadata(profile: VoiceProfile) -> dict[str, Any]:
     metadata = dict(profile.provider_metadata_json or {})
-    reference_audios = list(profile.reference_audios or [])
+    reference_audios = ready_reference_audios(profile)
     active_reference_ids = [item.id for item in reference_audios]
     reference_paths = [Path(item.storage_path) for item in reference_audios if item.storage_path]
     processed_payload = _active_processed_reference_payload(metadata, reference_audios)
@@ -349,7 +363,7 @@ def runtime_voice_profile_payload(profile: VoiceProfile, display_name: str) -> d
                 "sha256": item.sha256,
                 "mime_type": item.mime_type,
             }
-            for item in profile.reference_audios
+            for item in ready_reference_audios(profile)
         ],
         "language": profile.language,
         "model_id": profile.model_id,
@@ -411,8 +425,14 @@ def voice_embedding_artifact_path_for_reference(profile_id: str, reference_audio
     return voice_embedding_dir() / f"{profile_id}_{reference_audio_sha256[:16]}.pth"
 
 
+def voice_chunk_embedding_path(chunk_key: str) -> Path:
+    path = voice_embedding_dir() / "chunks"
+    path.mkdir(parents=True, exist_ok=True)
+    return path / f"{chunk_key}.pth"
+
+
 def reference_audio_content_hash_from_paths(reference_paths: list[Path]) -> str:
-    digests = sorted(_sha256_path(path) for path in reference_paths)
+    digests = sorted(content_sha256(path) for path in reference_paths)
     return hashlib.sha256("||".join(digests).encode("utf-8")).hexdigest()
 
 
@@ -433,15 +453,23 @@ def update_voice_profile_preparation_metadata(
     return profile
 
 
+def voice_embedding_aggregate_path(profile_id: str) -> Path:
+    return voice_embedding_dir() / f"{profile_id}.aggregate.pth"
+
+
 def invalidate_voice_profile_embedding(profile: VoiceProfile, db: Session) -> None:
+    """Drops the profile's averaged target embedding after its reference set changed.
+
+    Per-chunk WAVs and embeddings stay, as does the running (count, sum) aggregate: the next
+    prepare folds in only the chunks that were added or removed.
+    """
     paths_to_remove: set[Path] = set()
     if profile.embedding_path:
         paths_to_remove.add(Path(profile.embedding_path))
     paths_to_remove.add(voice_embedding_artifact_path(profile.id))
-    paths_to_remove.update(path for path in voice_embedding_dir().glob("*.pth") if path.name.startswith(f"{profile.id}_"))
+    paths_to_remove.update(path for path in voice_embedding_dir().glob(f"{profile.id}_*.pth"))
     for path in paths_to_remove:
         path.unlink(missing_ok=True)
-    shutil.rmtree(voice_reference_chunk_dir(profile.id), ignore_errors=True)
     profile.embedding_path = None
     next_metadata = dict(profile.provider_metadata_json or {})
     next_metadata.update(
@@ -457,31 +485,69 @@ def invalidate_voice_profile_embedding(profile: VoiceProfile, db: Session) -> No
     db.flush()
 
 
+class ReferenceAudioError(RuntimeError):
+    """A reference clip the worker cannot use; it is recorded on the clip rather than raised to a client."""
+
+    def __init__(self, message: str, *, code: str = "reference_audio_invalid") -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
 def _ffmpeg_binary() -> str | None:
     return shutil.which("ffmpeg")
 
 
-def _normalize_reference_audio_upload(content: bytes, filename: str) -> tuple[Path, int]:
+def _write_reference_wav(path: Path, samples: np.ndarray) -> tuple[str, int]:
+    """Writes mono 16-bit PCM as WAV and returns its sha256 and size without reading the file back."""
+    import numpy as np
+
+    data = memoryview(np.ascontiguousarray(samples, dtype="<i2")).cast("B")
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data.nbytes,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        1,
+        REFERENCE_AUDIO_SAMPLE_RATE,
+        REFERENCE_AUDIO_SAMPLE_RATE * 2,
+        2,
+        16,
+        b"data",
+        data.nbytes,
+    )
+    digest = hashlib.sha256(header)
+    digest.update(data)
+    with path.open("wb") as handle:
+        handle.write(header)
+        handle.write(data)
+    return digest.hexdigest(), len(header) + data.nbytes
+
+
+def _normalize_reference_audio_upload(source_path: Path, *, source_sha256: str) -> tuple[Path, np.ndarray, str]:
+    """Decodes the streamed upload once into normalized mono 16 kHz PCM and removes the upload.
+
+    Returns the normalized WAV path, its samples and its sha256; speech detection and chunking work on
+    the samples, so this is the only ffmpeg run a reference clip needs.
+    """
     ffmpeg_binary = _ffmpeg_binary()
     if not ffmpeg_binary:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Reference audio normalization is unavailable because ffmpeg is not installed.",
+        source_path.unlink(missing_ok=True)
+        raise ReferenceAudioError(
+            "Reference audio normalization is unavailable because ffmpeg is not installed.",
+            code="reference_audio_normalization_unavailable",
         )
 
-    source_suffix = Path(filename).suffix or ".bin"
-    source_path = voice_reference_audio_dir() / f"{uuid.uuid4().hex}_raw{source_suffix}"
-    output_path = voice_reference_audio_dir() / f"{uuid.uuid4().hex}.wav"
-    source_path.write_bytes(content)
     source_size_bytes = source_path.stat().st_size
-    source_sha256 = _sha256_path(source_path)
     source_duration_ms = _audio_duration_ms(source_path)
     command = [
         ffmpeg_binary,
         "-hide_banner",
         "-loglevel",
         "error",
-        "-y",
         "-i",
         str(source_path),
         "-vn",
@@ -491,106 +557,73 @@ def _normalize_reference_audio_upload(content: bytes, filename: str) -> tuple[Pa
         "1",
         "-ar",
         str(REFERENCE_AUDIO_SAMPLE_RATE),
-        "-sample_fmt",
-        "s16",
         "-af",
         REFERENCE_AUDIO_NORMALIZATION_FILTER,
-        str(output_path),
+        "-f",
+        "s16le",
+        "-",
     ]
     try:
-        subprocess.run(command, check=True, capture_output=True, text=True)
+        result = subprocess.run(command, check=True, capture_output=True)
     except subprocess.CalledProcessError as exc:
-        output_path.unlink(missing_ok=True)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Reference audio could not be decoded or normalized: {exc.stderr.strip() or 'unknown ffmpeg error'}",
-        ) from exc
+        stderr = (exc.stderr or b"").decode("utf-8", "replace").strip()
+        raise ReferenceAudioError(f"Reference audio could not be decoded or normalized: {stderr or 'unknown ffmpeg error'}") from exc
     finally:
         source_path.unlink(missing_ok=True)
 
-    duration_ms = _audio_duration_ms(output_path)
-    if duration_ms is None:
-        output_path.unlink(missing_ok=True)
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Reference audio could not be decoded after normalization")
+    import numpy as np
+
+    samples = np.frombuffer(result.stdout or b"", dtype="<i2")
+    duration_ms = samples.size * 1000 // REFERENCE_AUDIO_SAMPLE_RATE
+    if not samples.size:
+        raise ReferenceAudioError("Reference audio could not be decoded after normalization")
     if duration_ms < REFERENCE_AUDIO_MIN_DURATION_MS:
-        output_path.unlink(missing_ok=True)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Reference audio must contain at least {REFERENCE_AUDIO_MIN_DURATION_MS / 1000:.1f} seconds of usable speech after trimming silence.",
+        raise ReferenceAudioError(
+            f"Reference audio must contain at least {REFERENCE_AUDIO_MIN_DURATION_MS / 1000:.1f} seconds of usable speech after trimming silence."
         )
+    output_path = voice_reference_audio_dir() / f"{uuid.uuid4().hex}.wav"
+    normalized_sha256, normalized_size_bytes = _write_reference_wav(output_path, samples)
     logger.info(
         "voice.reference_audio.normalized metadata=%s",
         {
             "reference_audio_path": str(source_path),
             "normalized_reference_path": str(output_path),
             "reference_audio_sha256": source_sha256,
-            "normalized_reference_sha256": _sha256_path(output_path),
+            "normalized_reference_sha256": normalized_sha256,
             "duration_before_seconds": round(source_duration_ms / 1000, 3) if source_duration_ms is not None else None,
             "normalized_audio_duration_seconds": round(duration_ms / 1000, 3),
             "input_file_size_bytes": source_size_bytes,
-            "normalized_file_size_bytes": output_path.stat().st_size,
+            "normalized_file_size_bytes": normalized_size_bytes,
             "ffmpeg_filter": REFERENCE_AUDIO_NORMALIZATION_FILTER,
         },
     )
-    return output_path, duration_ms
-
+    return output_path, samples, normalized_sha256
 
-def _parse_silencedetect_windows(stderr: str, duration_seconds: float) -> list[dict[str, float]]:
-    silence_events: list[tuple[str, float]] = []
-    for line in stderr.splitlines():
-        start_match = re.search(r"silence_start:\s*([0-9.]+)", line)
-        if start_match:
-            silence_events.append(("start", float(start_match.group(1))))
-            continue
-        end_match = re.search(r"silence_end:\s*([0-9.]+)", line)
-        if end_match:
-            silence_events.append(("end", float(end_match.group(1))))
-
-    windows: list[dict[str, float]] = []
-    speech_start = 0.0
-    in_silence = False
-    for event, timestamp in silence_events:
-        timestamp = max(0.0, min(float(timestamp), duration_seconds))
-        if event == "start" and not in_silence:
-            if timestamp > speech_start:
-                windows.append({"start_seconds": speech_start, "end_seconds": timestamp, "duration_seconds": timestamp - speech_start})
-            in_silence = True
-        elif event == "end" and in_silence:
-            speech_start = timestamp
-            in_silence = False
-    if not in_silence and speech_start < duration_seconds:
-        windows.append({"start_seconds": speech_start, "end_seconds": duration_seconds, "duration_seconds": duration_seconds - speech_start})
-    if not windows and duration_seconds > 0:
-        windows.append({"start_seconds": 0.0, "end_seconds": duration_seconds, "duration_seconds": duration_seconds})
-    return windows
 
+def _detect_reference_speech_windows(samples: np.ndarray) -> list[dict[str, float]]:
+    """Speech windows of the normalized clip from the built-in VAD; the whole clip when none is found."""
+    from app.services.speech_activity import parse_threshold_db, speech_segments
 
-def _detect_reference_speech_windows(path: Path, duration_ms: int) -> list[dict[str, float]]:
-    ffmpeg_binary = _ffmpeg_binary()
-    duration_seconds = max(duration_ms / 1000, 0.0)
-    if not ffmpeg_binary or duration_seconds <= 0:
+    duration_seconds = samples.size / REFERENCE_AUDIO_SAMPLE_RATE
+    if not samples.size:
         return []
-    command = [
-        ffmpeg_binary,
-        "-hide_banner",
-        "-nostats",
-        "-i",
-        str(path),
-        "-af",
-        f"silencedetect=n={settings.VOICE_LAB_REFERENCE_SILENCE_THRESHOLD_DB}:d={settings.VOICE_LAB_REFERENCE_SILENCE_MIN_SECONDS}",
-        "-f",
-        "null",
-        "-",
+    segments = speech_segments(
+        samples,
+        REFERENCE_AUDIO_SAMPLE_RATE,
+        threshold_db=parse_threshold_db(settings.VOICE_LAB_REFERENCE_SILENCE_THRESHOLD_DB),
+        min_silence_seconds=settings.VOICE_LAB_REFERENCE_SILENCE_MIN_SECONDS,
+    )
+    windows = [
+        {
+            "start_seconds": round(start / REFERENCE_AUDIO_SAMPLE_RATE, 3),
+            "end_seconds": round(end / REFERENCE_AUDIO_SAMPLE_RATE, 3),
+            "duration_seconds": round((end - start) / REFERENCE_AUDIO_SAMPLE_RATE, 3),
+        }
+        for start, end in segments.tolist()
     ]
-    try:
-        result = subprocess.run(command, check=True, capture_output=True, text=True)
-    except subprocess.CalledProcessError as exc:
-        logger.warning(
-            "voice.reference_audio.silencedetect_failed metadata=%s",
-            {"normalized_reference_path": str(path), "error": exc.stderr.strip() if exc.stderr else str(exc)},
-        )
-        return [{"start_seconds": 0.0, "end_seconds": duration_seconds, "duration_seconds": duration_seconds}]
-    return _parse_silencedetect_windows(getattr(result, "stderr", "") or "", duration_seconds)
+    if not windows:
+        windows.append({"start_seconds": 0.0, "end_seconds": round(duration_seconds, 3), "duration_seconds": round(duration_seconds, 3)})
+    return windows
 
 
 def _select_reference_chunks(speech_windows: list[dict[str, float]], duration_ms: int) -> list[dict[str, float]]:
@@ -638,75 +671,47 @@ def _select_reference_chunks(speech_windows: list[dict[str, float]], duration_ms
     return sorted(selected, key=lambda item: item["start_seconds"])
 
 
-def _extract_reference_chunks(path: Path, voice_profile_id: str, reference_audio_id: int, selected_chunks: list[dict[str, float]]) -> list[dict[str, Any]]:
-    ffmpeg_binary = _ffmpeg_binary()
-    if not ffmpeg_binary:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Reference audio chunking is unavailable because ffmpeg is not installed.",
-        )
+def _extract_reference_chunks(samples: np.ndarray, voice_profile_id: str, reference_audio_id: int, selected_chunks: list[dict[str, float]]) -> list[dict[str, Any]]:
     chunk_dir = voice_reference_chunk_dir(voice_profile_id)
     chunks: list[dict[str, Any]] = []
     for index, chunk in enumerate(selected_chunks):
-        output_path = chunk_dir / f"ref_{reference_audio_id}_{index:03d}_{uuid.uuid4().hex[:8]}.wav"
-        command = [
-            ffmpeg_binary,
-            "-hide_banner",
-            "-loglevel",
-            "error",
-            "-y",
-            "-ss",
-            f"{chunk['start_seconds']:.3f}",
-            "-t",
-            f"{chunk['duration_seconds']:.3f}",
-            "-i",
-            str(path),
-            "-vn",
-            "-map_metadata",
-            "-1",
-            "-ac",
-            "1",
-            "-ar",
-            str(REFERENCE_AUDIO_SAMPLE_RATE),
-            "-sample_fmt",
-            "s16",
-            str(output_path),
-        ]
-        try:
-            subprocess.run(command, check=True, capture_output=True, text=True)
-        except subprocess.CalledProcessError as exc:
-            output_path.unlink(missing_ok=True)
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Reference audio chunk could not be extracted: {exc.stderr.strip() or 'unknown ffmpeg error'}",
-            ) from exc
-        duration_ms = _audio_duration_ms(output_path)
-        if not duration_ms:
-            output_path.unlink(missing_ok=True)
+        start = round(chunk["start_seconds"] * REFERENCE_AUDIO_SAMPLE_RATE)
+        stop = min(start + round(chunk["duration_seconds"] * REFERENCE_AUDIO_SAMPLE_RATE), samples.size)
+        if stop <= start:
             continue
+        output_path = chunk_dir / f"ref_{reference_audio_id}_{index:03d}_{uuid.uuid4().hex[:8]}.wav"
+        sha256, size_bytes = _write_reference_wav(output_path, samples[start:stop])
         chunks.append(
             {
                 "path": str(output_path),
-                "sha256": _sha256_path(output_path),
+                "sha256": sha256,
                 "start_seconds": chunk["start_seconds"],
                 "end_seconds": chunk["end_seconds"],
-                "duration_seconds": round(duration_ms / 1000, 3),
-                "file_size_bytes": output_path.stat().st_size,
+                "duration_seconds": round((stop - start) / REFERENCE_AUDIO_SAMPLE_RATE, 3),
+                "file_size_bytes": size_bytes,
             }
         )
     return chunks
 
 
-def _process_reference_audio_for_embedding(path: Path, *, voice_profile_id: str, reference_audio_id: int, duration_ms: int) -> dict[str, Any]:
-    speech_windows = _detect_reference_speech_windows(path, duration_ms)
+def _process_reference_audio_for_embedding(
+    path: Path,
+    samples: np.ndarray,
+    *,
+    normalized_sha256: str,
+    voice_profile_id: str,
+    reference_audio_id: int,
+) -> dict[str, Any]:
+    duration_ms = samples.size * 1000 // REFERENCE_AUDIO_SAMPLE_RATE
+    speech_windows = _detect_reference_speech_windows(samples)
     selected_windows = _select_reference_chunks(speech_windows, duration_ms)
-    chunks = _extract_reference_chunks(path, voice_profile_id, reference_audio_id, selected_windows)
+    chunks = _extract_reference_chunks(samples, voice_profile_id, reference_audio_id, selected_windows)
     if not chunks:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Reference audio did not contain usable speech chunks after processing.")
+        raise ReferenceAudioError("Reference audio did not contain usable speech chunks after processing.")
     payload = {
         "status": "ready",
         "normalized_reference_path": str(path),
-        "normalized_reference_sha256": _sha256_path(path),
+        "normalized_reference_sha256": normalized_sha256,
         "normalized_duration_seconds": round(duration_ms / 1000, 3),
         "speech_windows": speech_windows,
         "chunks": chunks,
@@ -991,28 +996,40 @@ def resolve_character_portrait_path(preset: dict[str, Any] | None) -> Path | Non
     return None
 
 
-def _sha256_bytes(value: bytes) -> str:
-    return hashlib.sha256(value).hexdigest()
-
-
-def _sha256_path(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
-
-
 def _audio_duration_ms(path: Path) -> int | None:
     try:
         with wave.open(str(path), "rb") as handle:
             frame_rate = handle.getframerate()
             frame_count = handle.getnframes()
         return int((frame_count / frame_rate) * 1000) if frame_rate else None
-    except wave.Error:
+    except (wave.Error, EOFError):
         return None
 
 
+def _stream_reference_audio_upload(file: UploadFile) -> tuple[Path, int, str]:
+    """Copies the upload to disk in fixed-size chunks, hashing as it goes, so memory stays flat."""
+    max_bytes = settings.VOICE_LAB_MAX_REFERENCE_AUDIO_SIZE_BYTES
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Reference audio exceeds max size")
+    source_suffix = Path(file.filename or "").suffix or ".bin"
+    source_path = voice_reference_audio_dir() / f"{uuid.uuid4().hex}_raw{source_suffix}"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with source_path.open("wb") as handle:
+            file.file.seek(0)
+            while chunk := file.file.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Reference audio exceeds max size")
+                digest.update(chunk)
+                handle.write(chunk)
+    except BaseException:
+        source_path.unlink(missing_ok=True)
+        raise
+    return source_path, size, digest.hexdigest()
+
+
 def save_reference_audio_upload(
     *,
     file: UploadFile,
@@ -1022,6 +1039,11 @@ def save_reference_audio_upload(
     authorization_note: str | None,
     db: Session,
 ) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Stores the raw upload and records it as `processing`.
+
+    Normalization, speech detection and chunk extraction run in `process_reference_audio_upload` on
+    the voice preview worker; callers queue it and poll `get_reference_audio_status`.
+    """
     ensure_seeded_voice_presets(db)
     if not authorization_confirmed:
         raise HTTPException(
@@ -1038,47 +1060,158 @@ def save_reference_audio_upload(
     if not file.filename:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Filename is required")
 
-    content = file.file.read()
-    if len(content) > settings.VOICE_LAB_MAX_REFERENCE_AUDIO_SIZE_BYTES:
-        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Reference audio exceeds max size")
-    sha256 = _sha256_bytes(content)
-    destination, duration_ms = _normalize_reference_audio_upload(content, file.filename)
-
+    source_path, size_bytes, sha256 = _stream_reference_audio_upload(file)
     reference = VoiceReferenceAudio(
         voice_profile_id=voice_profile_id,
-        storage_path=str(destination),
-        mime_type="audio/wav",
-        duration_ms=duration_ms,
+        storage_path=str(source_path),
+        mime_type=file.content_type,
+        duration_ms=None,
         sha256=sha256,
         authorization_confirmed=True,
         authorization_note=authorization_note,
+        status="processing",
         created_by_user_id=current_user_id,
     )
     db.add(reference)
     db.flush()
-    invalidate_voice_profile_embedding(profile, db)
-    processed_reference = _process_reference_audio_for_embedding(
-        destination,
-        voice_profile_id=voice_profile_id,
-        reference_audio_id=reference.id,
-        duration_ms=duration_ms,
-    )
     next_metadata = dict(profile.provider_metadata_json or {})
     processed_by_id = dict(next_metadata.get("processed_reference_audio") or {})
     processed_by_id[str(reference.id)] = {
-        **processed_reference,
+        "status": "processing",
         "original_filename": file.filename,
-        "uploaded_file_size_bytes": len(content),
+        "uploaded_file_size_bytes": size_bytes,
         "uploaded_file_sha256": sha256,
     }
     next_metadata.update(
         {
-            "reference_processing_status": "ready",
+            "reference_processing_status": "processing",
             "processed_reference_audio": processed_by_id,
             "last_reference_audio_id": reference.id,
             "last_reference_original_filename": file.filename,
+            "last_error": None,
+        }
+    )
+    profile.provider_metadata_json = next_metadata
+    logger.info(
+        "voice.reference_audio.uploaded metadata=%s",
+        {
+            "voice_profile_id": voice_profile_id,
+            "reference_audio_id": reference.id,
+            "original_uploaded_filename": file.filename,
+            "raw_reference_path": str(source_path),
+            "file_size_bytes": size_bytes,
+            "reference_audio_sha256": sha256,
+        },
+    )
+    db.commit()
+    db.refresh(reference)
+    profile = get_voice_profile_model(voice_profile_id, db)
+    return serialize_voice_profile(profile), _serialize_reference_audio(reference)
+
+
+def mark_reference_audio_failed(reference: VoiceReferenceAudio, error: dict[str, Any], db: Session) -> None:
+    reference.status = "failed"
+    reference.error_json = error
+    Path(reference.storage_path).unlink(missing_ok=True)
+    profile = db.get(VoiceProfile, reference.voice_profile_id)
+    if profile is not None:
+        next_metadata = dict(profile.provider_metadata_json or {})
+        processed_by_id = dict(next_metadata.get("processed_reference_audio") or {})
+        processed_by_id[str(reference.id)] = {**dict(processed_by_id.get(str(reference.id)) or {}), "status": "failed", "error": error}
+        next_metadata.update(
+            {
+                "reference_processing_status": "failed",
+                "processed_reference_audio": processed_by_id,
+                "last_error": error,
+            }
+        )
+        profile.provider_metadata_json = next_metadata
+    db.commit()
+
+
+def reconcile_stale_reference_audio(
+    db: Session,
+    *,
+    older_than_minutes: int = STALE_REFERENCE_AUDIO_MINUTES,
+    limit: int = 100,
+) -> list[int]:
+    """Fails uploads stuck in `processing`, whose task died with its worker or was never delivered."""
+    cutoff = datetime.utcnow() - timedelta(minutes=older_than_minutes)
+    references = (
+        db.query(VoiceReferenceAudio)
+        .filter(VoiceReferenceAudio.status == "processing", VoiceReferenceAudio.created_at <= cutoff)
+        .order_by(VoiceReferenceAudio.created_at.asc())
+        .limit(limit)
+        .all()
+    )
+    reconciled: list[int] = []
+    for reference in references:
+        mark_reference_audio_failed(
+            reference,
+            {
+                "code": "reference_audio_worker_lost",
+                "message": "Reference audio processing did not finish; the worker was lost or the task never ran.",
+                "suggested_action": "Upload the clip again.",
+            },
+            db,
+        )
+        reconciled.append(reference.id)
+    return reconciled
+
+
+def process_reference_audio_upload(reference_audio_id: int, db: Session) -> dict[str, Any]:
+    """Normalizes a `processing` upload, extracts its speech chunks and marks it ready or failed."""
+    reference = db.get(VoiceReferenceAudio, reference_audio_id)
+    if reference is None:
+        return {"ok": False, "reason": "missing_reference_audio"}
+    if reference.status != "processing":
+        return {"ok": True, "status": reference.status}
+    voice_profile_id = reference.voice_profile_id
+    destination: Path | None = None
+    try:
+        destination, samples, normalized_sha256 = _normalize_reference_audio_upload(
+            Path(reference.storage_path), source_sha256=reference.sha256
+        )
+        duration_ms = samples.size * 1000 // REFERENCE_AUDIO_SAMPLE_RATE
+        processed_reference = _process_reference_audio_for_embedding(
+            destination,
+            samples,
+            normalized_sha256=normalized_sha256,
+            voice_profile_id=voice_profile_id,
+            reference_audio_id=reference.id,
+        )
+        # Only a clip that made it through normalization and chunking replaces the profile's embedding.
+        profile = db.get(VoiceProfile, voice_profile_id)
+        invalidate_voice_profile_embedding(profile, db)
+    except ReferenceAudioError as exc:
+        db.rollback()
+        if destination is not None:
+            destination.unlink(missing_ok=True)
+        mark_reference_audio_failed(reference, {"code": exc.code, "message": exc.message}, db)
+        return {"ok": False, "status": "failed"}
+    except Exception as exc:
+        logger.exception("voice.reference_audio.processing_failed reference_audio_id=%s", reference_audio_id)
+        db.rollback()
+        if destination is not None:
+            destination.unlink(missing_ok=True)
+        mark_reference_audio_failed(reference, {"code": "reference_audio_processing_failed", "message": f"Reference audio processing failed: {exc}"}, db)
+        return {"ok": False, "status": "failed"}
+
+    reference.storage_path = str(destination)
+    reference.mime_type = "audio/wav"
+    reference.duration_ms = duration_ms
+    reference.status = "ready"
+    reference.error_json = None
+    next_metadata = dict(profile.provider_metadata_json or {})
+    processed_by_id = dict(next_metadata.get("processed_reference_audio") or {})
+    upload_metadata = dict(processed_by_id.get(str(reference.id)) or {})
+    processed_by_id[str(reference.id)] = {**upload_metadata, **processed_reference}
+    next_metadata.update(
+        {
+            "reference_processing_status": "ready",
+            "processed_reference_audio": processed_by_id,
             "last_reference_audio_path": str(destination),
-            "last_reference_audio_sha256": sha256,
+            "last_reference_audio_sha256": reference.sha256,
             "last_reference_normalized_sha256": processed_reference["normalized_reference_sha256"],
             "last_reference_duration_seconds": round(duration_ms / 1000, 3),
             "last_reference_selected_duration_seconds": processed_reference["selected_duration_seconds"],
@@ -1087,13 +1220,13 @@ def save_reference_audio_upload(
     )
     profile.provider_metadata_json = next_metadata
     logger.info(
-        "voice.reference_audio.uploaded metadata=%s",
+        "voice.reference_audio.processed metadata=%s",
         {
             "voice_profile_id": voice_profile_id,
-            "original_uploaded_filename": file.filename,
+            "reference_audio_id": reference.id,
+            "original_uploaded_filename": upload_metadata.get("original_filename"),
             "stored_reference_path": str(destination),
-            "file_size_bytes": len(content),
-            "reference_audio_sha256": sha256,
+            "reference_audio_sha256": reference.sha256,
             "normalized_reference_sha256": processed_reference["normalized_reference_sha256"],
             "detected_duration_seconds": round(duration_ms / 1000, 3),
             "selected_chunk_count": len(processed_reference["chunks"]),
@@ -1101,8 +1234,42 @@ def save_reference_audio_upload(
         },
     )
     db.commit()
-    db.refresh(reference)
+    return {"ok": True, "status": "ready"}
+
+
+def delete_reference_audio(voice_profile_id: str, reference_audio_id: int, current_user_id: int, db: Session) -> dict[str, Any]:
+    """Removes one clip and its chunk WAVs; the other clips' chunks and embeddings are kept."""
+    reference = db.get(VoiceReferenceAudio, reference_audio_id)
+    if reference is None or reference.voice_profile_id != voice_profile_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reference audio not found")
+    profile = reference.voice_profile
+    ensure_voice_profile_editable(profile, current_user_id)
+    next_metadata = dict(profile.provider_metadata_json or {})
+    processed_by_id = dict(next_metadata.get("processed_reference_audio") or {})
+    removed = processed_by_id.pop(str(reference.id), None)
+    for chunk in (removed or {}).get("chunks") or []:
+        if isinstance(chunk, dict) and chunk.get("path"):
+            Path(str(chunk["path"])).unlink(missing_ok=True)
+    Path(reference.storage_path).unlink(missing_ok=True)
+    next_metadata["processed_reference_audio"] = processed_by_id
+    profile.provider_metadata_json = next_metadata
+    db.delete(reference)
+    db.flush()
+    invalidate_voice_profile_embedding(profile, db)
+    db.commit()
+    logger.info("voice.reference_audio.deleted voice_profile_id=%s reference_audio_id=%s", voice_profile_id, reference_audio_id)
+    return serialize_voice_profile(get_voice_profile_model(voice_profile_id, db))
+
+
+def get_reference_audio_status(
+    voice_profile_id: str, reference_audio_id: int, current_user_id: int, db: Session
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    reference = db.get(VoiceReferenceAudio, reference_audio_id)
+    if reference is None or reference.voice_profile_id != voice_profile_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reference audio not found")
     profile = get_voice_profile_model(voice_profile_id, db)
+    # Clip status, like upload and delete, is for users who can edit the profile.
+    ensure_voice_profile_editable(profile, current_user_id)
     return serialize_voice_profile(profile), _serialize_reference_audio(reference)
 
 
@@ -0,0 +1,221 @@
+"""Eager warm-up for Celery worker children.
+
+A fresh child (including one forked after a `worker_max_tasks_per_child` recycle) would otherwise pay
+for heavy imports, model loads and font loads inside its first job. `run_worker_warmup` runs from the
+`worker_process_init` signal, before the pool hands the child any work, and walks the manifest steps
+for the queues the worker consumes. Each child records its progress in a small JSON report under the
+media root, which the API serves from `/health/workers`.
+
+A child that is SIGKILLed or OOM-killed never runs `worker_process_shutdown`, so every child also
+touches its report on a heartbeat thread and readers ignore (and remove) reports whose heartbeat has
+lapsed or whose pid is gone from this host.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from app.core.config import settings
+from app.services.storage import media_root
+
+logger = logging.getLogger(__name__)
+
+# Sizes used by the speaker and caption cards in rendering.
+WARM_FONT_SIZES = (40, 54, 56, 176)
+# A report is stale once this many heartbeats have been missed.
+HEARTBEAT_MISSES_BEFORE_STALE = 3
+
+_heartbeat_stop = threading.Event()
+
+
+def _warm_render_imports() -> dict[str, Any]:
+    import moviepy  # noqa: F401
+    import numpy  # noqa: F401
+
+    from app.services import rendering  # noqa: F401
+
+    try:
+        import cv2  # noqa: F401
+    except ImportError:
+        return {"cv2": False}
+    return {"cv2": True}
+
+
+def _warm_fonts() -> dict[str, Any]:
+    from app.services.raster_cache import font_identity
+
+    return {"fonts": [font_identity(size) for size in WARM_FONT_SIZES]}
+
+
+def _warm_ffmpeg() -> dict[str, Any]:
+    from app.services.filtergraph import ffmpeg_binary
+
+    return {"ffmpeg": ffmpeg_binary()}
+
+
+def _warm_espeak() -> dict[str, Any]:
+    from app.services.tts import EspeakProvider
+
+    health = EspeakProvider().healthcheck()
+    return {"available": health["available"], "backend": health["metadata"].get("backend")}
+
+
+def _warm_openvoice() -> dict[str, Any]:
+    from app.services.tts import OpenVoiceProvider
+
+    languages = [language.strip() for language in settings.OPENVOICE_SERVER_WARM_LANGUAGES.split(",") if language.strip()]
+    return OpenVoiceProvider().warm_up(languages)
+
+
+WARMUP_STEPS: dict[str, Callable[[], dict[str, Any]]] = {
+    "render_imports": _warm_render_imports,
+    "fonts": _warm_fonts,
+    "ffmpeg": _warm_ffmpeg,
+    "espeak": _warm_espeak,
+    "openvoice": _warm_openvoice,
+}
+
+# Steps per queue, in order. Generation renders and synthesises dialogue; voice previews only synthesise.
+WARMUP_MANIFEST: dict[str, tuple[str, ...]] = {
+    "generation": ("render_imports", "fonts", "ffmpeg", "espeak", "openvoice"),
+    "voice_preview": ("ffmpeg", "espeak", "openvoice"),
+    "publish": (),
+}
+
+
+def warmup_steps_for_queues(queues: list[str]) -> list[str]:
+    steps: list[str] = []
+    for queue in queues:
+        for step in WARMUP_MANIFEST.get(queue, ()):
+            if step not in steps:
+                steps.append(step)
+    return steps
+
+
+def warmup_report_dir() -> Path:
+    path = media_root() / "worker_warmup"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def warmup_report_path(pid: int | None = None) -> Path:
+    return warmup_report_dir() / f"{socket.gethostname()}-{pid or os.getpid()}.json"
+
+
+def _write_report(report: dict[str, Any]) -> None:
+    path = warmup_report_path()
+    temp_path = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.tmp")
+    temp_path.write_text(json.dumps(report, default=str), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def _heartbeat(path: Path, interval: float) -> None:
+    while not _heartbeat_stop.wait(interval):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return
+        except OSError:
+            logger.warning("worker.warmup heartbeat failed for %s", path, exc_info=True)
+
+
+def _start_heartbeat() -> None:
+    _heartbeat_stop.clear()
+    interval = max(settings.WORKER_WARMUP_HEARTBEAT_SECONDS, 0.01)
+    threading.Thread(target=_heartbeat, args=(warmup_report_path(), interval), name="warmup-heartbeat", daemon=True).start()
+
+
+def run_worker_warmup(queues: list[str]) -> dict[str, Any]:
+    """Runs every manifest step for `queues`, recording timings; a failed step degrades, never aborts."""
+    started = time.perf_counter()
+    report: dict[str, Any] = {
+        "hostname": socket.gethostname(),
+        "pid": os.getpid(),
+        "queues": sorted(queues),
+        "status": "warming",
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "steps": [],
+    }
+    _write_report(report)
+    _start_heartbeat()
+    for name in warmup_steps_for_queues(queues):
+        step_started = time.perf_counter()
+        step: dict[str, Any] = {"name": name}
+        try:
+            step.update({"ok": True, "detail": WARMUP_STEPS[name]()})
+        except Exception as exc:
+            logger.warning("worker.warmup step=%s failed: %s", name, exc)
+            step.update({"ok": False, "error": f"{type(exc).__name__}: {exc}"})
+        step["seconds"] = round(time.perf_counter() - step_started, 3)
+        report["steps"].append(step)
+        _write_report(report)
+    report["status"] = "ready" if all(step["ok"] for step in report["steps"]) else "degraded"
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    report["finished_at"] = datetime.now(timezone.utc).isoformat()
+    _write_report(report)
+    logger.info(
+        "worker.warmup queues=%s status=%s seconds=%s steps=%s",
+        ",".join(report["queues"]),
+        report["status"],
+        report["seconds"],
+        {step["name"]: step["seconds"] for step in report["steps"]},
+    )
+    return report
+
+
+def clear_worker_warmup_report() -> None:
+    _heartbeat_stop.set()
+    warmup_report_path().unlink(missing_ok=True)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _report_is_stale(report: dict[str, Any], mtime: float) -> bool:
+    if time.time() - mtime > settings.WORKER_WARMUP_HEARTBEAT_SECONDS * HEARTBEAT_MISSES_BEFORE_STALE:
+        return True
+    return report.get("hostname") == socket.gethostname() and not _pid_alive(int(report.get("pid") or 0))
+
+
+def read_warmup_reports() -> list[dict[str, Any]]:
+    """Reports of live worker children; reports left behind by killed children are removed."""
+    reports = []
+    for path in sorted(warmup_report_dir().glob("*.json")):
+        try:
+            mtime = path.stat().st_mtime
+            report = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if _report_is_stale(report, mtime):
+            logger.info("worker.warmup dropping stale report %s", path.name)
+            path.unlink(missing_ok=True)
+            continue
+        reports.append(report)
+    return reports
+
+
+def worker_readiness() -> dict[str, Any]:
+    """Readiness across every reporting worker child: ready once none of them is still warming."""
+    reports = read_warmup_reports()
+    ready_queues = sorted({queue for report in reports if report.get("status") != "warming" for queue in report.get("queues") or []})
+    return {
+        "ok": bool(reports) and all(report.get("status") != "warming" for report in reports),
+        "ready_queues": ready_queues,
+        "workers": reports,
+    }
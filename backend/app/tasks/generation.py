@@ -1,58 +1,38 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
+from pathlib import Path
 
 from sqlalchemy.orm import Session
 
 from app.celery_app import celery
+from app.core.config import settings
 from app.db import SessionLocal
 from app.models import Asset, GenerationJob, OutputVideo, Project
+from app.services.background_cache import evict_background_cache
+from app.services.generation_jobs import ACTIVE_GENERATION_STATUSES, reconcile_stale_generation_jobs
+from app.services.media_probe import BackgroundProbeError, ensure_background_probe
 from app.services.notifications import create_notification
 from app.services.project_state import sync_project_state
+from app.services.raster_cache import evict_raster_cache
+from app.services.render_cache import (
+    asset_content_sha256,
+    evict_render_cache,
+    find_cached_render_asset,
+    is_cacheable_render,
+    lookup_render_cache,
+    render_cache_key,
+    store_render_cache_entry,
+)
 from app.services.rendering import ProjectRenderService
-from app.services.storage import guess_mime_type, store_generated_file
+from app.services.storage import collect_blob_garbage, content_sha256, guess_mime_type, store_generated_file
+from app.services.timelines import link_timeline, release_timeline
+from app.services.voice_cache import evict_voice_cache
 
 logger = logging.getLogger(__name__)
 
-ACTIVE_GENERATION_STATUSES = {"queued", "processing", "retrying"}
-STALE_GENERATION_MINUTES = 15
-STALE_GENERATION_ERROR = "worker lost during render"
-
-
-def reconcile_stale_generation_jobs(
-    db: Session,
-    *,
-    project_id: int | None = None,
-    older_than_minutes: int = STALE_GENERATION_MINUTES,
-    limit: int = 100,
-) -> list[int]:
-    cutoff = datetime.utcnow() - timedelta(minutes=older_than_minutes)
-    query = db.query(GenerationJob).filter(
-        GenerationJob.status == "processing",
-        GenerationJob.started_at.is_not(None),
-        GenerationJob.started_at <= cutoff,
-        GenerationJob.finished_at.is_(None),
-    )
-    if project_id is not None:
-        query = query.filter(GenerationJob.project_id == project_id)
-
-    jobs = query.order_by(GenerationJob.started_at.asc()).limit(limit).all()
-    reconciled: list[int] = []
-    for job in jobs:
-        job.status = "failed"
-        job.progress = 0
-        job.error_message = STALE_GENERATION_ERROR
-        job.finished_at = datetime.utcnow()
-        project = db.get(Project, job.project_id)
-        if project:
-            project.status = "failed"
-            sync_project_state(project)
-        reconciled.append(job.id)
-
-    if reconciled:
-        logger.warning("Reconciled stale generation jobs: %s", reconciled)
-    return reconciled
+PREVIEW_OUTPUT_KINDS = {"draft", "preview"}
 
 
 def _set_job_progress(db: Session, job: GenerationJob, project: Project, progress: int, *, status: str | None = None) -> None:
@@ -78,6 +58,79 @@ def _render_progress_callback(db: Session, job: GenerationJob, project: Project)
     return callback
 
 
+def _render_cache_key(render_service: ProjectRenderService, job: GenerationJob, asset: Asset, script_revision) -> str | None:
+    if not settings.RENDER_CACHE_ENABLED:
+        return None
+    try:
+        inputs = render_service.render_cache_inputs(
+            background_sha256=asset_content_sha256(asset),
+            background_video_path=asset.storage_key,
+            parsed_lines=script_revision.parsed_lines_json,
+            style_preset=job.style_preset,
+            output_kind=job.output_kind,
+            render_engine=job.provider_name,
+        )
+    except Exception:
+        logger.warning("Generation job %s could not compute a render cache key; rendering without cache", job.id, exc_info=True)
+        return None
+    # Entries carry the owning project's timeline and media paths, so they are never shared across projects.
+    return render_cache_key({**inputs, "project_id": job.project_id})
+
+
+def _promotion_timeline(db: Session, job: GenerationJob) -> dict | None:
+    if not job.source_output_video_id:
+        return None
+    source = db.get(OutputVideo, job.source_output_video_id)
+    timeline = (source.asset.metadata_json or {}).get("timeline") if source and source.asset else None
+    if not timeline or not all(Path(entry["audio_path"]).exists() for entry in timeline.get("segments") or []):
+        logger.warning(
+            "Generation job %s cannot reuse the timeline of output %s; rendering from the script instead",
+            job.id,
+            job.source_output_video_id,
+        )
+        return None
+    return timeline
+
+
+def _detach_replaced_timeline(db: Session, job: GenerationJob, project: Project, output_asset: Asset) -> dict | None:
+    """Takes the timeline off the output `job` replaces, unless another job is still promoting that output.
+
+    Returns the detached timeline so its audio can be released once the new output is committed.
+    """
+    previous = db.get(OutputVideo, project.current_output_video_id) if project.current_output_video_id else None
+    if previous is None or previous.asset is None or previous.asset_id == output_asset.id:
+        return None
+    metadata = dict(previous.asset.metadata_json or {})
+    if "timeline" not in metadata:
+        return None
+    promoting = (
+        db.query(GenerationJob.id)
+        .filter(
+            GenerationJob.id != job.id,
+            GenerationJob.source_output_video_id == previous.id,
+            GenerationJob.status.in_(tuple(ACTIVE_GENERATION_STATUSES)),
+        )
+        .first()
+    )
+    if promoting:
+        return None
+    timeline = metadata.pop("timeline")
+    previous.asset.metadata_json = metadata
+    return timeline
+
+
+def _output_asset_metadata(job: GenerationJob, cache_key: str | None, result: dict) -> dict:
+    metadata: dict = {}
+    if cache_key:
+        metadata["render_cache_key"] = cache_key
+    timeline = (result.get("metadata") or {}).get("timeline")
+    if timeline:
+        metadata["timeline"] = timeline
+    if job.source_output_video_id:
+        metadata["promoted_from_output_video_id"] = job.source_output_video_id
+    return metadata
+
+
 @celery.task(name="app.tasks.generation.process_generation_job")
 def process_generation_job(job_id: int) -> dict:
     db: Session = SessionLocal()
@@ -103,47 +156,106 @@ def process_generation_job(job_id: int) -> dict:
         db.commit()
         logger.info("Generation job %s started for project %s", job.id, project.id)
 
+        # Uploads are probed by `probe_background_asset`; a job that gets here first probes the background itself.
+        try:
+            background_probe = ensure_background_probe(asset)
+        finally:
+            # Keeps the probe, or the rejection, recorded on the asset when the job then fails.
+            db.commit()
         render_service = ProjectRenderService(db=db, project_id=project.id)
+        render_service.use_background_probe(asset.storage_key, background_probe)
         progress_callback = _render_progress_callback(db, job, project)
-        try:
-            _set_job_progress(db, job, project, 35)
-            logger.info("Generation job %s entering render pipeline", job.id)
-            result = render_service.render_preview(
-                project_id=project.id,
-                background_video_path=asset.storage_key,
-                parsed_lines=script_revision.parsed_lines_json,
-                style_preset=job.style_preset,
-                output_kind=job.output_kind,
-                progress_callback=progress_callback,
-            )
-        except TypeError:
-            # Compatibility for tests and legacy local monkeypatches that still use the older signature.
-            result = render_service.render_preview(
+        timeline = _promotion_timeline(db, job)
+        cache_key = None if timeline else _render_cache_key(render_service, job, asset, script_revision)
+        output_asset = find_cached_render_asset(db, project.id, cache_key) if cache_key else None
+        cache_hit = output_asset is not None
+        if output_asset:
+            logger.info("Generation job %s reused cached render asset %s", job.id, output_asset.id)
+        else:
+            cached_entry = lookup_render_cache(cache_key) if cache_key else None
+            if cached_entry:
+                cache_hit = True
+                logger.info("Generation job %s reused render cache entry %s", job.id, cache_key)
+                cached_timeline = (cached_entry.get("metadata") or {}).get("timeline")
+                result = {
+                    "output_path": cached_entry["output_path"],
+                    "duration_seconds": cached_entry.get("duration_seconds"),
+                    # The timeline travels with the entry so a draft rendered from cache can still be promoted;
+                    # the new output gets its own links, since each output releases its timeline on its own.
+                    "metadata": {"timeline": link_timeline(project.id, f"preview_{job.id}", cached_timeline) if cached_timeline else None},
+                }
+            elif timeline:
+                _set_job_progress(db, job, project, 35)
+                logger.info("Generation job %s re-encoding timeline of output %s", job.id, job.source_output_video_id)
+                result = render_service.render_timeline(
+                    project_id=project.id,
+                    background_video_path=asset.storage_key,
+                    timeline=timeline,
+                    style_preset=job.style_preset,
+                    output_kind=job.output_kind,
+                    progress_callback=progress_callback,
+                    render_engine=job.provider_name,
+                )
+            else:
+                try:
+                    _set_job_progress(db, job, project, 35)
+                    logger.info("Generation job %s entering render pipeline", job.id)
+                    result = render_service.render_preview(
+                        project_id=project.id,
+                        background_video_path=asset.storage_key,
+                        parsed_lines=script_revision.parsed_lines_json,
+                        style_preset=job.style_preset,
+                        output_kind=job.output_kind,
+                        progress_callback=progress_callback,
+                        render_engine=job.provider_name,
+                    )
+                except TypeError:
+                    # Compatibility for tests and legacy local monkeypatches that still use the older signature.
+                    result = render_service.render_preview(
+                        project.id,
+                        asset.storage_key,
+                        script_revision.parsed_lines_json,
+                        job.style_preset,
+                    )
+            _set_job_progress(db, job, project, 70)
+            logger.info("Generation job %s render pipeline produced output %s", job.id, result.get("output_path"))
+
+            generated_path = result["output_path"].replace("file://", "")
+            # The renderer's own output is moved into the blob store; cache entries and anything else are linked.
+            stored_path = store_generated_file(
                 project.id,
-                asset.storage_key,
-                script_revision.parsed_lines_json,
-                job.style_preset,
+                generated_path,
+                f"preview_{job.id}.mp4",
+                move=Path(generated_path).resolve().parent == render_service.output_dir.resolve(),
             )
-        _set_job_progress(db, job, project, 70)
-        logger.info("Generation job %s render pipeline produced output %s", job.id, result.get("output_path"))
-
-        generated_path = result["output_path"].replace("file://", "")
-        stored_path = store_generated_file(project.id, generated_path, f"preview_{job.id}.mp4")
-        _set_job_progress(db, job, project, 82)
-        output_asset = Asset(
-            user_id=project.user_id,
-            project_id=project.id,
-            kind="render_output",
-            source_type="generated",
-            provider_name=job.provider_name,
-            storage_key=str(stored_path),
-            original_filename=stored_path.name,
-            mime_type=guess_mime_type(str(stored_path)),
-            size_bytes=stored_path.stat().st_size,
-            duration_ms=int((result.get("duration_seconds") or 0) * 1000) or None,
-        )
-        db.add(output_asset)
-        db.flush()
+            _set_job_progress(db, job, project, 82)
+            output_asset = Asset(
+                user_id=project.user_id,
+                project_id=project.id,
+                kind="render_output",
+                source_type="generated",
+                provider_name=job.provider_name,
+                storage_key=str(stored_path),
+                original_filename=stored_path.name,
+                mime_type=guess_mime_type(str(stored_path)),
+                size_bytes=stored_path.stat().st_size,
+                duration_ms=int((result.get("duration_seconds") or 0) * 1000) or None,
+                metadata_json=_output_asset_metadata(job, cache_key, result),
+            )
+            db.add(output_asset)
+            db.flush()
+            if cache_key and not cached_entry and is_cacheable_render(result):
+                store_render_cache_entry(
+                    cache_key,
+                    stored_path,
+                    duration_seconds=result.get("duration_seconds"),
+                    sha256=content_sha256(stored_path),
+                    metadata={
+                        "project_id": project.id,
+                        "generation_job_id": job.id,
+                        "timeline": (result.get("metadata") or {}).get("timeline"),
+                    },
+                )
         _set_job_progress(db, job, project, 90)
 
         output_video = OutputVideo(
@@ -152,18 +264,19 @@ def process_generation_job(job_id: int) -> dict:
             asset_id=output_asset.id,
             output_kind=job.output_kind,
             provider_name=job.provider_name,
-            is_preview=job.output_kind == "preview",
+            is_preview=job.output_kind in PREVIEW_OUTPUT_KINDS,
             duration_ms=output_asset.duration_ms,
         )
         db.add(output_video)
         db.flush()
         _set_job_progress(db, job, project, 95)
 
+        replaced_timeline = _detach_replaced_timeline(db, job, project, output_asset)
         project.current_output_video_id = output_video.id
         project.background_asset_id = project.background_asset_id or asset.id
         project.background_style = job.style_preset
         project.approved_at = None
-        project.status = "preview_ready" if job.output_kind == "preview" else "assets_ready"
+        project.status = "preview_ready" if job.output_kind in PREVIEW_OUTPUT_KINDS else "assets_ready"
         job.status = "completed"
         job.progress = 100
         job.finished_at = datetime.utcnow()
@@ -174,9 +287,10 @@ def process_generation_job(job_id: int) -> dict:
             project_id=project.id,
             category="render.ready",
             message=f"{job.output_kind.title()} render is ready for review.",
-            payload={"job_id": job.id, "output_video_id": output_video.id},
+            payload={"job_id": job.id, "output_video_id": output_video.id, "render_cache_hit": cache_hit},
         )
         db.commit()
+        release_timeline(replaced_timeline)
         logger.info("Generation job %s completed with output video %s", job.id, output_video.id)
         return {"ok": True, "status": job.status, "output_video_id": output_video.id}
     except Exception as exc:
@@ -214,3 +328,54 @@ def reconcile_stale_generation_jobs_task(limit: int = 100) -> dict:
         return {"reconciled": len(reconciled), "job_ids": reconciled}
     finally:
         db.close()
+
+
+@celery.task(name="app.tasks.generation.evict_render_caches")
+def evict_render_caches_task() -> dict:
+    """Sweeps every render-side cache from beat; one failing sweep never stops the others."""
+    sweeps = {
+        "render": lambda: evict_render_cache(extra_dirs=[ProjectRenderService().output_dir]),
+        "raster": evict_raster_cache,
+        "voice": evict_voice_cache,
+        "background": evict_background_cache,
+        "blobs": collect_blob_garbage,
+    }
+    evicted: dict[str, int] = {}
+    for name, sweep in sweeps.items():
+        try:
+            evicted[name] = len(sweep())
+        except Exception:
+            logger.warning("Cache sweep %s failed", name, exc_info=True)
+    return {"evicted": evicted}
+
+
+@celery.task(name="app.tasks.generation.probe_background_asset")
+def probe_background_asset(asset_id: int) -> dict:
+    """Probes a newly stored background, recording the probe or the reason no render could use it."""
+    db: Session = SessionLocal()
+    try:
+        asset = db.get(Asset, asset_id)
+        if asset is None or not Path(asset.storage_key).exists():
+            return {"asset_id": asset_id, "ok": False, "reason": "missing_asset"}
+        try:
+            ensure_background_probe(asset)
+        except BackgroundProbeError as exc:
+            return {"asset_id": asset_id, "ok": False, "reason": exc.code}
+        finally:
+            db.commit()
+        return {"asset_id": asset_id, "ok": True}
+    finally:
+        db.close()
+
+
+@celery.task(name="app.tasks.generation.prepare_background_derivatives")
+def prepare_background_derivatives(asset_id: int, style_preset: str = "none") -> dict:
+    db: Session = SessionLocal()
+    try:
+        asset = db.get(Asset, asset_id)
+        if asset is None or not Path(asset.storage_key).exists():
+            return {"asset_id": asset_id, "derivatives": []}
+        derivatives = ProjectRenderService().prepare_background_derivatives(asset.storage_key, style_preset)
+        return {"asset_id": asset_id, "derivatives": [path.name for path in derivatives if path]}
+    finally:
+        db.close()
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 from app.celery_app import celery
 from app.db import SessionLocal
 from app.models import PublishJob
-from app.tasks.publish import process_publish_job
+from app.tasks.signatures import process_publish_job
 
 
 @celery.task(name="app.tasks.scheduler.dispatch_due_publish_jobs")
@@ -0,0 +1,17 @@
+"""Signatures for the tasks the API enqueues.
+
+The API only needs a task's name to queue it. Importing the task modules would drag the render stack,
+TTS and NumPy into every API process, so routers enqueue through these signatures instead; one whose
+task is not registered in the process is sent by name with `send_task`, routed by `task_routes`.
+"""
+
+from __future__ import annotations
+
+from app.celery_app import celery
+
+process_generation_job = celery.signature("app.tasks.generation.process_generation_job")
+probe_background_asset = celery.signature("app.tasks.generation.probe_background_asset")
+prepare_background_derivatives = celery.signature("app.tasks.generation.prepare_background_derivatives")
+process_publish_job = celery.signature("app.tasks.publish.process_publish_job")
+process_reference_audio = celery.signature("app.tasks.voice_preview.process_reference_audio")
+process_voice_lab_preview = celery.signature("app.tasks.voice_preview.process_voice_lab_preview")
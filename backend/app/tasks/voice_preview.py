@@ -14,7 +14,13 @@ from app.services.voice_preview_jobs import (
     build_voice_preview_failure,
     reconcile_stale_voice_preview_jobs,
 )
-from app.services.voice_profiles import runtime_voice_profile_payload, update_voice_profile_preparation_metadata, voice_lab_preview_dir
+from app.services.voice_profiles import (
+    process_reference_audio_upload,
+    reconcile_stale_reference_audio,
+    runtime_voice_profile_payload,
+    update_voice_profile_preparation_metadata,
+    voice_lab_preview_dir,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -167,6 +173,19 @@ def process_voice_lab_preview(preview_job_id: int) -> dict:
         db.close()
 
 
+@celery.task(
+    name="app.tasks.voice_preview.process_reference_audio",
+    acks_late=False,
+    reject_on_worker_lost=False,
+)
+def process_reference_audio(reference_audio_id: int) -> dict:
+    db: Session = SessionLocal()
+    try:
+        return process_reference_audio_upload(reference_audio_id, db)
+    finally:
+        db.close()
+
+
 @celery.task(name="app.tasks.voice_preview.reconcile_stale_voice_preview_jobs")
 def reconcile_stale_voice_preview_jobs_task(limit: int = 100) -> dict:
     db: Session = SessionLocal()
@@ -178,3 +197,15 @@ def reconcile_stale_voice_preview_jobs_task(limit: int = 100) -> dict:
         return {"reconciled": len(reconciled), "job_ids": reconciled}
     finally:
         db.close()
+
+
+@celery.task(name="app.tasks.voice_preview.reconcile_stale_reference_audio")
+def reconcile_stale_reference_audio_task(limit: int = 100) -> dict:
+    db: Session = SessionLocal()
+    try:
+        reconciled = reconcile_stale_reference_audio(db, limit=limit)
+        if reconciled:
+            logger.warning("Reconciled stale reference audio: %s", reconciled)
+        return {"reconciled": len(reconciled), "reference_audio_ids": reconciled}
+    finally:
+        db.close()
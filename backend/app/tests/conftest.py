@@ -23,6 +23,7 @@ from sqlalchemy import text
 from app.core.http_rate_limit import _WINDOWS
 from app.db import Base, engine
 from app.main import app
+from app.services.tts import provider_health_cache
 
 TEST_DB_PATH = Path("test_omniposter.db")
 TEST_MEDIA_DIR = Path("test_storage")
@@ -44,6 +45,7 @@ def reset_environment():
             {"revision": ALEMBIC_REVISION},
         )
     _WINDOWS.clear()
+    provider_health_cache.invalidate()
     if TEST_MEDIA_DIR.exists():
         shutil.rmtree(TEST_MEDIA_DIR)
     TEST_MEDIA_DIR.mkdir(parents=True, exist_ok=True)
@@ -56,6 +58,15 @@ def reset_environment():
         shutil.rmtree(TEST_MEDIA_DIR)
 
 
+@pytest.fixture(autouse=True)
+def run_background_probes_inline(monkeypatch):
+    """Runs the background probe the upload handlers queue, as the generation worker would."""
+    from app.tasks import signatures
+    from app.tasks.generation import probe_background_asset
+
+    monkeypatch.setattr(signatures.probe_background_asset, "delay", lambda asset_id: probe_background_asset(asset_id))
+
+
 @pytest.fixture
 def client():
     with TestClient(app) as test_client:
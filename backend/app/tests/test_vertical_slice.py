@@ -1,25 +1,40 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+import hashlib
+import json
 from pathlib import Path
+from types import SimpleNamespace
+import os
+import pickle
 import subprocess
+import sys
+import threading
+import time
 import wave
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
+from PIL import Image
 
 from app.core.config import settings
 from app.db import SessionLocal
 from app.models import GenerationJob, SocialAccount, VoicePreviewJob
 from app.services.voice_preview_jobs import STALE_VOICE_PREVIEW_ERROR_CODE
 from app.services.character_presets import get_character_preset
+from app.services.filtergraph import FiltergraphRenderer, ffmpeg_binary
+from app.services.raster_cache import load_font
 from app.services.crypto import decrypt_secret
 from app.services.rendering import ProjectRenderService
-from app.services.tts import LocalSpeechService, OpenVoiceProvider, SpeechSegment, TTSOrchestrator, TextToSpeechError
-from app.tasks.generation import STALE_GENERATION_ERROR, process_generation_job, reconcile_stale_generation_jobs
+from app.services.tts import LocalSpeechService, OpenVoiceProvider, PcmAudio, SpeechSegment, TTSOrchestrator, TextToSpeechError, provider_health_cache
+from app.services import background_cache, speech_activity, storage, voice_cache, voice_profiles
+from app.services.generation_jobs import STALE_GENERATION_ERROR, reconcile_stale_generation_jobs
+from app.tasks import signatures as task_signatures
+from app.tasks.generation import process_generation_job
 from app.tasks.publish import process_publish_job
 from app.tasks.scheduler import dispatch_due_publish_jobs
-from app.tasks.voice_preview import process_voice_lab_preview
+from app.tasks.voice_preview import process_reference_audio, process_voice_lab_preview
 
 
 class StubRegistry:
@@ -63,21 +78,53 @@ def _write_wav(path: Path, *, seconds: float = 1.6, sample_rate: int = 16000, sa
         handle.writeframes(sample * frame_count)
 
 
-def _fake_reference_audio_ffmpeg_run(recorded: dict[str, object] | None = None, *, seconds: float = 1.8, silence_stderr: str = ""):
-    def fake_run(command, check, capture_output, text):
+_BACKGROUND_VIDEO_BYTES: list[bytes] = []
+
+
+def _background_video_bytes() -> bytes:
+    """A one-second 64x112 clip with half-second GOPs, encoded once per test session."""
+    if not _BACKGROUND_VIDEO_BYTES:
+        path = Path(os.environ.get("TMPDIR", "/tmp")) / f"omniposter_background_{os.getpid()}.mp4"
+        subprocess.run(
+            [ffmpeg_binary(), "-y", "-loglevel", "error", "-f", "lavfi", "-i", "testsrc=size=64x112:rate=30:duration=1", "-g", "15", "-pix_fmt", "yuv420p", str(path)],
+            check=True,
+        )
+        _BACKGROUND_VIDEO_BYTES.append(path.read_bytes())
+        path.unlink()
+    return _BACKGROUND_VIDEO_BYTES[0]
+
+
+def _fake_reference_audio_ffmpeg_run(recorded: dict[str, object] | None = None, *, seconds: float = 1.8):
+    """Stands in for the single normalizing decode, returning `seconds` of steady 16 kHz speech-level PCM."""
+
+    def fake_run(command, check, capture_output):
         if recorded is not None:
             recorded.setdefault("commands", []).append(command)
-        if command[-1] == "-":
-            return subprocess.CompletedProcess(command, 0, stdout="", stderr=silence_stderr)
-        output_seconds = seconds
-        if "-t" in command:
-            output_seconds = float(command[command.index("-t") + 1])
-        _write_wav(Path(command[-1]), seconds=output_seconds)
-        return subprocess.CompletedProcess(command, 0, stdout="", stderr="")
+        pcm = np.full(int(seconds * 16000), 4000, dtype="<i2").tobytes()
+        return subprocess.CompletedProcess(command, 0, stdout=pcm, stderr=b"")
 
     return fake_run
 
 
+def _upload_reference_audio_and_process(auth_client: TestClient, monkeypatch, filename: str, content: bytes):
+    """Uploads a clip, runs the queued processing task inline and returns the upload and status payloads."""
+    monkeypatch.setattr(task_signatures.process_reference_audio, "apply_async", lambda *, kwargs, task_id: process_reference_audio(**kwargs))
+    response = auth_client.post(
+        "/voice-profiles/reference-audio",
+        files={"file": (filename, content, "audio/mpeg")},
+        data={
+            "voice_profile_id": "vp_host_calm_v1",
+            "authorization_confirmed": "true",
+            "authorization_note": "owned",
+        },
+    )
+    assert response.status_code == 202
+    assert response.json()["reference_audio"]["status"] == "processing"
+    status_response = auth_client.get(f"/voice-profiles/vp_host_calm_v1/reference-audio/{response.json()['reference_audio']['id']}")
+    assert status_response.status_code == 200
+    return response.json(), status_response.json()
+
+
 def test_background_presets_are_loaded_from_bundled_media_dir(auth_client: TestClient):
     preset_dir = Path("test_storage") / "bundled" / "presets"
     preset_dir.mkdir(parents=True, exist_ok=True)
@@ -166,7 +213,7 @@ def test_character_presets_list_and_runtime_override(auth_client: TestClient):
     assert get_character_preset(created_id) is None
 
 
-def test_character_portrait_prefers_bundled_media_dir_over_runtime(auth_client: TestClient, tmp_path: Path):
+def test_character_portrait_prefers_bundled_media_dir_over_runtime(auth_client: TestClient):
     bundled_characters = Path("test_storage") / "bundled" / "characters"
     runtime_characters = Path("test_storage") / "characters"
     bundled_characters.mkdir(parents=True, exist_ok=True)
@@ -178,7 +225,7 @@ def test_character_portrait_prefers_bundled_media_dir_over_runtime(auth_client:
     runtime_portrait.write_bytes(b"runtime-portrait")
 
     service = ProjectRenderService()
-    resolved = service._resolve_character_portrait("Host", 0, tmp_path)
+    resolved = service._find_character_portrait("Host", 0)
 
     assert resolved == bundled_portrait
 
@@ -329,7 +376,7 @@ def test_voice_lab_preview_disables_fallback_for_explicit_provider(auth_client:
         scheduled["task_id"] = task_id
         return None
 
-    monkeypatch.setattr(process_voice_lab_preview, "apply_async", fake_apply_async)
+    monkeypatch.setattr(task_signatures.process_voice_lab_preview, "apply_async", fake_apply_async)
     response = auth_client.post(
         "/voice-lab/preview",
         json={
@@ -414,7 +461,7 @@ def test_voice_lab_preview_auto_runs_sync_when_selection_resolves_to_espeak(auth
 
     monkeypatch.setattr(TTSOrchestrator, "resolve_provider_selection", fake_resolve_provider_selection)
     monkeypatch.setattr(TTSOrchestrator, "synthesize_dialogue", fake_synthesize_dialogue)
-    monkeypatch.setattr(process_voice_lab_preview, "apply_async", lambda **kwargs: scheduled.update(called=True))
+    monkeypatch.setattr(task_signatures.process_voice_lab_preview, "apply_async", lambda **kwargs: scheduled.update(called=True))
 
     response = auth_client.post(
         "/voice-lab/preview",
@@ -477,22 +524,15 @@ def test_reference_audio_upload_normalizes_audio_and_invalidates_embedding(auth_
     monkeypatch.setattr("app.services.voice_profiles._ffmpeg_binary", lambda: "/usr/bin/ffmpeg")
     monkeypatch.setattr("app.services.voice_profiles.subprocess.run", _fake_reference_audio_ffmpeg_run(seconds=1.8))
 
-    response = auth_client.post(
-        "/voice-profiles/reference-audio",
-        files={"file": ("reference.mp3", b"fake-mp3", "audio/mpeg")},
-        data={
-            "voice_profile_id": "vp_host_calm_v1",
-            "authorization_confirmed": "true",
-            "authorization_note": "owned",
-        },
-    )
+    uploaded, processed = _upload_reference_audio_and_process(auth_client, monkeypatch, "reference.mp3", b"fake-mp3")
 
-    assert response.status_code == 201
-    assert response.json()["reference_audio"]["mime_type"] == "audio/wav"
-    assert response.json()["reference_audio"]["storage_path"].endswith(".wav")
-    assert response.json()["reference_audio"]["duration_ms"] >= 1800
-    assert response.json()["voice_profile"]["embedding_path"] is None
-    assert response.json()["voice_profile"]["provider_metadata"]["embedding_status"] == "not_prepared"
+    assert Path(uploaded["reference_audio"]["storage_path"]).exists() is False
+    assert processed["reference_audio"]["status"] == "ready"
+    assert processed["reference_audio"]["mime_type"] == "audio/wav"
+    assert processed["reference_audio"]["storage_path"].endswith(".wav")
+    assert processed["reference_audio"]["duration_ms"] >= 1800
+    assert processed["voice_profile"]["embedding_path"] is None
+    assert processed["voice_profile"]["provider_metadata"]["embedding_status"] == "not_prepared"
     assert stale_embedding.exists() is False
     assert stale_hashed_embedding.exists() is False
 
@@ -521,25 +561,46 @@ def test_reference_audio_upload_rejects_unreadable_audio(auth_client: TestClient
         encoding="utf-8",
     )
     auth_client.get("/character-presets")
+    working_embedding = Path("test_storage") / "voice_lab" / "embeddings" / "vp_host_calm_v1.pth"
+    working_embedding.parent.mkdir(parents=True, exist_ok=True)
+    working_embedding.write_bytes(b"working")
+    with SessionLocal() as db:
+        from app.models import VoiceProfile
+
+        profile = db.get(VoiceProfile, "vp_host_calm_v1")
+        profile.embedding_path = str(working_embedding)
+        profile.provider_metadata_json = {"embedding_status": "ready", "embedding_ready": True}
+        db.commit()
 
-    def fake_run(command, check, capture_output, text):
-        raise subprocess.CalledProcessError(1, command, stderr="invalid data found when processing input")
+    def fake_run(command, check, capture_output):
+        raise subprocess.CalledProcessError(1, command, stderr=b"invalid data found when processing input")
 
     monkeypatch.setattr("app.services.voice_profiles._ffmpeg_binary", lambda: "/usr/bin/ffmpeg")
     monkeypatch.setattr("app.services.voice_profiles.subprocess.run", fake_run)
 
-    response = auth_client.post(
-        "/voice-profiles/reference-audio",
-        files={"file": ("broken.mp3", b"not-audio", "audio/mpeg")},
-        data={
-            "voice_profile_id": "vp_host_calm_v1",
-            "authorization_confirmed": "true",
-            "authorization_note": "owned",
-        },
-    )
+    _uploaded, processed = _upload_reference_audio_and_process(auth_client, monkeypatch, "broken.mp3", b"not-audio")
+
+    assert processed["reference_audio"]["status"] == "failed"
+    assert processed["reference_audio"]["error"]["code"] == "reference_audio_invalid"
+    assert "could not be decoded or normalized" in processed["reference_audio"]["error"]["message"]
+
+    # A clip that decodes but yields no speech chunks is rejected after normalization, before invalidation.
+    monkeypatch.setattr("app.services.voice_profiles.subprocess.run", _fake_reference_audio_ffmpeg_run(seconds=1.8))
+    monkeypatch.setattr("app.services.voice_profiles._select_reference_chunks", lambda speech_windows, duration_ms: [])
+    _uploaded, silent = _upload_reference_audio_and_process(auth_client, monkeypatch, "silent.mp3", b"fake-mp3")
+    assert silent["reference_audio"]["status"] == "failed"
+    assert "usable speech chunks" in silent["reference_audio"]["error"]["message"]
+
+    # A rejected clip leaves the profile's working embedding in place.
+    with SessionLocal() as db:
+        from app.models import VoiceProfile
 
-    assert response.status_code == 400
-    assert "could not be decoded or normalized" in response.json()["detail"]
+        profile = db.get(VoiceProfile, "vp_host_calm_v1")
+        assert profile.embedding_path == str(working_embedding)
+        assert profile.provider_metadata_json["embedding_ready"] is True
+    assert working_embedding.exists()
+    assert processed["voice_profile"]["provider_metadata"]["reference_processing_status"] == "failed"
+    assert processed["voice_profile"]["provider_metadata"]["active_reference_count"] == 0
 
 
 def test_reference_audio_upload_only_trims_leading_silence(auth_client: TestClient, monkeypatch):
@@ -571,18 +632,10 @@ def test_reference_audio_upload_only_trims_leading_silence(auth_client: TestClie
     monkeypatch.setattr("app.services.voice_profiles._ffmpeg_binary", lambda: "/usr/bin/ffmpeg")
     monkeypatch.setattr("app.services.voice_profiles.subprocess.run", _fake_reference_audio_ffmpeg_run(recorded, seconds=2.3))
 
-    response = auth_client.post(
-        "/voice-profiles/reference-audio",
-        files={"file": ("reference.mp3", b"fake-mp3", "audio/mpeg")},
-        data={
-            "voice_profile_id": "vp_host_calm_v1",
-            "authorization_confirmed": "true",
-            "authorization_note": "owned",
-        },
-    )
+    _uploaded, processed = _upload_reference_audio_and_process(auth_client, monkeypatch, "reference.mp3", b"fake-mp3")
 
-    assert response.status_code == 201
-    command = next(command for command in recorded["commands"] if command[-1] != "-" and "-ss" not in command)
+    assert processed["reference_audio"]["status"] == "ready"
+    [command] = recorded["commands"]
     assert "-af" in command
     silence_filter = command[command.index("-af") + 1]
     assert "start_periods=1" in silence_filter
@@ -619,25 +672,101 @@ def test_reference_audio_upload_processes_long_mp3_into_short_chunks(auth_client
     monkeypatch.setattr("app.services.voice_profiles._ffmpeg_binary", lambda: "/usr/bin/ffmpeg")
     monkeypatch.setattr("app.services.voice_profiles.subprocess.run", _fake_reference_audio_ffmpeg_run(recorded, seconds=480.0))
 
-    response = auth_client.post(
-        "/voice-profiles/reference-audio",
-        files={"file": ("long-reference.mp3", b"fake-long-mp3", "audio/mpeg")},
-        data={
-            "voice_profile_id": "vp_host_calm_v1",
-            "authorization_confirmed": "true",
-            "authorization_note": "owned",
-        },
-    )
+    _uploaded, processed = _upload_reference_audio_and_process(auth_client, monkeypatch, "long-reference.mp3", b"fake-long-mp3")
 
-    assert response.status_code == 201
-    metadata = response.json()["voice_profile"]["provider_metadata"]
+    metadata = processed["voice_profile"]["provider_metadata"]
     assert metadata["processed_reference_duration_seconds"] <= 60.0
     assert len(metadata["processed_reference_paths"]) == 6
     assert all(Path(path).exists() for path in metadata["processed_reference_paths"])
     assert all(duration <= 10.0 for duration in metadata["selected_chunk_durations"])
     assert metadata["last_reference_original_filename"] == "long-reference.mp3"
     assert any("voice.reference_audio.uploaded" in record.message for record in caplog.records)
-    assert any("-ss" in command for command in recorded["commands"])
+    assert any("voice.reference_audio.processed" in record.message for record in caplog.records)
+    # Decoding, speech detection and chunking share one ffmpeg run.
+    assert len(recorded["commands"]) == 1
+
+
+def test_reference_speech_windows_split_on_long_silences_only():
+    tone = np.full(16000, 4000, dtype="<i2")
+    silence = np.zeros(16000, dtype="<i2")
+    samples = np.concatenate([silence[:4000], tone, tone, silence, tone, silence[:3200], tone])
+
+    windows = voice_profiles._detect_reference_speech_windows(samples)
+
+    # Only the one-second gap is longer than VOICE_LAB_REFERENCE_SILENCE_MIN_SECONDS, so the 0.2 s pause
+    # stays inside the second window; leading silence is trimmed.
+    assert [(window["start_seconds"], window["end_seconds"]) for window in windows] == [(0.25, 2.25), (3.25, 5.45)]
+    assert voice_profiles._detect_reference_speech_windows(silence) == [{"start_seconds": 0.0, "end_seconds": 1.0, "duration_seconds": 1.0}]
+
+
+def test_speech_segments_use_hysteresis_and_zero_crossings_for_quiet_edges():
+    rng = np.random.default_rng(7)
+    voiced = np.full(8000, 4000, dtype="<i2")
+    # ~-45 dBFS alternating-sign hiss: too quiet to start speech, but fricative-like next to it.
+    hiss = (np.where(np.arange(4000) % 2, 1, -1) * 180 + rng.integers(-20, 20, 4000)).astype("<i2")
+    silence = np.zeros(16000, dtype="<i2")
+    samples = np.concatenate([silence, voiced, hiss, silence, hiss, silence])
+
+    segments = speech_activity.speech_segments(samples, 16000, threshold_db=-40.0, min_silence_seconds=0.35)
+    gated = speech_activity.speech_segments(samples, 16000, threshold_db=-40.0, hysteresis_db=0.0, min_silence_seconds=0.35)
+
+    # The hiss after the vowel extends it; the same hiss on its own never becomes speech.
+    assert segments.tolist() == [[16000, 28000]]
+    assert gated.tolist() == [[16000, 24000]]
+    assert speech_activity.parse_threshold_db("-40dB") == -40.0
+    assert speech_activity.parse_threshold_db("0.01") == pytest.approx(-40.0)
+
+
+def test_reference_audio_upload_streams_to_disk_and_enforces_size_limit_before_processing(auth_client: TestClient, monkeypatch):
+    bundled_file = Path("test_storage") / "bundled" / "character_presets.json"
+    bundled_file.write_text(
+        '[{"id": "host_calm_v1", "display_name": "Host", "speaker_names": ["Host"], "tts_provider": "openvoice", "fallback_provider": "espeak"}]\n',
+        encoding="utf-8",
+    )
+    auth_client.get("/character-presets")
+    queued = []
+    monkeypatch.setattr(task_signatures.process_reference_audio, "apply_async", lambda *, kwargs, task_id: queued.append(kwargs))
+    monkeypatch.setattr("app.services.voice_profiles.UPLOAD_CHUNK_BYTES", 1024)
+    monkeypatch.setattr(settings, "VOICE_LAB_MAX_REFERENCE_AUDIO_SIZE_BYTES", 8 * 1024)
+    reference_dir = Path("test_storage") / "voice_lab" / "reference_audio"
+
+    def upload(content: bytes):
+        return auth_client.post(
+            "/voice-profiles/reference-audio",
+            files={"file": ("reference.mp3", content, "audio/mpeg")},
+            data={"voice_profile_id": "vp_host_calm_v1", "authorization_confirmed": "true"},
+        )
+
+    too_large = upload(b"x" * (8 * 1024 + 1))
+    assert too_large.status_code == 413
+    assert queued == []
+    assert list(reference_dir.glob("*_raw*")) == []
+
+    content = bytes(range(256)) * 20
+    response = upload(content)
+    assert response.status_code == 202
+    reference = response.json()["reference_audio"]
+    assert reference["status"] == "processing"
+    assert reference["sha256"] == hashlib.sha256(content).hexdigest()
+    assert Path(reference["storage_path"]).read_bytes() == content
+    assert queued == [{"reference_audio_id": reference["id"]}]
+    # A clip that is still processing must not feed the speaker embedding.
+    assert response.json()["voice_profile"]["provider_metadata"]["active_reference_count"] == 0
+
+    # The queued task never runs; the beat reconcile fails the clip once it is past the task time limit.
+    from app.models import VoiceReferenceAudio
+    from app.tasks.voice_preview import reconcile_stale_reference_audio_task
+
+    assert reconcile_stale_reference_audio_task()["reconciled"] == 0
+    with SessionLocal() as db:
+        db.get(VoiceReferenceAudio, reference["id"]).created_at = datetime.utcnow() - timedelta(minutes=20)
+        db.commit()
+    assert reconcile_stale_reference_audio_task() == {"reconciled": 1, "reference_audio_ids": [reference["id"]]}
+    with SessionLocal() as db:
+        stale = db.get(VoiceReferenceAudio, reference["id"])
+        assert stale.status == "failed"
+        assert stale.error_json["code"] == "reference_audio_worker_lost"
+    assert not Path(reference["storage_path"]).exists()
 
 
 def test_prepare_voice_profile_persists_embedding_metadata(auth_client: TestClient, monkeypatch):
@@ -1083,6 +1212,493 @@ def test_tts_orchestrator_marks_fallback_used_when_second_provider_succeeds(tmp_
     assert result.fallback_used is True
 
 
+def test_provider_health_is_probed_once_across_orchestrators_until_config_changes_or_failure(monkeypatch, tmp_path: Path):
+    from app.services.tts import EspeakProvider, ProviderRegistry
+
+    probes: list[str] = []
+    lines: list[str] = []
+
+    def fake_probe(self):
+        probes.append(self.provider_name)
+        return {"available": self.provider_name == "espeak", "reason": None if self.provider_name == "espeak" else "disabled", "metadata": {}}
+
+    def fake_espeak_line(self, text, voice_profile, output_path, options):
+        lines.append(text)
+        if text == "fail":
+            raise TextToSpeechError(code="synthesis_failure", message="espeak exploded")
+        if text == "gone":
+            raise TextToSpeechError(code="espeak_not_installed", message="espeak-ng is not installed")
+        _write_wav(output_path, seconds=0.8)
+        return {"audio_path": str(output_path), "voice": "en-us", "duration_seconds": 0.8, "provider_used": "espeak"}
+
+    monkeypatch.setattr(EspeakProvider, "_probe_health", fake_probe)
+    monkeypatch.setattr(OpenVoiceProvider, "_probe_health", fake_probe)
+    monkeypatch.setattr(EspeakProvider, "synthesize_line", fake_espeak_line)
+    profile = {"id": "vp_health", "provider": "espeak", "voice": "en-us", "controls": {}}
+
+    for index in range(3):
+        TTSOrchestrator(registry=ProviderRegistry()).synthesize_line(
+            text=f"line {index}", voice_profile=profile, output_path=tmp_path / f"{index}.wav", fallback_allowed=False
+        )
+    assert probes == ["espeak", "openvoice"]
+
+    monkeypatch.setattr(settings, "OPENVOICE_DEVICE", "cpu")
+    assert TTSOrchestrator().provider_state()["openvoice"]["reason"] == "disabled"
+    assert probes == ["espeak", "openvoice", "openvoice"]
+
+    # A failed line keeps the cached health; only an availability error forces a re-probe.
+    with pytest.raises(TextToSpeechError):
+        TTSOrchestrator().synthesize_line(text="fail", voice_profile=profile, output_path=tmp_path / "fail.wav", fallback_allowed=False)
+    TTSOrchestrator().provider_state()
+    assert probes == ["espeak", "openvoice", "openvoice"]
+    with pytest.raises(TextToSpeechError):
+        TTSOrchestrator().synthesize_line(text="gone", voice_profile=profile, output_path=tmp_path / "gone.wav", fallback_allowed=False)
+    TTSOrchestrator().provider_state()
+    assert probes == ["espeak", "openvoice", "openvoice", "espeak"]
+
+    monkeypatch.setattr(settings, "TTS_PROVIDER_HEALTH_TTL_SECONDS", 0.0)
+    TTSOrchestrator().provider_state()
+    assert probes[-2:] == ["espeak", "openvoice"]
+
+    # When the entry expires, concurrent callers wait for one probe instead of each probing.
+    monkeypatch.setattr(settings, "TTS_PROVIDER_HEALTH_TTL_SECONDS", 60.0)
+    provider_health_cache.invalidate()
+    probe_started = threading.Event()
+    release_probe = threading.Event()
+
+    def slow_probe(self):
+        probes.append("slow")
+        probe_started.set()
+        release_probe.wait(5)
+        return {"available": True, "reason": None, "metadata": {}}
+
+    monkeypatch.setattr(EspeakProvider, "_probe_health", slow_probe)
+    threads = [threading.Thread(target=EspeakProvider().healthcheck) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    probe_started.wait(5)
+    time.sleep(0.05)
+    release_probe.set()
+    for thread in threads:
+        thread.join()
+    assert probes.count("slow") == 1
+
+
+def test_worker_warmup_runs_the_queue_manifest_and_reports_readiness(client: TestClient, monkeypatch):
+    from app.services import worker_warmup
+
+    ran: list[str] = []
+
+    def step(name, fail=False):
+        def run():
+            ran.append(name)
+            if fail:
+                raise RuntimeError("checkpoint missing")
+            return {"loaded": name}
+
+        return run
+
+    monkeypatch.setattr(
+        worker_warmup,
+        "WARMUP_STEPS",
+        {name: step(name, fail=name == "openvoice") for name in ("render_imports", "fonts", "ffmpeg", "espeak", "openvoice")},
+    )
+    assert client.get("/health/workers").status_code == 503
+
+    report = worker_warmup.run_worker_warmup(["voice_preview", "publish"])
+    response = client.get("/health/workers")
+
+    # Voice-preview children skip the render imports and fonts; a failed step degrades rather than aborts.
+    assert ran == ["ffmpeg", "espeak", "openvoice"]
+    assert report["status"] == "degraded"
+    assert [step["ok"] for step in report["steps"]] == [True, True, False]
+    assert all(step["seconds"] >= 0 for step in report["steps"])
+    assert response.status_code == 200
+    assert response.json()["ready_queues"] == ["publish", "voice_preview"]
+    assert response.json()["workers"][0]["steps"][2]["error"] == "RuntimeError: checkpoint missing"
+
+    # Killed children never clear their reports: one whose pid is gone and one whose heartbeat lapsed.
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    killed = worker_warmup.warmup_report_dir() / "killed.json"
+    killed.write_text(json.dumps({"hostname": report["hostname"], "pid": dead.pid, "status": "warming", "queues": ["generation"]}))
+    remote = worker_warmup.warmup_report_dir() / "remote.json"
+    remote.write_text(json.dumps({"hostname": "other-host", "pid": 1, "status": "ready", "queues": ["generation"]}))
+    os.utime(remote, (time.time() - 3600, time.time() - 3600))
+    assert client.get("/health/workers").json()["ready_queues"] == ["publish", "voice_preview"]
+    assert not killed.exists() and not remote.exists()
+
+    worker_warmup.clear_worker_warmup_report()
+    assert client.get("/health/workers").status_code == 503
+
+
+API_DEFERRED_MODULES = (
+    "alembic",
+    "moviepy",
+    "numpy",
+    "PIL",
+    "app.services.rendering",
+    "app.services.tts",
+    "app.tasks.generation",
+    "app.tasks.publish",
+    "app.tasks.voice_preview",
+)
+# Cold-start budget for the API process. Wall clock and RSS depend on the host, so the benchmark is
+# opt-in: run it with API_STARTUP_BENCHMARK=1 on a known machine.
+API_IMPORT_BUDGET_SECONDS = float(os.environ.get("API_IMPORT_BUDGET_SECONDS", "3.0"))
+API_IMPORT_RSS_BUDGET_MB = float(os.environ.get("API_IMPORT_RSS_BUDGET_MB", "115"))
+
+
+def _cold_import_api() -> dict:
+    probe = (
+        "import json, re, sys, time\n"
+        "started = time.perf_counter()\n"
+        "import app.main\n"
+        "seconds = time.perf_counter() - started\n"
+        # ru_maxrss survives exec, so it would report the pytest parent's peak; read the live RSS instead.
+        "rss_kb = int(re.search(r'VmRSS:\\s+(\\d+)', open('/proc/self/status').read()).group(1))\n"
+        "print(json.dumps({'seconds': seconds, 'rss_mb': rss_kb / 1024,"
+        f" 'loaded': sorted(name for name in {API_DEFERRED_MODULES!r} if name in sys.modules)}}))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[2])}
+    return json.loads(subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True, env=env).stdout)
+
+
+def test_api_cold_import_defers_media_ml_and_task_modules():
+    assert _cold_import_api()["loaded"] == []
+
+
+@pytest.mark.skipif(not os.environ.get("API_STARTUP_BENCHMARK"), reason="set API_STARTUP_BENCHMARK=1 to run the startup benchmark")
+def test_api_cold_import_stays_within_its_startup_budget():
+    # Best of three cold interpreters, so one noisy run does not fail the budget.
+    runs = [_cold_import_api() for _ in range(3)]
+
+    assert min(run["seconds"] for run in runs) < API_IMPORT_BUDGET_SECONDS
+    assert min(run["rss_mb"] for run in runs) < API_IMPORT_RSS_BUDGET_MB
+
+
+def test_voice_cache_links_hits_from_its_index_and_evicts_by_budget_and_ttl(auth_client: TestClient, monkeypatch, tmp_path: Path):
+    for key, seconds in [("old", 1.0), ("fresh", 2.0)]:
+        _write_wav(tmp_path / f"{key}.wav", seconds=seconds)
+        voice_cache.store_voice_cache_entry(key, tmp_path / f"{key}.wav")
+    monkeypatch.setattr(voice_cache, "_wav_duration", lambda path: pytest.fail("hits must use the indexed duration"))
+
+    hit = voice_cache.materialize_voice_cache_entry("fresh", tmp_path / "render" / "000.wav")
+    miss = voice_cache.materialize_voice_cache_entry("missing", tmp_path / "render" / "001.wav")
+
+    assert hit == {"size_bytes": (tmp_path / "fresh.wav").stat().st_size, "duration_seconds": 2.0}
+    assert miss is None
+    assert (tmp_path / "render" / "000.wav").stat().st_ino == (tmp_path / "fresh.wav").stat().st_ino
+    stats = auth_client.get("/tts/cache").json()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["hit_rate"]) == (1, 1, 2, 0.5)
+    assert stats["bytes_served"] == hit["size_bytes"]
+
+    size = hit["size_bytes"]
+    assert voice_cache.evict_voice_cache(max_bytes=size * 2, ttl_seconds=0) == []
+    assert voice_cache.evict_voice_cache(max_bytes=size, ttl_seconds=0) == ["old"]
+    time.sleep(0.01)
+    assert voice_cache.evict_voice_cache(max_bytes=size * 2, ttl_seconds=0.005) == ["fresh"]
+    assert (tmp_path / "render" / "000.wav").exists()
+    assert voice_cache.voice_cache_stats()["evictions"] == 2
+
+
+def test_openvoice_provider_delegates_to_shared_model_server(monkeypatch):
+    import tempfile
+
+    from app.services.openvoice_server import LocalOpenVoiceProvider, OpenVoiceServer
+
+    loads = {"count": 0}
+
+    class FakeLocalProvider(LocalOpenVoiceProvider):
+        def healthcheck(self):
+            return {"available": True, "reason": None, "metadata": {"device": "cpu"}}
+
+        def synthesize_line(self, text, voice_profile, output_path, options):
+            if text == "boom":
+                raise TextToSpeechError(code="synthesis_failure", message="OpenVoice synthesis failed: boom")
+            loads["count"] += 1
+            options["stage_callback"]("converting", 70)
+            _write_wav(output_path, seconds=0.8)
+            voice_profile["embedding_path"] = "/embeddings/vp_host.pt"
+            return {"audio_path": str(output_path), "voice": "clone", "duration_seconds": 0.8, "provider_used": "openvoice"}
+
+    socket_dir = Path(tempfile.mkdtemp(prefix="ov", dir="/tmp"))
+    server = OpenVoiceServer(socket_dir / "openvoice.sock", provider=FakeLocalProvider())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        monkeypatch.setattr(settings, "OPENVOICE_ENABLED", True)
+        monkeypatch.setattr(settings, "OPENVOICE_SERVER_SOCKET", str(socket_dir / "openvoice.sock"))
+        provider = OpenVoiceProvider()
+        voice_profile = {"id": "vp_host", "controls": {}}
+        stages: list[tuple[str, int]] = []
+        output_path = Path("test_storage") / "served.wav"
+
+        health = provider.healthcheck()
+        result = provider.synthesize_line(
+            text="Hello from the server.",
+            voice_profile=voice_profile,
+            output_path=output_path,
+            options={"stage_callback": lambda stage, progress: stages.append((stage, progress))},
+        )
+        with pytest.raises(TextToSpeechError) as failure:
+            provider.synthesize_line(text="boom", voice_profile=voice_profile, output_path=output_path, options={})
+        # A failed line is not an outage, so the cached health survives it.
+        health_after_failure = provider.healthcheck()
+    finally:
+        server.shutdown()
+        server.server_close()
+        (socket_dir / "openvoice.sock").unlink(missing_ok=True)
+        socket_dir.rmdir()
+    with pytest.raises(TextToSpeechError) as unreachable:
+        provider.synthesize_line(text="Anyone there?", voice_profile=voice_profile, output_path=output_path, options={})
+
+    assert health["available"] is True
+    assert health["metadata"]["server_socket"] == str(socket_dir / "openvoice.sock")
+    assert result["provider_used"] == "openvoice"
+    assert output_path.exists()
+    assert voice_profile["embedding_path"] == "/embeddings/vp_host.pt"
+    assert stages == [("converting", 70)]
+    assert failure.value.code == "synthesis_failure"
+    assert health_after_failure["available"] is True
+    assert loads["count"] == 1
+    assert unreachable.value.code == "openvoice_server_unavailable"
+    assert provider.healthcheck()["reason"] == "server_unavailable"
+
+
+def test_openvoice_server_keeps_queued_and_batching_clients_alive_past_their_read_timeout(tmp_path: Path):
+    import tempfile
+
+    from app.services.openvoice_server import LocalOpenVoiceProvider, OpenVoiceClient, OpenVoiceServer
+
+    started = threading.Event()
+    release = threading.Event()
+
+    class SlowLocalProvider(LocalOpenVoiceProvider):
+        def synthesize_line(self, text, voice_profile, output_path, options):
+            if text == "slow":
+                started.set()
+                assert release.wait(timeout=5)
+            _write_wav(output_path, seconds=0.5)
+            return {"audio_path": str(output_path), "voice": "clone", "duration_seconds": 0.5, "provider_used": "openvoice"}
+
+        def synthesize_batch(self, items, voice_profile):
+            # A batch reports no stages of its own while it runs.
+            time.sleep(0.8)
+            for item in items:
+                _write_wav(item["output_path"], seconds=0.5)
+            return [{"audio_path": str(item["output_path"])} for item in items]
+
+    socket_dir = Path(tempfile.mkdtemp(prefix="ov", dir="/tmp"))
+    server = OpenVoiceServer(socket_dir / "openvoice.sock", provider=SlowLocalProvider(), keepalive_seconds=0.05)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    stages: list[tuple[str, int]] = []
+    try:
+        client = OpenVoiceClient(socket_dir / "openvoice.sock", timeout=0.3)
+        first = threading.Thread(
+            target=OpenVoiceClient(socket_dir / "openvoice.sock", timeout=5).synthesize_line,
+            kwargs={"text": "slow", "voice_profile": {}, "output_path": tmp_path / "slow.wav", "options": {}},
+        )
+        first.start()
+        assert started.wait(timeout=5)
+        threading.Timer(0.8, release.set).start()
+        # Queued behind the slow line for longer than its own timeout, yet never idle on the socket.
+        result = client.synthesize_line(
+            text="queued",
+            voice_profile={},
+            output_path=tmp_path / "queued.wav",
+            options={"stage_callback": lambda stage, progress: stages.append((stage, progress))},
+        )
+        first.join(timeout=5)
+        batch = client.synthesize_batch(items=[{"text": "one", "output_path": tmp_path / "one.wav"}], voice_profile={})
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+        (socket_dir / "openvoice.sock").unlink(missing_ok=True)
+        socket_dir.rmdir()
+
+    assert result["duration_seconds"] == 0.5
+    assert (tmp_path / "queued.wav").exists()
+    assert stages == []
+    assert batch == [{"audio_path": str(tmp_path / "one.wav")}]
+
+
+def test_tts_orchestrator_batches_uncached_openvoice_lines_per_voice_profile(tmp_path: Path):
+    calls: dict[str, list] = {"batch": [], "line": []}
+
+    class BatchProvider(StubProvider):
+        batch_capable = True
+
+        def synthesize_line(self, *, text, voice_profile, output_path, options=None):
+            calls["line"].append(text)
+            return super().synthesize_line(text=text, voice_profile=voice_profile, output_path=output_path)
+
+        def synthesize_batch(self, items, voice_profile):
+            calls["batch"].append([item["text"] for item in items])
+            for index, item in enumerate(items):
+                _write_wav(item["output_path"], seconds=0.7 + index / 10)
+            return [{"audio_path": str(item["output_path"])} for item in items]
+
+    orchestrator = TTSOrchestrator(
+        registry=StubRegistry(
+            {"openvoice": BatchProvider(response={"provider_used": "openvoice"}), "espeak": StubProvider(response={"provider_used": "espeak"})},
+            {"openvoice": {"available": True, "reason": None}, "espeak": {"available": True, "reason": None}},
+        )
+    )
+    voice_profile_map = {
+        "Host": {"id": "vp_batch_host", "provider": "openvoice", "voice": "clone", "reference_audios": [], "controls": {}},
+        "Guest": {"id": "vp_batch_guest", "provider": "espeak", "voice": "en-gb+m3", "reference_audios": [], "controls": {}},
+    }
+    lines = [
+        {"speaker": "Host", "text": "First batched line."},
+        {"speaker": "Guest", "text": "An espeak line."},
+        {"speaker": "Host", "text": "Second batched line."},
+        {"speaker": "Host", "text": "Third batched line."},
+    ]
+
+    segments = orchestrator.synthesize_dialogue(lines=lines, voice_profile_map=voice_profile_map, output_dir=tmp_path / "first")
+    again = orchestrator.synthesize_dialogue(lines=lines, voice_profile_map=voice_profile_map, output_dir=tmp_path / "again")
+
+    assert calls["batch"] == [["First batched line.", "Second batched line.", "Third batched line."]]
+    assert calls["line"] == []
+    assert [segment.provider_used for segment in segments] == ["openvoice", "espeak", "openvoice", "openvoice"]
+    assert [segment.duration_seconds for segment in segments if segment.provider_used == "openvoice"] == pytest.approx([0.7, 0.8, 0.9], abs=1e-3)
+    assert [segment.duration_seconds for segment in again if segment.provider_used == "openvoice"] == [
+        segment.duration_seconds for segment in segments if segment.provider_used == "openvoice"
+    ]
+    assert not list((tmp_path / "first").glob("*_batch.wav"))
+
+
+def test_tts_orchestrator_yields_unbatched_lines_before_a_batch_finishes(tmp_path: Path):
+    release = threading.Event()
+
+    class BlockingBatchProvider(StubProvider):
+        batch_capable = True
+
+        def synthesize_batch(self, items, voice_profile):
+            assert release.wait(timeout=5)
+            for item in items:
+                _write_wav(item["output_path"], seconds=0.7)
+            return [{"audio_path": str(item["output_path"])} for item in items]
+
+    orchestrator = TTSOrchestrator(
+        registry=StubRegistry(
+            {"openvoice": BlockingBatchProvider(response={"provider_used": "openvoice"}), "espeak": StubProvider(response={"provider_used": "espeak"})},
+            {"openvoice": {"available": True, "reason": None}, "espeak": {"available": True, "reason": None}},
+        )
+    )
+    voice_profile_map = {
+        "Host": {"id": "vp_stream_host", "provider": "openvoice", "voice": "clone", "reference_audios": [], "controls": {}},
+        "Guest": {"id": "vp_stream_guest", "provider": "espeak", "voice": "en-gb+m3", "reference_audios": [], "controls": {}},
+    }
+    lines = [
+        {"speaker": "Guest", "text": "An espeak opener."},
+        {"speaker": "Host", "text": "First streamed batch line."},
+        {"speaker": "Host", "text": "Second streamed batch line."},
+    ]
+
+    stream = orchestrator.iter_dialogue(lines=lines, voice_profile_map=voice_profile_map, output_dir=tmp_path, max_workers=1)
+    first = next(stream)
+    assert first.provider_used == "espeak"
+    release.set()
+    rest = list(stream)
+
+    assert [segment.provider_used for segment in rest] == ["openvoice", "openvoice"]
+    assert [segment.duration_seconds for segment in rest] == pytest.approx([0.7, 0.7], abs=1e-3)
+
+
+def test_native_espeak_caps_its_concurrency_and_reloads_when_the_library_setting_changes(monkeypatch):
+    from app.services import espeak_native
+    from app.services.tts import provider_concurrency_limits
+
+    monkeypatch.setattr(espeak_native, "_libraries", {})
+    monkeypatch.setattr(espeak_native, "_libraries_by_path", {})
+    monkeypatch.setattr(espeak_native.ctypes, "CDLL", lambda path: path)
+    monkeypatch.setattr(espeak_native, "EspeakLibrary", lambda lib: SimpleNamespace(path=lib))
+
+    monkeypatch.setattr(settings, "TTS_ESPEAK_LIBRARY", "/opt/espeak/a.so")
+    first = espeak_native.espeak_library()
+    monkeypatch.setattr(settings, "TTS_ESPEAK_LIBRARY", "/opt/espeak/b.so")
+    second = espeak_native.espeak_library()
+    monkeypatch.setattr(settings, "TTS_ESPEAK_LIBRARY", "/opt/espeak/a.so")
+    again = espeak_native.espeak_library()
+    monkeypatch.setattr(settings, "TTS_ESPEAK_LIBRARY", "")
+    disabled = espeak_native.espeak_library()
+
+    assert (first.path, second.path) == ("/opt/espeak/a.so", "/opt/espeak/b.so")
+    assert again is first
+    assert disabled is None
+
+    monkeypatch.setattr(settings, "TTS_PROVIDER_CONCURRENCY", "espeak=4,openvoice=1")
+    assert provider_concurrency_limits() == {"espeak": 4, "openvoice": 1}
+    monkeypatch.setattr(settings, "TTS_ESPEAK_LIBRARY", "/opt/espeak/a.so")
+    # One library lock serialises in-process synthesis, so extra slots would only queue on it.
+    assert provider_concurrency_limits() == {"espeak": 1, "openvoice": 1}
+
+
+def test_tts_orchestrator_parallel_dialogue_matches_serial_order_and_limits_openvoice(monkeypatch, tmp_path: Path):
+    in_flight = {"espeak": 0, "openvoice": 0}
+    peak = {"espeak": 0, "openvoice": 0}
+    lock = threading.Lock()
+
+    class SlowProvider(StubProvider):
+        def synthesize_line(self, *, text, voice_profile, output_path, options=None):
+            name = self.response["provider_used"]
+            with lock:
+                in_flight[name] += 1
+                peak[name] = max(peak[name], in_flight[name])
+            time.sleep(0.02)
+            with lock:
+                in_flight[name] -= 1
+            return {**super().synthesize_line(text=text, voice_profile=voice_profile, output_path=output_path), "duration_seconds": len(text) / 10}
+
+    monkeypatch.setattr(settings, "TTS_PROVIDER_CONCURRENCY", "espeak=4,openvoice=1")
+    monkeypatch.setattr("app.services.tts.espeak_library", lambda: None)
+    monkeypatch.setattr(TTSOrchestrator, "_provider_slots", {})
+    monkeypatch.setattr(TTSOrchestrator, "_materialize_cached_audio", lambda self, key, output_path: None)
+    monkeypatch.setattr(TTSOrchestrator, "_save_to_cache", lambda self, key, output_path: None)
+    orchestrator = TTSOrchestrator(
+        registry=StubRegistry(
+            {
+                "openvoice": SlowProvider(response={"provider_used": "openvoice"}),
+                "espeak": SlowProvider(response={"provider_used": "espeak"}),
+            },
+            {"openvoice": {"available": True, "reason": None}, "espeak": {"available": True, "reason": None}},
+        )
+    )
+    voice_profile_map = {
+        "Host": {"id": "vp_host", "provider": "openvoice", "voice": "clone", "reference_audios": [], "controls": {}},
+        "Guest": {"id": "vp_guest", "provider": "espeak", "voice": "en-gb+m3", "reference_audios": [], "controls": {}},
+        "Narrator": {"id": "vp_narrator", "provider": "espeak", "voice": "en-us+f3", "reference_audios": [], "controls": {}},
+    }
+    lines = [
+        {"speaker": speaker, "text": f"{speaker} line {index}" + "!" * index}
+        for index, speaker in enumerate(["Host", "Guest", "Narrator", "Guest", "Host", "Narrator", "Guest", "Host"])
+    ]
+    lines.insert(3, {"speaker": "Guest", "text": "   "})
+
+    serial = orchestrator.synthesize_dialogue(lines=lines, voice_profile_map=voice_profile_map, output_dir=tmp_path / "serial", max_workers=1)
+    parallel = orchestrator.synthesize_dialogue(lines=lines, voice_profile_map=voice_profile_map, output_dir=tmp_path / "parallel", max_workers=6)
+
+    def comparable(segment):
+        return (segment.speaker, segment.text, segment.slot_index, segment.provider_used, segment.duration_seconds, Path(segment.audio_path).name[:3])
+
+    assert [comparable(segment) for segment in parallel] == [comparable(segment) for segment in serial]
+    assert [segment.slot_index for segment in parallel] == [0, 1, 2, 1, 0, 2, 1, 0]
+    assert peak["openvoice"] == 1
+    assert peak["espeak"] > 1
+
+
+    monkeypatch.setattr(settings, "TTS_PROVIDER_CONCURRENCY", "espeak=4,openvoice=2")
+    peak["openvoice"] = 0
+    orchestrator.synthesize_dialogue(lines=lines, voice_profile_map=voice_profile_map, output_dir=tmp_path / "raised", max_workers=6)
+
+    # The raised limit applies to the running process rather than the semaphore built for the old one.
+    assert peak["openvoice"] == 2
+
+
 def test_tts_orchestrator_returns_provider_error_when_explicit_provider_cannot_fallback(tmp_path: Path):
     orchestrator = TTSOrchestrator(
         registry=StubRegistry(
@@ -1144,7 +1760,7 @@ def test_openvoice_prepare_voice_profile_uses_all_reference_clips(monkeypatch, t
     monkeypatch.setattr(provider, "_import_runtime", lambda: (None, "se_extractor", "converter_cls", "torch_module"))
     monkeypatch.setattr(provider, "_get_converter", lambda converter_dir, device, converter_cls: object())
 
-    def fake_get_target_embedding(reference_paths, converter, se_extractor, device, torch_module, artifact_path=None):
+    def fake_get_target_embedding(reference_paths, converter, se_extractor, device, torch_module, artifact_path=None, aggregate_path=None):
         recorded["reference_paths"] = [str(path) for path in reference_paths]
         recorded["artifact_path"] = str(artifact_path)
         return "embedding"
@@ -1189,7 +1805,7 @@ def test_openvoice_prepare_voice_profile_uses_processed_reference_chunks(monkeyp
     monkeypatch.setattr(provider, "_import_runtime", lambda: (None, "se_extractor", "converter_cls", "torch_module"))
     monkeypatch.setattr(provider, "_get_converter", lambda converter_dir, device, converter_cls: object())
 
-    def fake_get_target_embedding(reference_paths, converter, se_extractor, device, torch_module, artifact_path=None):
+    def fake_get_target_embedding(reference_paths, converter, se_extractor, device, torch_module, artifact_path=None, aggregate_path=None):
         recorded["reference_paths"] = [str(path) for path in reference_paths]
         recorded["artifact_path"] = str(artifact_path)
         return "embedding"
@@ -1248,7 +1864,7 @@ def test_openvoice_unchanged_reference_reuses_cached_embedding_artifact(monkeypa
         raise AssertionError("unchanged references should reuse the cached embedding artifact")
 
     monkeypatch.setattr(provider, "_load_cached_target_embedding", fake_load_cached_target_embedding)
-    monkeypatch.setattr(provider, "_extract_reference_embedding", fail_extract)
+    monkeypatch.setattr(provider, "_extract_reference_embeddings", fail_extract)
 
     result = provider._get_target_embedding(
         [reference_path],
@@ -1263,25 +1879,163 @@ def test_openvoice_unchanged_reference_reuses_cached_embedding_artifact(monkeypa
     assert recorded["path"] == str(artifact_path)
 
 
-def test_openvoice_extract_reference_embedding_disables_vad(monkeypatch, tmp_path: Path):
+class _FakeEmbedding(np.ndarray):
+    def detach(self):
+        return self
+
+    def cpu(self):
+        return self
+
+
+class _FakeTorch:
+    def save(self, obj, path):
+        Path(path).write_bytes(pickle.dumps(obj))
+
+    def load(self, path, map_location=None):
+        return pickle.loads(Path(path).read_bytes())
+
+
+class _FakeBatchConverter:
+    """Embeds each piece as [duration, peak] so batching and averaging are observable."""
+
+    def __init__(self):
+        self.batches: list[list[tuple[float, int]]] = []
+        self.whole_files: list[str] = []
+
+    def extract_se_batch(self, audios, sampling_rate):
+        pieces = [(piece.size / sampling_rate, int(round(np.abs(piece).min() * 32768))) for piece in audios]
+        self.batches.append(pieces)
+        return np.array(pieces, dtype=np.float32)[:, :, None].view(_FakeEmbedding)
+
+    def extract_se(self, ref_wav_list):
+        self.whole_files.extend(Path(path).name for path in ref_wav_list)
+        return np.full((1, 2, 1), -1.0, dtype=np.float32).view(_FakeEmbedding)
+
+
+def test_openvoice_extract_reference_embedding_segments_with_builtin_vad(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(OpenVoiceProvider, "_target_embedding_cache", {})
     provider = OpenVoiceProvider()
     reference_path = tmp_path / "reference.wav"
-    _write_wav(reference_path, sample=b"\x06\x00")
-    recorded: dict[str, object] = {}
+    tone = np.full(16000, 4000, dtype="<i2")
+    silence = np.zeros(16000, dtype="<i2")
+    speech_activity.write_pcm16(reference_path, np.concatenate([silence, np.tile(tone, 12), silence, np.tile(tone, 11), silence]), 16000)
+    converter = _FakeBatchConverter()
 
-    class FakeSeExtractor:
-        def get_se(self, path, converter, vad):
-            recorded["path"] = path
-            recorded["vad"] = vad
-            return "target-embedding", None
+    monkeypatch.setattr(provider, "_import_runtime", lambda: (None, speech_activity, None, None))
+    _tts, se_extractor, _converter_cls, _torch = provider._import_runtime()
+    [result] = provider._extract_reference_embeddings([reference_path], converter, se_extractor, "cpu", _FakeTorch())
 
-    result = provider._extract_reference_embedding(reference_path, object(), FakeSeExtractor(), "cpu")
+    # 23 s of speech with the silences dropped, split like OpenVoice's VAD splitter into ~10 s pieces.
+    assert converter.batches == [[(11.5, 4000), (11.5, 4000)]]
+    assert result.shape == (1, 2, 1)
+    assert result[0, :, 0].tolist() == [11.5, 4000.0]
 
-    assert result == "target-embedding"
-    assert recorded == {"path": str(reference_path), "vad": False}
+
+def test_openvoice_reference_embeddings_batch_new_clips_and_reuse_cached_chunks(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(OpenVoiceProvider, "_target_embedding_cache", {})
+    provider = OpenVoiceProvider()
+    paths = []
+    for index, seconds in enumerate((2, 3, 4)):
+        path = tmp_path / f"reference_{index}.wav"
+        speech_activity.write_pcm16(path, np.full(16000 * seconds, 3000 + index, dtype="<i2"), 16000)
+        paths.append(path)
+    converter = _FakeBatchConverter()
+
+    first = provider._extract_reference_embeddings(paths[:2], converter, speech_activity, "cpu", _FakeTorch())
+    OpenVoiceProvider._target_embedding_cache.clear()
+    second = provider._extract_reference_embeddings(paths, converter, speech_activity, "cpu", _FakeTorch())
+
+    # Both original clips went through one batch; adding a third only embeds the new one, and the
+    # first two come back from the on-disk chunk cache after the in-memory cache is dropped.
+    assert converter.batches == [[(2.0, 3000), (3.0, 3001)], [(4.0, 3002)]]
+    assert [embedding[0, 0, 0] for embedding in second] == [2.0, 3.0, 4.0]
+    assert np.array_equal(first[1], second[1])
+
+
+def test_openvoice_reference_embeddings_fall_back_for_non_pcm_clips_and_track_the_checkpoint(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(OpenVoiceProvider, "_target_embedding_cache", {})
+    monkeypatch.setattr(settings, "OPENVOICE_CHECKPOINTS_DIR", str(tmp_path / "checkpoints_v2"))
+    checkpoint = tmp_path / "checkpoints_v2" / "converter" / "checkpoint.pth"
+    checkpoint.parent.mkdir(parents=True)
+    checkpoint.write_bytes(b"model-a")
+    provider = OpenVoiceProvider()
+    wav_path = tmp_path / "reference.wav"
+    speech_activity.write_pcm16(wav_path, np.full(32000, 3000, dtype="<i2"), 16000)
+    mp3_path = tmp_path / "legacy.mp3"
+    mp3_path.write_bytes(b"ID3" + b"\x00" * 64)
+    converter = _FakeBatchConverter()
+
+    wav_embedding, mp3_embedding = provider._extract_reference_embeddings([wav_path, mp3_path], converter, speech_activity, "cpu", _FakeTorch())
+    OpenVoiceProvider._target_embedding_cache.clear()
+    provider._extract_reference_embeddings([wav_path], converter, speech_activity, "cpu", _FakeTorch())
+    checkpoint.write_bytes(b"model-b, retrained")
+    provider._extract_reference_embeddings([wav_path], converter, speech_activity, "cpu", _FakeTorch())
+
+    # The MP3 is embedded whole instead of failing the profile; the WAV is reused until the converter changes.
+    assert converter.whole_files == ["legacy.mp3"]
+    assert mp3_embedding[0, :, 0].tolist() == [-1.0, -1.0]
+    assert wav_embedding[0, :, 0].tolist() == [2.0, 3000.0]
+    assert converter.batches == [[(2.0, 3000)], [(2.0, 3000)]]
+    assert not list(voice_profiles.voice_embedding_dir().rglob("*.tmp"))
+
+
+def test_openvoice_embedding_aggregate_folds_in_only_changed_chunks(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(OpenVoiceProvider, "_target_embedding_cache", {})
+    provider = OpenVoiceProvider()
+    paths = []
+    for index, seconds in enumerate((2, 3, 4, 5)):
+        path = tmp_path / f"chunk_{index}.wav"
+        speech_activity.write_pcm16(path, np.full(16000 * seconds, 3000 + index, dtype="<i2"), 16000)
+        paths.append(path)
+    aggregate_path = tmp_path / "vp_test.aggregate.pth"
+    converter = _FakeBatchConverter()
+
+    first = provider._update_embedding_aggregate(paths[:3], converter, speech_activity, "cpu", _FakeTorch(), aggregate_path)
+    second = provider._update_embedding_aggregate([paths[0], paths[2], paths[3]], converter, speech_activity, "cpu", _FakeTorch(), aggregate_path)
+
+    # The second call embeds only the added chunk and subtracts the removed one from the running sum.
+    assert converter.batches == [[(2.0, 3000), (3.0, 3001), (4.0, 3002)], [(5.0, 3003)]]
+    assert first[0, :, 0].tolist() == pytest.approx([3.0, 3001.0])
+    assert second[0, :, 0].tolist() == pytest.approx([11 / 3, 3001 + 2 / 3])
+    aggregate = _FakeTorch().load(aggregate_path)
+    assert aggregate["count"] == 3
+    assert sorted(aggregate["chunks"].values()) == [1, 1, 1]
+
+
+def test_deleting_reference_audio_keeps_other_clips_chunks(auth_client: TestClient, monkeypatch):
+    bundled_file = Path("test_storage") / "bundled" / "character_presets.json"
+    bundled_file.write_text(
+        json.dumps([{"id": "host_calm_v1", "display_name": "Host", "speaker_names": ["Host"], "tts_provider": "openvoice", "voice": "en-us+f3"}]),
+        encoding="utf-8",
+    )
+    auth_client.get("/character-presets")
+    monkeypatch.setattr("app.services.voice_profiles._ffmpeg_binary", lambda: "/usr/bin/ffmpeg")
+    monkeypatch.setattr("app.services.voice_profiles.subprocess.run", _fake_reference_audio_ffmpeg_run(seconds=2.5))
+
+    _first_upload, first = _upload_reference_audio_and_process(auth_client, monkeypatch, "first.mp3", b"first")
+    _second_upload, second = _upload_reference_audio_and_process(auth_client, monkeypatch, "second.mp3", b"second")
+    metadata = second["voice_profile"]["provider_metadata"]
+    first_id, second_id = first["reference_audio"]["id"], second["reference_audio"]["id"]
+    chunks_by_reference = {
+        reference_id: [chunk["path"] for chunk in metadata["processed_reference_chunks"] if chunk["reference_audio_id"] == reference_id]
+        for reference_id in (first_id, second_id)
+    }
+
+    # The second upload no longer wipes the first clip's chunks.
+    assert metadata["processed_reference_audio_ids"] == [first_id, second_id]
+    assert all(Path(path).exists() for paths in chunks_by_reference.values() for path in paths)
+
+    response = auth_client.delete(f"/voice-profiles/vp_host_calm_v1/reference-audio/{first_id}")
+    assert response.status_code == 200
+    assert response.json()["provider_metadata"]["processed_reference_audio_ids"] == [second_id]
+    assert response.json()["provider_metadata"]["embedding_status"] == "not_prepared"
+    assert not any(Path(path).exists() for path in chunks_by_reference[first_id])
+    assert all(Path(path).exists() for path in chunks_by_reference[second_id])
+    assert auth_client.get(f"/voice-profiles/vp_host_calm_v1/reference-audio/{first_id}").status_code == 404
 
 
 def test_openvoice_extract_reference_embedding_fails_closed(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(OpenVoiceProvider, "_target_embedding_cache", {})
     provider = OpenVoiceProvider()
     reference_path = tmp_path / "reference.wav"
     _write_wav(reference_path, sample=b"\x07\x00")
@@ -1292,11 +2046,11 @@ def test_openvoice_extract_reference_embedding_fails_closed(monkeypatch, tmp_pat
     )
 
     class FailingSeExtractor:
-        def get_se(self, path, converter, vad):
+        def embed_references(self, paths, converter, **vad_options):
             raise RuntimeError("bad reference")
 
     with pytest.raises(TextToSpeechError) as exc_info:
-        provider._extract_reference_embedding(reference_path, object(), FailingSeExtractor(), "cpu")
+        provider._extract_reference_embeddings([reference_path], object(), FailingSeExtractor(), "cpu", _FakeTorch())
 
     assert exc_info.value.code == "reference_embedding_extraction_failed"
     assert "generic" not in exc_info.value.message.lower()
@@ -1318,16 +2072,18 @@ def test_openvoice_synthesize_line_passes_selected_profile_target_embedding(monk
     class FakeModel:
         hps = type("Hps", (), {"data": type("Data", (), {"spk2id": {"EN-Default": 0}})()})()
 
-        def tts_to_file(self, text, speaker_id, output_path, speed):
-            _write_wav(Path(output_path), seconds=1.0)
-
     class FakeConverter:
-        def convert(self, audio_src_path, src_se, tgt_se, output_path, message):
-            recorded["audio_src_path"] = audio_src_path
-            recorded["src_se"] = src_se
-            recorded["tgt_se"] = tgt_se
-            recorded["output_path"] = output_path
-            _write_wav(Path(output_path), seconds=1.0)
+        hps = type("Hps", (), {"data": type("Data", (), {"sampling_rate": 22050})()})()
+
+        def add_watermark(self, audio, message):
+            recorded["watermark"] = message
+            return audio
+
+    def fake_convert_batch(converter, sources, src_se, tgt_se, torch_module):
+        recorded["sources"] = sources
+        recorded["src_se"] = src_se
+        recorded["tgt_se"] = tgt_se
+        return [source * 0.5 for source in sources]
 
     fake_converter = FakeConverter()
     monkeypatch.setattr(settings, "OPENVOICE_CHECKPOINTS_DIR", str(tmp_path))
@@ -1339,8 +2095,10 @@ def test_openvoice_synthesize_line_passes_selected_profile_target_embedding(monk
     monkeypatch.setattr(provider, "_import_runtime", lambda: (object, object(), object, object()))
     monkeypatch.setattr(provider, "_get_melo_model", lambda language_code, device, tts_cls: FakeModel())
     monkeypatch.setattr(provider, "_get_converter", lambda converter_dir, device, converter_cls: fake_converter)
-    monkeypatch.setattr(provider, "_get_target_embedding", lambda reference_paths, converter, se_extractor, device, torch_module, artifact_path=None: selected_target)
+    monkeypatch.setattr(provider, "_get_target_embedding", lambda reference_paths, converter, se_extractor, device, torch_module, artifact_path=None, aggregate_path=None: selected_target)
     monkeypatch.setattr(provider, "_get_source_embedding", lambda base_speaker_path, device, torch_module: source_embedding)
+    monkeypatch.setattr(provider, "_melo_source_audio", lambda model, text, speaker_id, speed, converter: np.full(22050, 0.2, dtype=np.float32))
+    monkeypatch.setattr(provider, "_convert_batch", fake_convert_batch)
 
     voice_profile = {
         "id": "vp_selected",
@@ -1362,13 +2120,79 @@ def test_openvoice_synthesize_line_passes_selected_profile_target_embedding(monk
     reference_hash = provider._reference_audio_hash([reference_path])
     assert result["provider_used"] == "openvoice"
     assert result["audio_path"] == str(tmp_path / "preview.wav")
-    assert recorded["audio_src_path"] != result["audio_path"]
+    # Source audio is handed to the converter in memory; no intermediate _src.wav is written.
+    assert [source.shape for source in recorded["sources"]] == [(22050,)]
+    assert not list(tmp_path.glob("*_src.wav"))
+    assert result["pcm"].sample_rate == 22050
+    assert result["duration_seconds"] == pytest.approx(1.0)
+    assert LocalSpeechService()._read_samples(result["audio_path"])[0] == pytest.approx(result["pcm"].samples, abs=1e-4)
+    assert recorded["watermark"] == "@OmniPoster"
     assert recorded["src_se"] == source_embedding
     assert recorded["tgt_se"] == selected_target
     assert voice_profile["embedding_path"].endswith(f"vp_selected_{reference_hash[:16]}.pth")
     assert voice_profile["provider_metadata"]["reference_audio_sha256"] == reference_hash
 
 
+def test_espeak_returns_pcm_that_the_renderer_measures_without_rereading(monkeypatch, tmp_path: Path):
+    from io import BytesIO
+
+    from app.services.tts import EspeakProvider
+
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(22050)
+        handle.writeframes(b"\x00\x10" * 11025)
+    commands: list[list[str]] = []
+
+    def fake_run(command, check, capture_output):
+        commands.append(command)
+        return subprocess.CompletedProcess(command, 0, stdout=buffer.getvalue(), stderr=b"")
+
+    monkeypatch.setattr("app.services.tts.espeak_library", lambda: None)
+    monkeypatch.setattr("app.services.tts.shutil.which", lambda name: "/usr/bin/espeak-ng")
+    monkeypatch.setattr("app.services.tts.subprocess.run", fake_run)
+    result = EspeakProvider().synthesize_line(
+        text="Straight from stdout.", voice_profile={"voice": "en-us"}, output_path=tmp_path / "line.wav", options={}
+    )
+    (tmp_path / "line.wav").unlink()
+    measured = LocalSpeechService().measure_audio(str(tmp_path / "line.wav"), result["pcm"])
+
+    assert "--stdout" in commands[0] and "-w" not in commands[0]
+    assert result["pcm"].duration_seconds == pytest.approx(0.5)
+    assert measured["duration_seconds"] == pytest.approx(0.5)
+    assert measured["gain"] == 1.35
+
+
+def test_espeak_synthesizes_in_process_when_the_library_is_loaded(monkeypatch, tmp_path: Path):
+    from app.services.tts import EspeakProvider
+
+    calls: list[tuple[str, dict[str, object]]] = []
+
+    class FakeLibrary:
+        sample_rate = 22050
+
+        def synthesize(self, text, **voice_settings):
+            calls.append((text, voice_settings))
+            return np.full(11025, 4096, dtype="<i2")
+
+    def fail_run(*args, **kwargs):
+        raise AssertionError("the loaded library must not fork espeak-ng")
+
+    monkeypatch.setattr("app.services.tts.espeak_library", lambda: FakeLibrary())
+    monkeypatch.setattr("app.services.tts.subprocess.run", fail_run)
+    provider = EspeakProvider()
+    profile = {"voice": "en-gb+m3", "espeak_rate": 170, "espeak_pitch": 30, "espeak_word_gap": 2, "espeak_amplitude": 120}
+    result = provider.synthesize_line(text="No fork.", voice_profile=profile, output_path=tmp_path / "line.wav", options={})
+
+    assert provider.healthcheck()["metadata"]["backend"] == "library"
+    assert calls == [("No fork.", {"voice": "en-gb+m3", "rate": 170, "pitch": 30, "word_gap": 2, "amplitude": 120})]
+    assert result["pcm"].duration_seconds == pytest.approx(0.5)
+    assert result["pcm"].samples[0] == pytest.approx(0.125)
+    assert LocalSpeechService()._read_samples(result["audio_path"])[0] == pytest.approx(result["pcm"].samples, abs=1e-4)
+
+
 def test_openvoice_synthesize_line_fails_when_source_embedding_missing(monkeypatch, tmp_path: Path):
     provider = OpenVoiceProvider()
     reference_path = tmp_path / "reference.wav"
@@ -1403,6 +2227,7 @@ def test_openvoice_synthesize_line_fails_when_source_embedding_missing(monkeypat
 
 def test_local_speech_service_discovers_espeak_provider(monkeypatch):
     service = LocalSpeechService()
+    monkeypatch.setattr("app.services.tts.espeak_library", lambda: None)
 
     monkeypatch.setattr(
         "app.services.tts.shutil.which",
@@ -1416,6 +2241,7 @@ def test_local_speech_service_discovers_espeak_provider(monkeypatch):
 
 def test_local_speech_service_returns_empty_provider_set_when_no_binary_exists(monkeypatch):
     service = LocalSpeechService()
+    monkeypatch.setattr("app.services.tts.espeak_library", lambda: None)
 
     monkeypatch.setattr("app.services.tts.shutil.which", lambda binary: None)
 
@@ -1495,6 +2321,7 @@ def test_local_speech_service_uses_persisted_voice_profiles(monkeypatch, tmp_pat
                 "provider_state": {"espeak": {"available": True}},
                 "cache_hit": False,
                 "voice_profile_id": voice_profile["id"],
+                "pcm": None,
             },
         )()
 
@@ -1512,7 +2339,7 @@ def test_local_speech_service_uses_persisted_voice_profiles(monkeypatch, tmp_pat
     assert [segment.voice_profile_id for segment in segments] == ["vp_stewie_v1", "vp_brian_v1"]
 
 
-def test_render_timing_prefers_actual_audio_clip_duration(monkeypatch):
+def test_render_timing_prefers_actual_audio_duration(monkeypatch):
     service = ProjectRenderService()
     segments = [
         SpeechSegment(
@@ -1525,13 +2352,59 @@ def test_render_timing_prefers_actual_audio_clip_duration(monkeypatch):
         )
     ]
 
-    class FakeAudioClip:
-        duration = 1.8
+    monkeypatch.setattr(
+        service.speech_service,
+        "measure_audio",
+        lambda audio_path, pcm=None: {"duration_seconds": 1.8, "gain": 1.0},
+    )
+    timed_segment = service._measure_segment(segments[0])
 
-    monkeypatch.setattr(service.speech_service, "build_audio_clip", lambda audio_path: FakeAudioClip())
-    timed_segments = service._build_timed_segments(segments)
+    assert timed_segment["duration_seconds"] == 1.8
 
-    assert timed_segments[0]["duration_seconds"] == 1.8
+
+def test_dialogue_track_resamples_lines_into_padded_slots(tmp_path):
+    speech_service = LocalSpeechService()
+    quiet = tmp_path / "quiet.wav"
+    PcmAudio(np.full(11025, 0.25, dtype=np.float32), 22050).write_wav(quiet)
+    stereo = PcmAudio(np.full((8000, 2), -0.5, dtype=np.float32), 16000)
+
+    track_path = speech_service.write_dialogue_track(
+        [
+            {"audio_path": str(quiet), "gain": 2.0, "duration_seconds": 0.75},
+            {"audio_path": "unused.wav", "pcm": stereo, "gain": None, "duration_seconds": 0.6},
+        ],
+        tmp_path / "dialogue.wav",
+        44100,
+    )
+
+    with wave.open(str(track_path), "rb") as handle:
+        assert (handle.getnchannels(), handle.getframerate()) == (2, 44100)
+        samples = np.frombuffer(handle.readframes(handle.getnframes()), dtype="<i2").reshape((-1, 2)) / 32767.0
+    # Each slot is exactly its timeline duration, so the track can be muxed without -shortest.
+    assert samples.shape[0] == round(0.75 * 44100) + round(0.6 * 44100)
+    first, second = samples[: round(0.75 * 44100)], samples[round(0.75 * 44100) :]
+    assert first[:22050] == pytest.approx(np.full((22050, 2), 0.5), abs=1e-3)
+    assert not first[22050:].any()
+    # Unmeasured lines get the same peak normalisation the renderer applies.
+    assert second[:22050] == pytest.approx(np.full((22050, 2), -0.5 * 1.35), abs=1e-3)
+    assert not second[22050:].any()
+
+
+def test_dialogue_track_resampling_is_band_limited(tmp_path):
+    speech_service = LocalSpeechService()
+    # A 15 kHz tone is above the 8 kHz Nyquist of the target rate; linear interpolation would fold it to 1 kHz.
+    tone = PcmAudio((0.5 * np.sin(2 * np.pi * 15000 * np.arange(44100) / 44100)).astype(np.float32), 44100)
+
+    track_path = speech_service.write_dialogue_track(
+        [{"audio_path": "unused.wav", "pcm": tone, "gain": 1.0, "duration_seconds": 1.0}],
+        tmp_path / "dialogue.wav",
+        16000,
+    )
+
+    with wave.open(str(track_path), "rb") as handle:
+        samples = np.frombuffer(handle.readframes(handle.getnframes()), dtype="<i2") / 32767.0
+    assert samples.shape[0] == 16000
+    assert np.sqrt(np.mean(samples[200:-200] ** 2)) < 0.01
 
 
 def test_render_config_caps_preview_fps_for_large_backgrounds():
@@ -1547,6 +2420,231 @@ def test_render_config_caps_preview_fps_for_large_backgrounds():
     assert final_config["fps"] == 30
 
 
+def test_draft_profile_scales_canvas_and_layers_but_keeps_timing():
+    service = ProjectRenderService()
+
+    class FakeClip:
+        fps = 60
+
+    draft_config = service._render_config(FakeClip(), "draft")
+    segment = SpeechSegment(speaker="Host", text="Draft timing.", voice="v", slot_index=0, audio_path="a.wav", duration_seconds=1.25)
+    timed_segments = [{"segment": segment, "duration_seconds": 1.25}]
+    planned = [{"speaker": "Host", "text": "Draft timing.", "slot_index": 0}]
+    found = {("Host", 0): None}
+    full_layers = service._timeline_image_layers(timed_segments, 1.25, service._prepare_visuals(planned, found))
+    draft_layers = service._timeline_image_layers(timed_segments, 1.25, service._prepare_visuals(planned, found, 0.5))
+
+    assert (draft_config["width"], draft_config["height"], draft_config["fps"]) == (540, 960, 15)
+    assert draft_config["preset"] == "ultrafast"
+    assert draft_config["gop"] == 15
+    assert [(layer["start"], layer["end"]) for layer in draft_layers] == [(layer["start"], layer["end"]) for layer in full_layers]
+    assert draft_layers[-1]["position"] == (45, 660)
+    assert Image.open(draft_layers[-1]["image_path"]).size == (450, 190)
+
+
+def test_segmented_engine_reencodes_only_changed_lines_and_stream_copies_the_rest(tmp_path: Path):
+    service = ProjectRenderService()
+
+    class RecordingRenderer(FiltergraphRenderer):
+        def __init__(self):
+            super().__init__(canvas_width=540, canvas_height=960, binary="/usr/bin/ffmpeg")
+            self.commands: list[list[str]] = []
+
+        def run(self, command, output_path):
+            self.commands.append(command)
+            Path(output_path).write_bytes(b"segment")
+            return output_path
+
+    def compose(texts: list[str]) -> tuple[RecordingRenderer, dict, float, list[dict]]:
+        renderer = RecordingRenderer()
+        timed_segments = [
+            {
+                "segment": SpeechSegment(speaker=speaker, text=text, voice="v", slot_index=slot, audio_path=str(tmp_path / f"{index}.wav"), duration_seconds=1.01),
+                "gain": 1.0,
+                "duration_seconds": 1.01,
+            }
+            for index, (speaker, slot, text) in enumerate(zip(["Host", "Guest", "Host"], [0, 1, 0], texts))
+        ]
+        work_dir = tmp_path / f"work_{len(texts[1])}"
+        work_dir.mkdir()
+        render_config, total = service._compose_segmented(
+            project_id=1,
+            background_path="background.mp4",
+            background=SimpleNamespace(renderer=renderer, fps=30, duration=2.0, sha256="bg-digest", path="background.mp4", prepared=False),
+            timed_segments=timed_segments,
+            visuals=None,
+            style_preset="none",
+            output_kind="draft",
+            output_path=tmp_path / "out.mp4",
+            work_dir=work_dir,
+            progress_callback=None,
+        )
+        return renderer, render_config, total, timed_segments
+
+    first, first_config, total, timed_segments = compose(["One.", "Two.", "Three."])
+    revised, revised_config, _, _ = compose(["One.", "Two, revised.", "Three."])
+
+    assert first_config["segment_cache"] == {"reused": 0, "rendered": 3}
+    assert revised_config["segment_cache"] == {"reused": 2, "rendered": 1}
+    # Boundaries snap from the running total (15.15, 30.3, 45.45 frames at 15fps), so rounding
+    # never accumulates and the persisted line durations are left alone.
+    assert [item["duration_seconds"] for item in timed_segments] == [1.01] * 3
+    assert total == pytest.approx(45 / 15)
+    # The third line starts at the end of the background, so it holds the last frame.
+    seeks = sorted(command[command.index("-i") - 2 : command.index("-i")] for command in first.commands[:-1])
+    assert seeks == [["-ss", "0.000"], ["-ss", "1.000"], ["-sseof", "-0.100"]]
+    concat = revised.commands[-1]
+    assert concat[concat.index("-f") + 1] == "concat"
+    assert concat[concat.index("-c:v") + 1] == "copy"
+    assert "-an" in revised.commands[0]
+
+
+def test_filtergraph_engine_builds_single_ffmpeg_invocation(tmp_path: Path):
+    service = ProjectRenderService()
+    segments = [
+        SpeechSegment(speaker="Host", text="Hello there.", voice="en-us+f3", slot_index=0, audio_path=str(tmp_path / "a.wav"), duration_seconds=1.2),
+        SpeechSegment(speaker="Guest", text="General Kenobi.", voice="en-gb+m3", slot_index=1, audio_path=str(tmp_path / "b.wav"), duration_seconds=0.9),
+    ]
+    timed_segments = [
+        {"segment": segment, "gain": 1.1, "duration_seconds": segment.duration_seconds} for segment in segments
+    ]
+    image_layers = service._timeline_image_layers(timed_segments, 2.1)
+    renderer = FiltergraphRenderer(canvas_width=1080, canvas_height=1920, binary="/usr/bin/ffmpeg")
+
+    command = renderer.build_command(
+        background_path="background.mp4",
+        style_preset="blur",
+        image_layers=image_layers,
+        audio_segments=[
+            {"audio_path": item["segment"].audio_path, "gain": item["gain"], "duration_seconds": item["duration_seconds"]}
+            for item in timed_segments
+        ],
+        total_duration=2.1,
+        render_config=service._render_config(type("Clip", (), {"fps": 30})(), "preview"),
+        audio_fps=44100,
+        audio_bitrate="192k",
+        filtergraph_path=tmp_path / "graph.txt",
+        output_path=tmp_path / "out.mp4",
+    )
+    graph = (tmp_path / "graph.txt").read_text()
+
+    assert command[0] == "/usr/bin/ffmpeg"
+    assert command.count("-filter_complex_script") == 1
+    # background + base/active portrait rasters per speaker + two cards + two speech segments
+    assert command.count("-i") == 9
+    assert "gblur=sigma=5.0" in graph
+    assert "enable='between(t,0.000,1.200)'" in graph
+    assert "enable='between(t,1.200,2.100)'" in graph
+    assert "colorchannelmixer=aa=0.26" in graph
+    assert "concat=n=2:v=0:a=1[aout]" in graph
+
+
+def test_background_derivatives_are_built_once_per_style_and_fps_then_overlaid_as_is(monkeypatch, tmp_path: Path):
+    source = tmp_path / "aurora_grid.mp4"
+    source.write_bytes(b"background bytes")
+    commands: list[list[str]] = []
+
+    def fake_run(command, **kwargs):
+        commands.append(command)
+        Path(command[-1]).write_bytes(b"mezzanine")
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    monkeypatch.setattr(background_cache.subprocess, "run", fake_run)
+    build = lambda style, fps: background_cache.ensure_background_derivative(
+        source, style_preset=style, fps=fps, canvas=(1080, 1920), binary="/usr/bin/ffmpeg"
+    )
+
+    blurred = build("blur", 30)
+    assert build("blur", 30) == blurred
+    assert len({blurred, build("none", 30), build("blur", 24)}) == 3
+    assert len(commands) == 3
+    assert "gblur=sigma=5.0,scale=1080:1920:force_original_aspect_ratio=increase,crop=1080:1920,setsar=1,fps=30" in commands[0][commands[0].index("-vf") + 1]
+    assert not list(background_cache.background_cache_dir().glob("*.tmp.mp4"))
+
+    graph = FiltergraphRenderer(canvas_width=1080, canvas_height=1920, binary="/usr/bin/ffmpeg").build_filtergraph(
+        style_preset="blur",
+        fps=30,
+        total_duration=2.0,
+        image_inputs=[],
+        image_layers=[],
+        audio_segments=[],
+        audio_fps=44100,
+        prepared_background=True,
+    )
+    # The derivative is already blurred and canvas-sized, so the render only retimes it.
+    assert graph.startswith("[0:v]setsar=1,fps=30,")
+    assert "gblur" not in graph and "scale=" not in graph
+    assert len(background_cache.evict_background_cache(max_bytes=len(b"mezzanine"), min_age_seconds=0)) == 2
+    assert len(list(background_cache.background_cache_dir().glob("*.mp4"))) == 1
+
+
+def test_raster_cache_reuses_cards_and_presized_portraits_across_renders(monkeypatch):
+    first = ProjectRenderService()
+    second = ProjectRenderService()
+    planned = [{"speaker": "Rastered Host", "text": "Same line every time.", "slot_index": 0}]
+    monkeypatch.setattr(first, "_find_character_portrait", lambda speaker, slot_index: None)
+    monkeypatch.setattr(second, "_find_character_portrait", lambda speaker, slot_index: None)
+
+    first_visuals = first._prepare_visuals(planned)
+    saves = []
+    original_save = Image.Image.save
+    monkeypatch.setattr(Image.Image, "save", lambda self, *args, **kwargs: saves.append(args) or original_save(self, *args, **kwargs))
+    load_font.cache_clear()
+    second_visuals = second._prepare_visuals(planned)
+
+    assert second_visuals == first_visuals
+    assert saves == []
+    assert load_font.cache_info().currsize == 4
+    portraits = second_visuals["portraits"][("Rastered Host", 0)]
+    assert Image.open(portraits["base"]).height == ProjectRenderService.BASE_HEIGHT
+    assert Image.open(portraits["active"]).height == ProjectRenderService.ACTIVE_HEIGHT
+
+
+def test_render_pipeline_prepares_visuals_while_speech_is_still_synthesising(monkeypatch, tmp_path: Path):
+    service = ProjectRenderService()
+    visuals_ready = threading.Event()
+    observed = {}
+    lines = [{"speaker": "Host", "text": "First line."}, {"speaker": "Guest", "text": "Second line."}]
+
+    def fake_iter_dialogue(parsed_lines, work_dir):
+        yield SpeechSegment(speaker="Host", text="First line.", voice="v", slot_index=0, audio_path="a.wav", duration_seconds=1.0)
+        observed["visuals_before_last_line"] = visuals_ready.wait(timeout=5)
+        yield SpeechSegment(speaker="Guest", text="Second line.", voice="v", slot_index=1, audio_path="b.wav", duration_seconds=0.8)
+
+    original_prepare_visuals = service._prepare_visuals
+
+    def tracking_prepare_visuals(*args, **kwargs):
+        visuals = original_prepare_visuals(*args, **kwargs)
+        visuals_ready.set()
+        return visuals
+
+    monkeypatch.setattr(service.speech_service, "iter_dialogue", fake_iter_dialogue)
+    monkeypatch.setattr(service, "_prepare_visuals", tracking_prepare_visuals)
+    monkeypatch.setattr(service.speech_service, "measure_audio", lambda audio_path, pcm=None: {"duration_seconds": 0.0, "gain": 1.0})
+
+    timed_segments, background, visuals = service._run_render_pipeline(
+        parsed_lines=lines,
+        background_path="background.mp4",
+        style_preset="none",
+        work_dir=tmp_path,
+        prepare_background=lambda path, style, canvas: SimpleNamespace(fps=30),
+        measure_segment=service._measure_segment,
+        progress_callback=None,
+    )
+    image_layers = service._timeline_image_layers(timed_segments, 1.8, visuals)
+
+    assert observed["visuals_before_last_line"] is True
+    assert background.fps == 30
+    assert [item["segment"].speaker for item in timed_segments] == ["Host", "Guest"]
+    assert [item["duration_seconds"] for item in timed_segments] == [1.0, 0.8]
+    assert [layer["image_path"] for layer in image_layers[2:]] == [
+        visuals["portraits"][("Host", 0)]["active"],
+        visuals["cards"][0],
+        visuals["portraits"][("Guest", 1)]["active"],
+        visuals["cards"][1],
+    ]
+
+
 def test_tts_provider_capabilities_route_returns_registry_state(auth_client: TestClient):
     response = auth_client.get("/tts/providers")
 
@@ -1639,7 +2737,7 @@ def _create_project_flow(client: TestClient) -> dict:
 
     asset = client.post(
         f"/projects/{project_id}/assets/background",
-        files={"file": ("background.mp4", b"fake-video", "video/mp4")},
+        files={"file": ("background.mp4", _background_video_bytes(), "video/mp4")},
     )
     assert asset.status_code == 201
 
@@ -1712,6 +2810,151 @@ def test_auth_flow_and_logout(client: TestClient):
     assert after_logout.status_code == 401
 
 
+def test_preset_backgrounds_and_render_outputs_share_refcounted_blobs(auth_client: TestClient):
+    (storage.preset_media_dir() / "aurora_grid.mp4").write_bytes(_background_video_bytes())
+    projects = [auth_client.post("/projects", json={"name": f"Blob {index}", "target_platform": "youtube"}).json()["id"] for index in range(2)]
+    assets = [auth_client.post(f"/projects/{project_id}/assets/background/preset/aurora_grid").json() for project_id in projects]
+    paths = [Path(storage.project_media_dir(project_id)) / asset["original_filename"] for project_id, asset in zip(projects, assets)]
+    blob = storage.blob_path(storage.content_sha256(paths[0]), ".mp4")
+
+    # Every project "copy" is the same inode as the blob; the bundled preset is copied, never linked.
+    assert os.path.samefile(paths[0], paths[1]) and os.path.samefile(paths[0], blob)
+    assert not os.path.samefile(blob, storage.preset_media_dir() / "aurora_grid.mp4")
+    assert storage.blob_reference_count(blob) == 2
+    assert auth_client.delete(f"/projects/{projects[0]}/assets/{assets[0]['id']}").status_code == 200
+    assert storage.blob_reference_count(blob) == 1
+    assert paths[1].read_bytes() == _background_video_bytes()
+
+    rendered = Path("test_storage") / "render_out.mp4"
+    rendered.write_bytes(b"rendered-video")
+    stored = storage.store_generated_file(projects[0], str(rendered), "preview_1.mp4", move=True)
+    output_blob = storage.blob_path(storage.content_sha256(stored), ".mp4")
+    assert not rendered.exists() and stored.read_bytes() == b"rendered-video"
+    assert storage.blob_reference_count(output_blob) == 1
+
+    storage.delete_storage_key(str(stored))
+    assert not stored.exists() and not output_blob.exists()
+
+
+def test_background_uploads_are_hashed_while_streaming_and_deduplicated(auth_client: TestClient, monkeypatch):
+    projects = [auth_client.post("/projects", json={"name": f"Upload {index}", "target_platform": "youtube"}).json()["id"] for index in range(2)]
+    uploads = [
+        auth_client.post(f"/projects/{project_id}/assets/background", files={"file": ("clip.mp4", _background_video_bytes(), "video/mp4")}).json()
+        for project_id in projects
+    ]
+    paths = [next(storage.project_media_dir(project_id).glob("*_clip.mp4")) for project_id in projects]
+
+    assert uploads[0]["metadata"]["sha256"] == hashlib.sha256(_background_video_bytes()).hexdigest()
+    assert os.path.samefile(paths[0], paths[1])
+    assert storage.blob_reference_count(storage.blob_path(uploads[0]["metadata"]["sha256"], ".mp4")) == 2
+
+    monkeypatch.setattr(storage, "MAX_BACKGROUND_VIDEO_SIZE", 1024)
+    too_large = auth_client.post(f"/projects/{projects[0]}/assets/background", files={"file": ("big.mp4", b"x" * 4096, "video/mp4")})
+    assert too_large.status_code == 413
+    assert not list(storage.blob_store_dir().glob(".upload.*"))
+
+
+def test_blob_links_reingest_blobs_collected_by_another_process_and_gc_sweeps_stale_temps(monkeypatch):
+    link_or_copy = storage._link_or_copy
+    collected_once: list[Path] = []
+
+    def racing_link_or_copy(source, destination):
+        # Another process's GC removes the blob between the existence check and the link.
+        if source.parent.parent.parent == storage.blob_store_dir() and not collected_once:
+            collected_once.append(source)
+            source.unlink()
+        link_or_copy(source, destination)
+
+    monkeypatch.setattr(storage, "_link_or_copy", racing_link_or_copy)
+    upload = storage.blob_store_dir() / ".upload.racing.tmp"
+    upload.write_bytes(b"raced-upload")
+    digest = hashlib.sha256(b"raced-upload").hexdigest()
+    storage.blob_path(digest, ".mp4").parent.mkdir(parents=True, exist_ok=True)
+    storage.blob_path(digest, ".mp4").write_bytes(b"raced-upload")
+    destination = storage.project_media_dir(1) / "raced.mp4"
+
+    storage.adopt_upload_blob(upload, digest, destination)
+
+    assert collected_once and destination.read_bytes() == b"raced-upload"
+    assert os.path.samefile(destination, storage.blob_path(digest, ".mp4"))
+    assert not upload.exists()
+
+    stale, fresh = storage.blob_store_dir() / ".upload.crashed.tmp", storage.blob_store_dir() / ".upload.writing.tmp"
+    shard_temp = storage.blob_path(digest, ".mp4").with_name(".crashed.mp4.abc.tmp")
+    for path in (stale, fresh, shard_temp):
+        path.write_bytes(b"partial")
+    an_hour_ago = time.time() - 3600
+    for path in (stale, shard_temp):
+        os.utime(path, (an_hour_ago, an_hour_ago))
+    storage.collect_blob_garbage()
+
+    assert not stale.exists() and not shard_temp.exists()
+    assert fresh.exists()
+    fresh.unlink()
+    storage.delete_storage_key(str(destination))
+
+
+def test_background_upload_is_probed_once_and_impossible_inputs_are_rejected(auth_client: TestClient, monkeypatch):
+    project_id = auth_client.post("/projects", json={"name": "Probed", "target_platform": "youtube"}).json()["id"]
+    auth_client.put(f"/projects/{project_id}/script", json={"raw_text": "<Host> Hello there", "source": "manual"})
+
+    # The probe worker records why no render could use the file; job creation then refuses it.
+    rejected = auth_client.post(
+        f"/projects/{project_id}/assets/background",
+        files={"file": ("background.mp4", b"fake-video", "video/mp4")},
+    )
+    assert rejected.status_code == 201
+    listed = auth_client.get(f"/projects/{project_id}/assets").json()
+    assert listed[0]["metadata"]["probe_error"]["code"] == "invalid_background_video"
+    refused = auth_client.post(f"/projects/{project_id}/generation-jobs", json={"background_style": "none"})
+    assert refused.status_code == 422
+    assert refused.json()["detail"]["code"] == "invalid_background_video"
+
+    uploaded = auth_client.post(
+        f"/projects/{project_id}/assets/background",
+        files={"file": ("background.mp4", _background_video_bytes(), "video/mp4")},
+    )
+    assert uploaded.status_code == 201
+    asset = next(item for item in auth_client.get(f"/projects/{project_id}/assets").json() if item["id"] == uploaded.json()["id"])
+    probe = asset["metadata"]["probe"]
+    assert (asset["width"], asset["height"], asset["duration_ms"]) == (64, 112, 1000)
+    assert (probe["codec"], probe["fps"], probe["keyframe_interval_seconds"]) == ("h264", 30.0, 0.5)
+
+    # Render planning reads the recorded probe instead of opening the file again.
+    service = ProjectRenderService()
+    monkeypatch.setattr("app.services.rendering.probe_video_fps", lambda *args: pytest.fail("background was re-probed"))
+    service.use_background_probe("/media/background.mp4", probe)
+    assert service._render_config(SimpleNamespace(fps=service._source_fps("/media/background.mp4")), "final")["fps"] == 30
+
+
+def test_generation_probes_a_background_the_probe_worker_has_not_reached(auth_client: TestClient, monkeypatch):
+    monkeypatch.setattr(task_signatures.probe_background_asset, "delay", lambda asset_id: None)
+    monkeypatch.setattr(
+        "app.routers.generation.background_probe_error",
+        lambda asset: None if "probe" not in (asset.metadata_json or {}) else pytest.fail("request thread probed"),
+    )
+    flow = _create_project_flow(auth_client)
+    assert "probe" not in auth_client.get(f"/projects/{flow['project_id']}/assets").json()[0]["metadata"]
+
+    source_preview = Path("test_storage") / "source_preview.mp4"
+    source_preview.write_bytes(b"rendered-preview")
+    seen_probes: list[dict | None] = []
+
+    def fake_render_preview(self, project_id, background_video_path, parsed_lines, style_preset):
+        seen_probes.append(self._media_probes.get(self.video_service._clean_file_path(background_video_path)))
+        return {"output_path": str(source_preview), "duration_seconds": 1.0}
+
+    monkeypatch.setattr(ProjectRenderService, "render_preview", fake_render_preview)
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
+
+    job = auth_client.post(f"/projects/{flow['project_id']}/generation-jobs", json={"background_style": "none"})
+    assert job.status_code == 201
+    assert auth_client.get(f"/generation-jobs/{job.json()['id']}").json()["status"] == "completed"
+    asset = next(item for item in auth_client.get(f"/projects/{flow['project_id']}/assets").json() if item["id"] == flow["asset_id"])
+    assert asset["metadata"]["probe"]["fps"] == 30.0
+    assert seen_probes == [asset["metadata"]["probe"]]
+
+
 def test_script_validation_and_asset_ownership(auth_client: TestClient, client: TestClient):
     project = auth_client.post("/projects", json={"name": "Ownership", "target_platform": "youtube"})
     project_id = project.json()["id"]
@@ -1724,7 +2967,7 @@ def test_script_validation_and_asset_ownership(auth_client: TestClient, client:
 
     asset = auth_client.post(
         f"/projects/{project_id}/assets/background",
-        files={"file": ("background.mp4", b"fake-video", "video/mp4")},
+        files={"file": ("background.mp4", _background_video_bytes(), "video/mp4")},
     )
     assert asset.status_code == 201
 
@@ -1753,7 +2996,7 @@ def test_generation_job_lifecycle(auth_client: TestClient, monkeypatch):
             "duration_seconds": 1.5,
         },
     )
-    monkeypatch.setattr(process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
 
     create_job = auth_client.post(
         f"/projects/{flow['project_id']}/generation-jobs",
@@ -1774,9 +3017,265 @@ def test_generation_job_lifecycle(auth_client: TestClient, monkeypatch):
     assert project.json()["latest_preview"] is not None
 
 
+def test_generation_job_reuses_cached_render_for_identical_inputs(auth_client: TestClient, monkeypatch):
+    flow = _create_project_flow(auth_client)
+
+    source_preview = Path("test_storage") / "source_preview.mp4"
+    source_preview.write_bytes(b"rendered-preview")
+    render_calls: list[int] = []
+
+    def fake_render_preview(self, project_id, background_video_path, parsed_lines, style_preset):
+        render_calls.append(project_id)
+        return {"output_path": str(source_preview), "duration_seconds": 1.5}
+
+    monkeypatch.setattr(ProjectRenderService, "render_preview", fake_render_preview)
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
+
+    first = auth_client.post(f"/projects/{flow['project_id']}/generation-jobs", json={"background_style": "none"})
+    second = auth_client.post(f"/projects/{flow['project_id']}/generation-jobs", json={"background_style": "none"})
+    blurred = auth_client.post(f"/projects/{flow['project_id']}/generation-jobs", json={"background_style": "blur"})
+
+    assert len(render_calls) == 2
+    first_output = auth_client.get(f"/generation-jobs/{first.json()['id']}").json()["output_video_id"]
+    second_output = auth_client.get(f"/generation-jobs/{second.json()['id']}").json()["output_video_id"]
+    assert auth_client.get(f"/generation-jobs/{blurred.json()['id']}").json()["status"] == "completed"
+    outputs = {item["id"]: item for item in auth_client.get(f"/projects/{flow['project_id']}/outputs").json()["items"]}
+    assert first_output != second_output
+    assert outputs[first_output]["asset"]["id"] == outputs[second_output]["asset"]["id"]
+    assert outputs[first_output]["asset"]["metadata"]["render_cache_key"]
+
+
+def test_render_cache_entry_hit_keeps_the_timeline_for_promotion(auth_client: TestClient, monkeypatch):
+    from app.models import Asset
+
+    flow = _create_project_flow(auth_client)
+    source_preview = Path("test_storage") / "source_preview.mp4"
+    source_preview.write_bytes(b"rendered-draft")
+    draft_audio = Path("test_storage") / "cached_000.wav"
+    _write_wav(draft_audio, seconds=1.4)
+    timeline = {"segments": [{"speaker": "Host", "text": "Cached line.", "audio_path": str(draft_audio), "duration_seconds": 1.4}], "total_duration_seconds": 1.4}
+    render_calls: list[str] = []
+
+    def fake_render_preview(self, **kwargs):
+        render_calls.append(kwargs["output_kind"])
+        return {"output_path": str(source_preview), "duration_seconds": 1.4, "metadata": {"render_mode": "speaker_dialogue", "timeline": timeline}}
+
+    monkeypatch.setattr(ProjectRenderService, "render_preview", fake_render_preview)
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
+
+    first = auth_client.post(f"/projects/{flow['project_id']}/generation-jobs", json={"output_kind": "draft"})
+    first_output_id = auth_client.get(f"/generation-jobs/{first.json()['id']}").json()["output_video_id"]
+    with SessionLocal() as db:
+        # Without a reusable project asset the job falls through to the on-disk cache entry.
+        Path(db.query(Asset).filter(Asset.kind == "render_output").one().storage_key).unlink()
+    second = auth_client.post(f"/projects/{flow['project_id']}/generation-jobs", json={"output_kind": "draft"})
+    second_output_id = auth_client.get(f"/generation-jobs/{second.json()['id']}").json()["output_video_id"]
+
+    outputs = {item["id"]: item for item in auth_client.get(f"/projects/{flow['project_id']}/outputs").json()["items"]}
+    assert render_calls == ["draft"]
+    assert outputs[second_output_id]["asset"]["id"] != outputs[first_output_id]["asset"]["id"]
+    second_timeline = outputs[second_output_id]["asset"]["metadata"]["timeline"]
+    # The new output links its own copy of the timeline; the replaced draft's copy is released.
+    assert [entry["text"] for entry in second_timeline["segments"]] == ["Cached line."]
+    assert Path(second_timeline["segments"][0]["audio_path"]).parent.name == f"preview_{second.json()['id']}"
+    assert Path(second_timeline["segments"][0]["audio_path"]).read_bytes()[:4] == b"RIFF"
+    assert "timeline" not in outputs[first_output_id]["asset"]["metadata"]
+    assert not draft_audio.exists()
+
+
+def test_render_cache_skips_degraded_renders_and_stays_within_its_project(auth_client: TestClient, monkeypatch):
+    from app.models import Asset
+    from app.services.render_cache import render_cache_dir
+
+    source_preview = Path("test_storage") / "source_preview.mp4"
+    source_preview.write_bytes(b"rendered-draft")
+    results = [
+        {"render_mode": "overlay_only"},
+        {"render_mode": "speaker_dialogue", "fallback_used": True},
+        {"render_mode": "speaker_dialogue", "fallback_used": False},
+    ]
+    render_calls: list[dict] = []
+
+    def fake_render_preview(self, **kwargs):
+        metadata = results[min(len(render_calls), len(results) - 1)]
+        render_calls.append(metadata)
+        return {"output_path": str(source_preview), "duration_seconds": 1.4, "metadata": metadata}
+
+    def render_draft(project_id: int) -> None:
+        auth_client.post(f"/projects/{project_id}/generation-jobs", json={"output_kind": "draft"})
+        with SessionLocal() as db:
+            # Drop the project asset so the next job can only reuse an on-disk cache entry.
+            for asset in db.query(Asset).filter(Asset.kind == "render_output").all():
+                Path(asset.storage_key).unlink(missing_ok=True)
+
+    monkeypatch.setattr(ProjectRenderService, "render_preview", fake_render_preview)
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
+    flow = _create_project_flow(auth_client)
+    for _ in range(4):
+        render_draft(flow["project_id"])
+    assert len(render_calls) == 3
+    assert len(list(render_cache_dir().glob("*.json"))) == 1
+
+    other = _create_project_flow(auth_client)
+    render_draft(other["project_id"])
+    assert len(render_calls) == 4
+
+
+def test_cache_sweep_task_runs_every_sweep_even_when_one_fails(monkeypatch):
+    import sqlite3
+
+    from app.tasks import generation as generation_tasks
+
+    sweeps: list[str] = []
+
+    def locked_voice_index():
+        sweeps.append("voice")
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(generation_tasks, "evict_voice_cache", locked_voice_index)
+    monkeypatch.setattr(generation_tasks, "evict_background_cache", lambda: sweeps.append("background") or ["derivative.mp4"])
+
+    result = generation_tasks.evict_render_caches_task()
+
+    assert sweeps == ["voice", "background"]
+    assert result["evicted"]["background"] == 1
+    assert "voice" not in result["evicted"] and "blobs" in result["evicted"]
+
+
+def test_draft_output_promotes_to_final_by_reencoding_its_timeline(auth_client: TestClient, monkeypatch):
+    flow = _create_project_flow(auth_client)
+    source_preview = Path("test_storage") / "source_preview.mp4"
+    source_preview.write_bytes(b"rendered-draft")
+    timeline = {
+        "segments": [
+            {
+                "speaker": "Host",
+                "text": "Draft line.",
+                "voice": "en-us+f3",
+                "slot_index": 0,
+                "audio_path": str(Path("test_storage") / "draft_000.wav"),
+                "duration_seconds": 1.4,
+            }
+        ],
+        "total_duration_seconds": 1.4,
+    }
+    _write_wav(Path(timeline["segments"][0]["audio_path"]), seconds=1.4)
+    calls: dict[str, list] = {"render_preview": [], "render_timeline": []}
+
+    def fake_render_preview(self, **kwargs):
+        calls["render_preview"].append(kwargs["output_kind"])
+        return {"output_path": str(source_preview), "duration_seconds": 1.4, "metadata": {"timeline": timeline}}
+
+    def fake_render_timeline(self, **kwargs):
+        calls["render_timeline"].append(kwargs)
+        return {"output_path": str(source_preview), "duration_seconds": 1.4, "metadata": {}}
+
+    monkeypatch.setattr(ProjectRenderService, "render_preview", fake_render_preview)
+    monkeypatch.setattr(ProjectRenderService, "render_timeline", fake_render_timeline)
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
+
+    draft = auth_client.post(f"/projects/{flow['project_id']}/generation-jobs", json={"output_kind": "draft"})
+    draft_output_id = auth_client.get(f"/generation-jobs/{draft.json()['id']}").json()["output_video_id"]
+    promoted = auth_client.post(f"/outputs/{draft_output_id}/promote")
+
+    assert promoted.status_code == 201
+    assert promoted.json()["output_kind"] == "final"
+    assert promoted.json()["source_output_video_id"] == draft_output_id
+    assert calls["render_preview"] == ["draft"]
+    assert calls["render_timeline"][0]["timeline"] == timeline
+    assert calls["render_timeline"][0]["output_kind"] == "final"
+    final_output_id = auth_client.get(f"/generation-jobs/{promoted.json()['id']}").json()["output_video_id"]
+    outputs = {item["id"]: item for item in auth_client.get(f"/projects/{flow['project_id']}/outputs").json()["items"]}
+    assert outputs[final_output_id]["is_preview"] is False
+    assert outputs[final_output_id]["asset"]["metadata"]["promoted_from_output_video_id"] == draft_output_id
+    assert auth_client.post(f"/outputs/{final_output_id}/promote").status_code == 409
+    # The final replaced the draft, which is no longer being promoted, so the draft's timeline audio is released.
+    assert "timeline" not in outputs[draft_output_id]["asset"]["metadata"]
+    assert not Path(timeline["segments"][0]["audio_path"]).exists()
+
+
+def test_promote_returns_only_an_active_final_from_the_same_draft(auth_client: TestClient, monkeypatch):
+    flow = _create_project_flow(auth_client)
+    source_preview = Path("test_storage") / "source_preview.mp4"
+    source_preview.write_bytes(b"rendered-draft")
+    monkeypatch.setattr(
+        ProjectRenderService,
+        "render_preview",
+        lambda self, **kwargs: {"output_path": str(source_preview), "duration_seconds": 1.4, "metadata": {}},
+    )
+    monkeypatch.setattr(settings, "RENDER_CACHE_ENABLED", False)
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
+    drafts = []
+    for _ in range(2):
+        job = auth_client.post(f"/projects/{flow['project_id']}/generation-jobs", json={"output_kind": "draft"})
+        drafts.append(auth_client.get(f"/generation-jobs/{job.json()['id']}").json()["output_video_id"])
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: None)
+
+    first = auth_client.post(f"/outputs/{drafts[0]}/promote")
+    again = auth_client.post(f"/outputs/{drafts[0]}/promote")
+    other = auth_client.post(f"/outputs/{drafts[1]}/promote")
+
+    assert (first.status_code, again.status_code, other.status_code) == (201, 200, 201)
+    assert again.json()["id"] == first.json()["id"]
+    assert other.json()["source_output_video_id"] == drafts[1]
+
+
+def test_render_cache_eviction_drops_least_recently_used_entries(tmp_path: Path):
+    from app.services.render_cache import evict_render_cache, lookup_render_cache, render_cache_dir, segment_cache_dir, store_render_cache_entry
+
+    for index, key in enumerate(["old", "recent"]):
+        source = tmp_path / f"{key}.mp4"
+        source.write_bytes(b"x" * 100)
+        store_render_cache_entry(key, source, duration_seconds=1.0)
+        source.unlink()
+        os.utime(render_cache_dir() / f"{key}.mp4", (1000 + index, 1000 + index))
+    stray = tmp_path / "generated" / "stray.mp4"
+    stray.parent.mkdir()
+    stray.write_bytes(b"x" * 100)
+    os.utime(stray, (500, 500))
+    in_flight = segment_cache_dir() / "segment.0123.tmp.mp4"
+    in_flight.write_bytes(b"x" * 100)
+    os.utime(in_flight, (100, 100))
+    # Written moments ago, e.g. a MoviePy output or a segment another job just reused.
+    being_written = stray.parent / "rendering.mp4"
+    being_written.write_bytes(b"x" * 100)
+    # Still linked from a project, so evicting it would free nothing.
+    project_output = tmp_path / "project_output.mp4"
+    project_output.write_bytes(b"x" * 1000)
+    store_render_cache_entry("shared", project_output, duration_seconds=1.0)
+    os.utime(render_cache_dir() / "shared.mp4", (10, 10))
+
+    evicted = evict_render_cache(max_bytes=250, extra_dirs=[stray.parent])
+
+    assert evicted == ["stray.mp4", "old.mp4"]
+    assert in_flight.exists() and being_written.exists()
+    assert lookup_render_cache("shared") is not None
+    assert lookup_render_cache("old") is None
+    assert lookup_render_cache("recent")["duration_seconds"] == 1.0
+
+
+def test_render_cache_eviction_counts_entries_only_their_blob_still_holds():
+    from app.services.render_cache import evict_render_cache, lookup_render_cache, render_cache_dir, store_render_cache_entry
+
+    rendered = Path("test_storage") / "render_out.mp4"
+    rendered.write_bytes(b"y" * 400)
+    stored = storage.store_generated_file(1, str(rendered), "preview_cached.mp4", move=True)
+    digest = storage.content_sha256(stored)
+    store_render_cache_entry("orphaned", stored, duration_seconds=1.0, sha256=digest)
+    os.utime(render_cache_dir() / "orphaned.mp4", (10, 10))
+    assert evict_render_cache(max_bytes=100) == []
+
+    # Once the project output is gone, only the cache keeps the blob alive.
+    stored.unlink()
+    assert evict_render_cache(max_bytes=100) == ["orphaned.mp4"]
+    assert lookup_render_cache("orphaned") is None
+    storage.collect_blob_garbage(grace_seconds=0)
+    assert not storage.blob_path(digest, ".mp4").exists()
+
+
 def test_generation_job_dedupes_active_job(auth_client: TestClient, monkeypatch):
     flow = _create_project_flow(auth_client)
-    monkeypatch.setattr(process_generation_job, "delay", lambda job_id: None)
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: None)
 
     first = auth_client.post(
         f"/projects/{flow['project_id']}/generation-jobs",
@@ -1799,7 +3298,7 @@ def test_generation_job_dedupes_active_job(auth_client: TestClient, monkeypatch)
 
 def test_stale_processing_generation_job_is_reconciled(auth_client: TestClient, monkeypatch):
     flow = _create_project_flow(auth_client)
-    monkeypatch.setattr(process_generation_job, "delay", lambda job_id: None)
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: None)
 
     create_job = auth_client.post(
         f"/projects/{flow['project_id']}/generation-jobs",
@@ -1902,8 +3401,8 @@ def test_publish_job_lifecycle_and_history(auth_client: TestClient, monkeypatch)
             "duration_seconds": 1.0,
         },
     )
-    monkeypatch.setattr(process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
-    monkeypatch.setattr(process_publish_job, "delay", lambda job_id: process_publish_job(job_id))
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
+    monkeypatch.setattr(task_signatures.process_publish_job, "delay", lambda job_id: process_publish_job(job_id))
     monkeypatch.setattr(
         "app.tasks.publish.upload_short",
         lambda **kwargs: {
@@ -1965,8 +3464,8 @@ def test_scheduled_publish_dispatch_runs_once(auth_client: TestClient, monkeypat
             "duration_seconds": 1.0,
         },
     )
-    monkeypatch.setattr(process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
-    monkeypatch.setattr(process_publish_job, "delay", lambda job_id: process_publish_job(job_id))
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
+    monkeypatch.setattr(task_signatures.process_publish_job, "delay", lambda job_id: process_publish_job(job_id))
     monkeypatch.setattr(
         "app.tasks.publish.upload_short",
         lambda **kwargs: {
@@ -2060,8 +3559,8 @@ def test_review_queue_routing_and_auto_publish(auth_client: TestClient, monkeypa
             "duration_seconds": 1.25,
         },
     )
-    monkeypatch.setattr(process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
-    monkeypatch.setattr(process_publish_job, "delay", lambda job_id: process_publish_job(job_id))
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
+    monkeypatch.setattr(task_signatures.process_publish_job, "delay", lambda job_id: process_publish_job(job_id))
     monkeypatch.setattr(
         "app.tasks.publish.upload_short",
         lambda **kwargs: {
@@ -2148,8 +3647,8 @@ def test_end_to_end_happy_path(auth_client: TestClient, monkeypatch):
             "duration_seconds": 2.0,
         },
     )
-    monkeypatch.setattr(process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
-    monkeypatch.setattr(process_publish_job, "delay", lambda job_id: process_publish_job(job_id))
+    monkeypatch.setattr(task_signatures.process_generation_job, "delay", lambda job_id: process_generation_job(job_id))
+    monkeypatch.setattr(task_signatures.process_publish_job, "delay", lambda job_id: process_publish_job(job_id))
     monkeypatch.setattr(
         "app.tasks.publish.upload_short",
         lambda **kwargs: {
@@ -121,9 +121,16 @@ export interface VoiceReferenceAudio {
   sha256: string;
   authorization_confirmed: boolean;
   authorization_note: string | null;
+  status: 'processing' | 'ready' | 'failed';
+  error: { code: string; message: string } | null;
   created_at: string;
 }
 
+export interface VoiceReferenceAudioUpload {
+  voice_profile: VoiceProfile;
+  reference_audio: VoiceReferenceAudio;
+}
+
 export interface VoiceProfile {
   id: string;
   display_name: string;
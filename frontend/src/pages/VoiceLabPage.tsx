@@ -6,6 +6,7 @@ import type {
   TTSFailure,
   VoiceLabPreview,
   VoiceProfile,
+  VoiceReferenceAudioUpload,
   VoiceProviderCapability,
 } from '../api/models';
 import Sidebar from '../components/Sidebar';
@@ -265,14 +266,35 @@ const VoiceLabPage: React.FC = () => {
       formData.append('authorization_confirmed', String(authorizationConfirmed));
       formData.append('authorization_note', authorizationNote);
       formData.append('file', referenceFile);
-      await apiClient.post('/voice-profiles/reference-audio', formData, {
+      const response = await apiClient.post<VoiceReferenceAudioUpload>('/voice-profiles/reference-audio', formData, {
         headers: { 'Content-Type': 'multipart/form-data' },
       });
       setReferenceFile(null);
       setAuthorizationConfirmed(false);
       setAuthorizationNote('');
-      setInfo('Reference audio uploaded.');
+      setInfo('Reference audio uploaded; processing on the worker.');
       await loadVoiceProfiles();
+
+      const { voice_profile_id: voiceProfileId, id: referenceAudioId } = response.data.reference_audio;
+      for (let attempt = 0; attempt < 120; attempt += 1) {
+        await new Promise((resolve) => window.setTimeout(resolve, 1000));
+        const statusResponse = await apiClient.get<VoiceReferenceAudioUpload>(
+          `/voice-profiles/${voiceProfileId}/reference-audio/${referenceAudioId}`,
+        );
+        const { status, error: processingError } = statusResponse.data.reference_audio;
+        if (status === 'ready') {
+          setInfo('Reference audio processed.');
+          await loadVoiceProfiles();
+          return;
+        }
+        if (status === 'failed') {
+          setInfo(null);
+          setError(processingError?.message || 'Failed to process reference audio.');
+          await loadVoiceProfiles();
+          return;
+        }
+      }
+      setInfo('Reference audio is still processing; refresh later to use it.');
     } catch (err: any) {
       setError(err.response?.data?.detail || 'Failed to upload reference audio.');
     } finally {
@@ -742,7 +764,7 @@ const VoiceLabPage: React.FC = () => {
                   <div key={clip.id} className="rounded-xl border border-white/10 px-3 py-2 text-sm text-slate-300">
                     <div>{clip.storage_path.split('/').pop()}</div>
                     <div className="mt-1 text-xs text-slate-500">
-                      {clip.mime_type} · {clip.duration_ms ? `${(clip.duration_ms / 1000).toFixed(2)}s` : 'duration unknown'}
+                      {clip.status === 'ready' ? clip.mime_type : clip.status} · {clip.duration_ms ? `${(clip.duration_ms / 1000).toFixed(2)}s` : 'duration unknown'}
                     </div>
                   </div>
                 ))}